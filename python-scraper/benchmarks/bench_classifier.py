@@ -0,0 +1,114 @@
+"""
+Severity classifier: load time, memory and prediction speed, compact arrays vs pickled pipeline
+
+    python benchmarks/bench_classifier.py
+    python benchmarks/bench_classifier.py --features 50000
+
+Each backend is loaded in a fresh interpreter, as a worker process would load
+it, and the time and resident memory growth (imports included) are reported.
+Both then score the same batch of texts (best of --repeat, after one warm-up
+prediction each) and the predictions are compared.
+With --features, a pipeline with that many TF-IDF features is trained on
+synthetic text and exported to a temporary directory first; otherwise the
+shipped src/ml/model.joblib and its model_arrays/ are used.
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+LOAD_SCRIPT = """
+import json, sys, time
+sys.path.append({root!r})
+from src.ml.model_registry import resident_memory
+rss = resident_memory()
+started = time.perf_counter()
+from src.ml.threat_classifier import ThreatClassifier
+classifier = ThreatClassifier(model_path={model_path!r}, use_arrays={use_arrays})
+seconds = time.perf_counter() - started
+print(json.dumps({{"seconds": seconds, "rss_mb": (resident_memory() - rss) / 2**20,
+                   "backend": "arrays" if classifier.compact is not None else "pipeline"}}))
+"""
+
+WORDS = ("ransomware phishing breach exploit vulnerability patch malware botnet ddos leak aadhaar bank "
+         "hospital power grid telecom government portal server credential zero day remote code execution "
+         "advisory cert critical high medium low attack actor campaign").split()
+
+def synthetic_texts(count: int, rng: random.Random) -> list:
+    vocabulary = WORDS + [f"term{n}" for n in range(20000)]
+    return [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(20, 120))) for _ in range(count)]
+
+def train_synthetic(directory: str, features: int) -> str:
+    import joblib
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+
+    from src.ml.train_model import export_arrays
+
+    rng = random.Random(0)
+    texts = synthetic_texts(4000, rng)
+    labels = [rng.choice(["Critical", "High", "Medium", "Low"]) for _ in texts]
+    pipeline = Pipeline([
+        ('tfidf', TfidfVectorizer(stop_words='english', ngram_range=(1, 2), max_features=features)),
+        ('clf', LogisticRegression(max_iter=200))
+    ])
+    pipeline.fit(texts, labels)
+    model_path = os.path.join(directory, 'model.joblib')
+    joblib.dump(pipeline, model_path)
+    export_arrays(pipeline, model_path)
+    return model_path
+
+def load_in_subprocess(model_path: str, use_arrays: bool) -> dict:
+    script = LOAD_SCRIPT.format(root=ROOT, model_path=model_path, use_arrays=use_arrays)
+    output = subprocess.run([sys.executable, "-W", "ignore", "-c", script],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main(args):
+    from src.ml.threat_classifier import ThreatClassifier
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_path = (train_synthetic(tmp_dir, args.features) if args.features
+                      else os.path.join(ROOT, 'src', 'ml', 'model.joblib'))
+
+        for use_arrays in (True, False):
+            load = min((load_in_subprocess(model_path, use_arrays) for _ in range(args.repeat)),
+                       key=lambda result: result["seconds"])
+            print(f"{load['backend']:>8} load: {load['seconds'] * 1000:7.1f} ms, "
+                  f"+{load['rss_mb']:.1f} MB resident (imports included)")
+
+        texts = synthetic_texts(args.texts, random.Random(1))
+        compact = ThreatClassifier(model_path=model_path)
+        pipeline = ThreatClassifier(model_path=model_path, use_arrays=False)
+        backends = (("arrays", compact), ("pipeline", pipeline))
+        for name, classifier in backends:
+            started = time.perf_counter()
+            classifier.predict(texts[0])  # the compact model builds its term dict on first use
+            print(f"{name:>8} first predict: {(time.perf_counter() - started) * 1000:7.1f} ms")
+
+        results = {}
+        for name, classifier in backends:
+            elapsed = float("inf")
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                results[name] = classifier.predict_batch(texts)
+                elapsed = min(elapsed, time.perf_counter() - started)
+            print(f"{name:>8} predict_batch: {elapsed / len(texts) * 1e6:7.1f} us per text")
+        print(f"predictions identical: {results['arrays'] == results['pipeline']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--features", type=int, default=0,
+                        help="Train a synthetic model with this many TF-IDF features (default: shipped model)")
+    parser.add_argument("--texts", type=int, default=500, help="Texts scored per backend")
+    parser.add_argument("--repeat", type=int, default=3, help="Loads and batch timings per backend (best kept)")
+    main(parser.parse_args())
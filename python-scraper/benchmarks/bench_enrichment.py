@@ -0,0 +1,66 @@
+"""
+Per-incident cost of EnrichmentService.enrich_incident_sync and enrich_incidents_sync
+
+    python benchmarks/bench_enrichment.py --repeat 20
+
+Runs the blocking enrichment (classifier, entities, MITRE, CVEs, sectors) in
+this process over the test data generator's sample incidents and reports the
+time per incident and the peak memory allocated while enriching one incident
+(tracemalloc, above what was allocated before it). The batch path, which
+classifies and parses a whole run at once, is timed over all the repeated
+incidents in one call.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bench_pipeline import MemoryIncidentStore
+from src.scrapers import test_scraper
+from src.services.enrichment_service import EnrichmentService
+
+def load_incidents() -> list:
+    test_scraper.MongoService = MemoryIncidentStore  # only the sample incidents are needed
+    return test_scraper.TestScraper().sample_incidents
+
+def main(args):
+    incidents = load_incidents()
+    service = EnrichmentService()
+    service.load_models()
+    for incident in incidents:  # warm caches (spaCy, sklearn, regexes)
+        service.enrich_incident_sync(dict(incident))
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        for incident in incidents:
+            service.enrich_incident_sync(dict(incident))
+    count = args.repeat * len(incidents)
+    per_incident = (time.perf_counter() - started) / count * 1e6
+
+    batch = [dict(incident) for _ in range(args.repeat) for incident in incidents]
+    started = time.perf_counter()
+    service.enrich_incidents_sync(batch)
+    per_incident_batched = (time.perf_counter() - started) / count * 1e6
+
+    tracemalloc.start()
+    transient = 0
+    for incident in incidents:
+        data = dict(incident)
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        service.enrich_incident_sync(data)
+        transient += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    print(f"{count} incidents: {per_incident:.0f} us per incident, {per_incident_batched:.0f} us batched, "
+          f"{transient / len(incidents) / 1024:.1f} KiB peak transient memory per incident "
+          f"(spaCy model {'loaded' if service.entity_extractor.nlp else 'not installed'})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the sample incidents")
+    main(parser.parse_args())
@@ -0,0 +1,81 @@
+"""
+Gazetteer matching cost as the gazetteer grows
+
+    python benchmarks/bench_gazetteer.py --sizes 50 1000 10000
+
+The packaged gazetteers are padded with synthetic entries (two aliases each)
+up to each size. For every size the token trie is timed against the previous
+approach: one word-bounded regex per alias, run over every text.
+"""
+
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bench_pipeline import MemoryIncidentStore
+from config import Config
+from src.ml.gazetteer import Gazetteer
+from src.scrapers import test_scraper
+
+def load_texts(repeat: int) -> list:
+    test_scraper.MongoService = MemoryIncidentStore  # only the sample incidents are needed
+    scraper = test_scraper.TestScraper()
+    texts = [f"{i['title']} {i['description']}" for i in scraper.sample_incidents]
+    return texts * repeat
+
+def build(size: int):
+    """Gazetteer padded to `size` entries and the equivalent (regex, canonical) list"""
+    gazetteer = Gazetteer.from_dir(Config.GAZETTEER_DIR)
+    rng = random.Random(0)
+    while gazetteer.alias_count < size * 2:
+        name = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10)))
+        for alias in (name, f"{name} group"):
+            gazetteer.add("threat_actors", name.title(), alias)
+
+    regexes = []
+    for alias, canonical in iter_aliases(gazetteer.trie, []):
+        regexes.append((re.compile(rf"\b{re.escape(alias)}\b"), canonical))
+    return gazetteer, regexes
+
+def iter_aliases(node: dict, path: list):
+    for token, child in node.items():
+        if token == "":
+            for _, canonical, _ in child:
+                yield " ".join(path), canonical
+        else:
+            yield from iter_aliases(child, path + [token])
+
+def regex_match(regexes: list, text: str) -> set:
+    lower_text = text.lower()
+    return {canonical for pattern, canonical in regexes if pattern.search(lower_text)}
+
+def timed(fn, texts) -> float:
+    started = time.perf_counter()
+    for text in texts:
+        fn(text)
+    return (time.perf_counter() - started) / len(texts) * 1e6
+
+def main(args):
+    texts = load_texts(args.repeat)
+    print(f"{len(texts)} texts, mean {sum(map(len, texts)) / len(texts):.0f} chars")
+    for size in args.sizes:
+        build_started = time.perf_counter()
+        gazetteer, regexes = build(size)
+        build_seconds = time.perf_counter() - build_started
+        trie = timed(gazetteer.match, texts)
+        regex = timed(lambda text: regex_match(regexes, text), texts[:args.regex_texts])
+        print(f"{gazetteer.alias_count:>6} aliases: token trie {trie:7.1f} us, "
+              f"regex per alias {regex:9.1f} us per text (built in {build_seconds:.2f}s)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 1000, 10000], help="Gazetteer entries")
+    parser.add_argument("--repeat", type=int, default=50, help="Copies of the sample texts")
+    parser.add_argument("--regex-texts", type=int, default=50, help="Texts timed for the (slow) regex baseline")
+    main(parser.parse_args())
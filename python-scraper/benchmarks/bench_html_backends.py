@@ -0,0 +1,97 @@
+"""
+Compare HTML parser backends on news listing pages from a recorded HTTP archive
+
+    python benchmarks/bench_html_backends.py --repeat 20
+
+For every archived listing page of a configured news source, each backend
+parses the raw bytes, selects the articles and extracts their fields, once from
+the whole page and once through the container pre-scan the scraper uses.
+Prints time and peak traced memory per pass (lexbor's C heap is not traced)
+and exits non-zero if any fields differ from BeautifulSoup on the whole page.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bench_pipeline import MemoryIncidentStore
+from config import Config
+from src.scrapers.html_backend import BACKENDS, LexborHTMLParser, get_html_backend
+from src.scrapers.news_scraper import NewsScraper
+from src.services.http_archive import HttpArchive
+
+def listing_pages(scraper: NewsScraper, archive: HttpArchive, max_pages: int):
+    """(source, body) for every archived listing page of a configured source"""
+    pages = []
+    for source in scraper.sources:
+        urls = [source["url"]]
+        if source.get("pagination"):
+            urls += [source["pagination"].format(page=page) for page in range(2, max_pages + 1)]
+        for url in urls:
+            if url in archive.entries:
+                result = archive.replay_blocking(url)
+                if result.status == 200:
+                    pages.append((source, result.body))
+    return pages
+
+def extract(scraper: NewsScraper, source: dict, body: bytes, mode: str) -> list:
+    if mode == "whole page":
+        articles = scraper._select_articles(scraper.html.parse(body), source)
+    else:
+        articles = scraper._listing_articles(body, source)
+    return [scraper._extract_fields(article, source) for article in articles]
+
+def main(args) -> int:
+    archive = HttpArchive(args.archive, mode="replay", latency_ms=0, jitter_ms=0)
+    scraper = NewsScraper(mongo_service=MemoryIncidentStore())
+    pages = listing_pages(scraper, archive, args.max_pages)
+    if not pages:
+        print(f"No listing pages in {args.archive}; record one with bench_pipeline.py --record")
+        return 1
+
+    names = [name for name in BACKENDS if name != "selectolax" or LexborHTMLParser]
+    total_bytes = sum(len(body) for _, body in pages)
+    print(f"{len(pages)} listing pages, {total_bytes / 1024:.0f} KiB")
+
+    fields = {}
+    for name in names:
+        scraper.html = get_html_backend(name)
+        for mode in ("whole page", "container"):
+            tracemalloc.start()
+            fields[name, mode] = [extract(scraper, source, body, mode) for source, body in pages]
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                for source, body in pages:
+                    extract(scraper, source, body, mode)
+            per_pass = (time.perf_counter() - started) / args.repeat
+            articles = sum(len(page) for page in fields[name, mode])
+            print(f"{name:>10} {mode:>10}: {per_pass * 1000:8.1f} ms per pass, "
+                  f"peak {peak / 1024 / 1024:6.1f} MiB, {articles} articles")
+
+    mismatches = 0
+    reference = fields["soup", "whole page"]
+    for key, pages_fields in fields.items():
+        for (source, _), expected, actual in zip(pages, reference, pages_fields):
+            if actual != expected:
+                mismatches += 1
+                print(f"{key[0]} ({key[1]}) differs from soup on {source['name']}")
+                for want, got in zip(expected, actual):
+                    if want != got:
+                        print(f"  soup: {want}\n  {key[0]}: {got}")
+                        break
+    print("fields identical" if not mismatches else f"{mismatches} pages differ")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--archive", default=Config.HTTP_ARCHIVE_PATH, help="Archive path")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed passes per backend")
+    parser.add_argument("--max-pages", type=int, default=Config.BACKFILL_MAX_PAGES, help="Pagination depth to look for")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,95 @@
+"""
+IOC extraction throughput on large advisory bodies
+
+    python benchmarks/bench_iocs.py --size-kb 64 --bodies 20
+
+Builds synthetic advisory bodies of the given size (prose from the test
+data generator's incidents with defanged URLs, domains, IPs, hashes and
+CVE ids mixed in) and times the single-pass IocExtractor against running
+one compiled regex per indicator type over the same text.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bench_pipeline import MemoryIncidentStore
+from src.ml.ioc_extractor import TLDS, IocExtractor, refang
+from src.scrapers import test_scraper
+
+def indicators(rng: random.Random) -> list:
+    host = f"{rng.choice(['update', 'cdn', 'login', 'files'])}-{rng.randrange(1000)}"
+    return [
+        f"hxxps://{host}[.]example[.]ru/{rng.randrange(10**6)}/payload.bin",
+        f"{host}[.]attacker[.]com",
+        f"{rng.randrange(1, 224)}.{rng.randrange(256)}.{rng.randrange(256)}[.]{rng.randrange(256)}",
+        f"2001:db8:{rng.randrange(65536):x}::{rng.randrange(65536):x}",
+        "".join(rng.choice("0123456789abcdef") for _ in range(rng.choice([32, 40, 64]))),
+        f"CVE-{rng.randrange(2015, 2027)}-{rng.randrange(1000, 99999)}"
+    ]
+
+def build_bodies(count: int, size: int) -> list:
+    test_scraper.MongoService = MemoryIncidentStore  # only the sample incidents are needed
+    prose = [f"{i['title']}. {i['description']}" for i in test_scraper.TestScraper().sample_incidents]
+    rng = random.Random(0)
+    bodies = []
+    for _ in range(count):
+        parts, length = [], 0
+        while length < size:
+            part = rng.choice(prose) if rng.random() < 0.7 else " ".join(indicators(rng))
+            parts.append(part)
+            length += len(part) + 1
+        bodies.append(" ".join(parts))
+    return bodies
+
+# One pattern per indicator type, each a separate scan of the text
+_DOT = r"(?:\.|\[\.\]|\(\.\)|\{\.\}|\[dot\]|\(dot\))"
+_OCTET = r"(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)"
+SEPARATE = {name: re.compile(pattern, re.IGNORECASE) for name, pattern in {
+    "url": r"(?:h(?:tt|xx)ps?|fxp|ftp)(?:://|\[://\]|\[:\]//)[^\s<>\"']+",
+    "cve": r"\bCVE-\d{4}-\d{4,7}\b",
+    "sha256": r"\b[a-f0-9]{64}\b",
+    "sha1": r"\b[a-f0-9]{40}\b",
+    "md5": r"\b[a-f0-9]{32}\b",
+    "ipv6": r"(?<![\w:])(?:[a-f0-9]{0,4}:){2,7}[a-f0-9]{0,4}(?![\w:])",
+    "ipv4": rf"(?<![\d.]){_OCTET}(?:{_DOT}{_OCTET}){{3}}(?!\d|\.\d)",
+    "domain": rf"(?<![\w.-])(?:[a-z0-9](?:[a-z0-9-]{{0,61}}[a-z0-9])?{_DOT})+(?:{'|'.join(TLDS)})\b(?!\.\w)"
+}.items()}
+
+def separate_scan(text: str) -> dict:
+    return {name: list(dict.fromkeys(refang(m.group()) for m in pattern.finditer(text)))
+            for name, pattern in SEPARATE.items()}
+
+def timed(fn, bodies, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for body in bodies:
+            fn(body)
+    return time.perf_counter() - started
+
+def main(args):
+    bodies = build_bodies(args.bodies, args.size_kb * 1024)
+    megabytes = sum(map(len, bodies)) * args.repeat / 2**20
+    extractor = IocExtractor()
+    sample = extractor.extract(bodies[0])
+    print(f"{args.bodies} bodies of {args.size_kb} KB; first body: "
+          + ", ".join(f"{len(values)} {kind}" for kind, values in sample.items()))
+
+    single = timed(extractor.extract, bodies, args.repeat)
+    separate = timed(separate_scan, bodies, args.repeat)
+    print(f"single pass:          {megabytes / single:6.1f} MB/s "
+          f"({single / (args.bodies * args.repeat) * 1e3:.2f} ms per body)")
+    print(f"one regex per type:   {megabytes / separate:6.1f} MB/s "
+          f"({separate / (args.bodies * args.repeat) * 1e3:.2f} ms per body, {len(SEPARATE)} patterns)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-kb", type=int, default=64, help="Size of each advisory body")
+    parser.add_argument("--bodies", type=int, default=20, help="Advisory bodies")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the bodies")
+    main(parser.parse_args())
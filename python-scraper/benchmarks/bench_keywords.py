@@ -0,0 +1,83 @@
+"""
+Compare the keyword engine with one `any(keyword in text ...)` scan per label
+
+    python benchmarks/bench_keywords.py --extra 0 1000 5000
+
+Texts are incident titles + descriptions from the test data generator. The
+rule sets are the packaged keyword_rules.json, padded with `--extra` synthetic
+keywords to show how each approach scales with the size of the rules.
+"""
+
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bench_pipeline import MemoryIncidentStore
+from config import Config
+from src.ml import keyword_engine
+from src.ml.keyword_engine import KeywordEngine
+from src.scrapers import test_scraper
+
+def load_texts(repeat: int) -> list:
+    test_scraper.MongoService = MemoryIncidentStore  # only the sample incidents are needed
+    scraper = test_scraper.TestScraper()
+    texts = [f"{i['title']} {i['description']}" for i in scraper.sample_incidents]
+    return texts * repeat
+
+def padded_rules(extra: int) -> dict:
+    with open(Config.KEYWORD_RULES_PATH, "r", encoding="utf-8") as f:
+        rules = json.load(f)
+    rng = random.Random(0)
+    rules["synthetic"] = {f"label-{n}": [] for n in range(50)}
+    for n in range(extra):
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12)))
+        rules["synthetic"][f"label-{n % 50}"].append(word)
+    return rules
+
+def keyword_lists(rules: dict) -> list:
+    return [
+        (rule_set, label, [k["term"] if isinstance(k, dict) else k for k in keywords])
+        for rule_set, labels in rules.items() if not rule_set.startswith("_")
+        for label, keywords in labels.items()
+    ]
+
+def naive_scan(lists: list, text: str) -> set:
+    """What the scrapers did before: lower-case, then one any() per label"""
+    text = text.lower()
+    return {(rule_set, label) for rule_set, label, terms in lists if any(term in text for term in terms)}
+
+def timed(fn, texts) -> float:
+    started = time.perf_counter()
+    for text in texts:
+        fn(text)
+    return (time.perf_counter() - started) / len(texts) * 1e6
+
+def main(args):
+    texts = load_texts(args.repeat)
+    print(f"{len(texts)} texts, mean {sum(map(len, texts)) / len(texts):.0f} chars")
+    for extra in args.extra:
+        rules = padded_rules(extra)
+        engine = KeywordEngine(rules)
+        saved = keyword_engine.ahocorasick
+        keyword_engine.ahocorasick = None
+        python_engine = KeywordEngine(rules)
+        keyword_engine.ahocorasick = saved
+
+        lists = keyword_lists(rules)
+        naive = timed(lambda text: naive_scan(lists, text), texts)
+        c_automaton = timed(engine.scan, texts) if saved else float("nan")
+        python_automaton = timed(python_engine.scan, texts)
+        print(f"{engine.keyword_count:>6} keywords: any() per label {naive:8.1f} us, "
+              f"pyahocorasick {c_automaton:6.1f} us, pure Python automaton {python_automaton:6.1f} us per text")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--extra", type=int, nargs="+", default=[0, 1000, 5000], help="Synthetic keywords to add")
+    parser.add_argument("--repeat", type=int, default=50, help="Copies of the sample texts")
+    main(parser.parse_args())
@@ -0,0 +1,60 @@
+"""
+spaCy NER throughput: one nlp() call per incident vs batched nlp.pipe
+
+    python benchmarks/bench_ner.py --batch-sizes 16 64 256 --n-process 1 2
+
+Parses the test data generator's sample incidents (repeated) with the full
+pipeline and with the NER-only pipeline EntityExtractor loads (tagger,
+parser, lemmatizer etc. excluded), and reports docs/sec for per-doc calls
+and for nlp.pipe at each batch size and process count.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import spacy
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bench_pipeline import MemoryIncidentStore
+from config import Config
+from src.ml.entity_extractor import UNUSED_COMPONENTS
+from src.scrapers import test_scraper
+
+def load_texts(repeat: int) -> list:
+    test_scraper.MongoService = MemoryIncidentStore  # only the sample incidents are needed
+    scraper = test_scraper.TestScraper()
+    texts = [f"{i['title']} {i['description']}" for i in scraper.sample_incidents]
+    return texts * repeat
+
+def docs_per_sec(parse, texts) -> float:
+    started = time.perf_counter()
+    parse(texts)
+    return len(texts) / (time.perf_counter() - started)
+
+def main(args):
+    texts = load_texts(args.repeat)
+    print(f"{len(texts)} texts, mean {sum(map(len, texts)) / len(texts):.0f} chars, model {args.model}")
+
+    for name, exclude in (("full pipeline", []), ("NER only", UNUSED_COMPONENTS)):
+        nlp = spacy.load(args.model, exclude=exclude)
+        list(nlp.pipe(texts[:10]))  # warm up
+        print(f"{name} ({', '.join(nlp.pipe_names)}):")
+        rate = docs_per_sec(lambda batch: [nlp(text) for text in batch], texts)
+        print(f"  per-doc nlp()                    {rate:8.0f} docs/sec")
+        for n_process in args.n_process:
+            for batch_size in args.batch_sizes:
+                rate = docs_per_sec(
+                    lambda batch: list(nlp.pipe(batch, batch_size=batch_size, n_process=n_process)), texts
+                )
+                print(f"  nlp.pipe batch {batch_size:>4} n_process {n_process}  {rate:8.0f} docs/sec")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=Config.SPACY_MODEL, help="spaCy model name or path")
+    parser.add_argument("--repeat", type=int, default=20, help="Copies of the sample texts")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 64, 256], help="nlp.pipe batch sizes")
+    parser.add_argument("--n-process", type=int, nargs="+", default=[1], help="nlp.pipe process counts")
+    main(parser.parse_args())
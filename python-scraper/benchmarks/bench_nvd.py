@@ -0,0 +1,76 @@
+"""
+Local NVD mirror: import time, database size and lookup latency
+
+    python benchmarks/bench_nvd.py --cves 250000 --batch 20
+
+Writes a synthetic NVD 2.0 feed with the given number of CVEs (the real NVD
+has about 250k), imports it into a fresh SQLite mirror, then times batched
+lookups of random known and unknown CVE ids, as enrichment does for each
+batch of incidents, against one query per id.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ml.nvd_store import NvdStore
+
+def cve_id(n: int) -> str:
+    return f"CVE-{1999 + n % 26}-{n:05d}"
+
+def write_feed(path: str, count: int):
+    rng = random.Random(0)
+    vulnerabilities = [{"cve": {
+        "id": cve_id(n),
+        "published": "2020-01-01T00:00:00.000",
+        "lastModified": "2024-01-01T00:00:00.000",
+        "descriptions": [{"lang": "en", "value": "Synthetic vulnerability " * 8}],
+        "metrics": {"cvssMetricV31": [{"type": "Primary", "cvssData": {
+            "baseScore": round(rng.uniform(1, 10), 1), "baseSeverity": "HIGH"
+        }}]}
+    }} for n in range(count)]
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump({"vulnerabilities": vulnerabilities}, f)
+
+def main(args):
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        feed = os.path.join(tmp_dir, "nvdcve-2.0-synthetic.json.gz")
+        write_feed(feed, args.cves)
+        store = NvdStore(path=os.path.join(tmp_dir, "nvd.sqlite3"))
+
+        started = time.perf_counter()
+        store.import_feeds([feed])
+        print(f"import: {args.cves} CVEs in {time.perf_counter() - started:.1f}s, "
+              f"{os.path.getsize(store.path) / 2**20:.0f} MB on disk")
+
+        batches = [
+            [cve_id(rng.randrange(args.cves * 2)) for _ in range(args.batch)]  # about half unknown
+            for _ in range(args.lookups)
+        ]
+        started = time.perf_counter()
+        for batch in batches:
+            store.lookup(batch)
+        batched = (time.perf_counter() - started) / (args.lookups * args.batch) * 1e6
+
+        started = time.perf_counter()
+        for batch in batches:
+            for cve in batch:
+                store.lookup([cve])
+        single = (time.perf_counter() - started) / (args.lookups * args.batch) * 1e6
+        print(f"lookup: {batched:.1f} us per CVE in batches of {args.batch}, {single:.1f} us one query per CVE")
+        store.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cves", type=int, default=250000, help="CVEs in the synthetic feed")
+    parser.add_argument("--batch", type=int, default=20, help="CVE ids per lookup")
+    parser.add_argument("--lookups", type=int, default=2000, help="Batched lookups timed")
+    main(parser.parse_args())
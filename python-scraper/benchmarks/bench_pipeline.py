@@ -0,0 +1,171 @@
+"""
+End-to-end scrape + enrichment benchmark against a recorded HTTP archive
+
+Record once with network access:
+    python benchmarks/bench_pipeline.py --record
+
+Then replay anywhere, without network or MongoDB:
+    python benchmarks/bench_pipeline.py --runs 5 --latency-ms 80 --jitter-ms 40
+
+Each run mirrors run_scrapers (CERT-In, then news, on one shared HTTP client)
+with fresh crawl state (watermarks, breakers, learned selectors) and a copy of
+the NVD mirror, and saves incidents to an in-memory store. A probe
+task sleeping 10 ms at a time measures how long the event loop is blocked,
+which is the extra latency an API request would see during the scrape.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+
+class MemoryIncidentStore:
+    """Stand-in for MongoService that keeps incidents in a dict keyed by hash"""
+
+    def __init__(self):
+        self.incidents = {}
+
+    def save_incident(self, incident_data: dict) -> bool:
+        if incident_data["hash"] in self.incidents:
+            return False
+        self.incidents[incident_data["hash"]] = incident_data
+        return True
+
+    def get_existing_urls(self, urls) -> set:
+        stored = {incident.get("url") for incident in self.incidents.values()}
+        return {url for url in urls if url in stored}
+
+    def get_existing_hashes(self, hashes) -> set:
+        return {h for h in hashes if h in self.incidents}
+
+    def get_recent_source_keys(self, source: str, limit: int = 200):
+        return [], []
+
+async def probe_loop_lag(lags: list, interval: float = 0.01):
+    """Append how late each short sleep wakes up until cancelled"""
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+def configure(args, state_dir: str):
+    Config.HTTP_ARCHIVE_MODE = "record" if args.record else "replay"
+    Config.HTTP_ARCHIVE_PATH = args.archive
+    Config.HTTP_REPLAY_LATENCY_MS = args.latency_ms
+    Config.HTTP_REPLAY_JITTER_MS = args.jitter_ms
+    Config.HTTP_CACHE_ENABLED = False
+    Config.WATERMARK_PATH = os.path.join(state_dir, "watermarks.json")
+    Config.BACKFILL_CHECKPOINT_PATH = os.path.join(state_dir, "backfill.json")
+    Config.BREAKER_STATE_PATH = os.path.join(state_dir, "circuit_breakers.json")
+    Config.SELECTOR_MEMORY_PATH = os.path.join(state_dir, "selectors.json")
+
+    # Enrichment only reads the NVD mirror; work on a copy so the run never
+    # touches the real one. Set in the environment too, for worker processes.
+    nvd_path = os.path.join(state_dir, "nvd.sqlite3")
+    if os.path.exists(Config.NVD_DB_PATH):
+        shutil.copyfile(Config.NVD_DB_PATH, nvd_path)
+    Config.NVD_DB_PATH = os.environ["NVD_DB_PATH"] = nvd_path
+
+async def run_once(sources, state_dir: str) -> dict:
+    from src.scrapers.cert_in_scraper import CertInScraper
+    from src.scrapers.news_scraper import NewsScraper
+    from src.services.circuit_breaker import CircuitBreakerRegistry
+    from src.scrapers.selector_memory import SelectorMemory
+    from src.services.http_client import HttpClient
+    from src.services.watermark_store import WatermarkStore
+
+    store = MemoryIncidentStore()
+    enrich_seconds = 0.0
+    lags = []
+    probe = asyncio.create_task(probe_loop_lag(lags))
+    started = time.perf_counter()
+
+    async with HttpClient() as http_client:
+        for source in sources:
+            scraper_cls = CertInScraper if source == "cert-in" else NewsScraper
+            scraper = scraper_cls(http_client=http_client, mongo_service=store)
+
+            # Fresh crawl state so every run does the same work
+            scraper.watermarks = WatermarkStore(path=os.path.join(state_dir, f"{source}-watermarks.json"))
+            if hasattr(scraper, "breakers"):
+                scraper.breakers = CircuitBreakerRegistry(path=os.path.join(state_dir, f"{source}-breakers.json"))
+            if hasattr(scraper, "selectors"):
+                scraper.selectors = SelectorMemory(path=os.path.join(state_dir, f"{source}-selectors.json"))
+
+            enrich = scraper.enrichment_service.enrich_incidents
+
+            async def timed_enrich(incidents, enrich=enrich):
+                nonlocal enrich_seconds
+                enrich_started = time.perf_counter()
+                try:
+                    return await enrich(incidents)
+                finally:
+                    enrich_seconds += time.perf_counter() - enrich_started
+
+            scraper.enrichment_service.enrich_incidents = timed_enrich
+            await scraper.scrape_and_save()
+        http_stats = http_client.get_stats()
+    seconds = time.perf_counter() - started
+    probe.cancel()
+    lags.sort()
+
+    return {
+        "seconds": seconds,
+        "loop_lag_p99_ms": lags[int(len(lags) * 0.99)] * 1000 if lags else 0.0,
+        "loop_lag_max_ms": lags[-1] * 1000 if lags else 0.0,
+        "enrich_seconds": enrich_seconds,
+        "incidents": len(store.incidents),
+        "archive": http_stats.get("archive", {})
+    }
+
+async def main(args):
+    from src.services.executor import get_worker_pools
+
+    sources = args.sources or ["cert-in", "news"]
+    with tempfile.TemporaryDirectory() as state_dir:
+        configure(args, state_dir)  # before the workers start, so they open the copied NVD mirror
+        pools = get_worker_pools()
+        await pools.warm_up()
+        runs = 1 if args.record else args.runs
+        results = []
+        for run in range(runs):
+            result = await run_once(sources, os.path.join(state_dir, str(run)))
+            results.append(result)
+            print(f"run {run + 1}: {result['seconds']:.2f}s total, {result['enrich_seconds']:.2f}s enrichment, "
+                  f"loop lag p99 {result['loop_lag_p99_ms']:.1f} ms / max {result['loop_lag_max_ms']:.1f} ms, "
+                  f"{result['incidents']} incidents, archive {result['archive']}")
+        pools.shutdown()
+
+    if args.record:
+        print(f"Recorded archive at {args.archive}")
+        return
+
+    seconds = [r["seconds"] for r in results]
+    print(f"median {statistics.median(seconds):.2f}s, min {min(seconds):.2f}s, max {max(seconds):.2f}s "
+          f"over {runs} runs (latency {args.latency_ms}±{args.jitter_ms} ms)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--record", action="store_true", help="Fetch live and write the archive instead of replaying")
+    parser.add_argument("--archive", default=Config.HTTP_ARCHIVE_PATH, help="Archive path")
+    parser.add_argument("--sources", nargs="+", choices=["cert-in", "news"], help="Sources to run (default: both)")
+    parser.add_argument("--runs", type=int, default=3, help="Replay runs")
+    parser.add_argument("--latency-ms", type=float, default=Config.HTTP_REPLAY_LATENCY_MS)
+    parser.add_argument("--jitter-ms", type=float, default=Config.HTTP_REPLAY_JITTER_MS)
+    parser.add_argument("--workers", type=int, default=Config.WORKER_PROCESSES,
+                        help="Enrichment worker processes (0 = thread pool only)")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+    Config.WORKER_PROCESSES = args.workers
+
+    logging.basicConfig(level=args.log_level, format=Config.LOG_FORMAT)
+    asyncio.run(main(args))
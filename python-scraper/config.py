@@ -3,12 +3,15 @@ Configuration management for Python scraper
 """
 
 import os
-from typing import List
+import multiprocessing
+from typing import Dict, List, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 class Config:
     """Configuration class for the Python scraper"""
     
@@ -28,6 +31,62 @@ class Config:
     MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", 5))
     REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", 30))
     USER_AGENT = os.getenv("USER_AGENT", "CyberSuraksha-Scraper/1.0")
+    SOURCE_TIMEOUT = int(os.getenv("SOURCE_TIMEOUT", REQUEST_TIMEOUT))  # per news source
+    SCRAPE_RUN_DEADLINE = int(os.getenv("SCRAPE_RUN_DEADLINE", 300))  # whole news pass
+    HTML_PARSER_BACKEND = os.getenv("HTML_PARSER_BACKEND", "auto")  # auto, selectolax or soup
+    
+    # Worker pools (CPU-bound enrichment in processes, blocking calls in threads)
+    WORKER_PROCESSES = int(os.getenv("WORKER_PROCESSES", 1))  # 0 runs enrichment in the thread pool
+    WORKER_THREADS = int(os.getenv("WORKER_THREADS", 4))
+    WORKER_START_METHOD = os.getenv(
+        "WORKER_START_METHOD",
+        "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    )
+    MODEL_WARM_UP = os.getenv("MODEL_WARM_UP", "True").lower() == "true"  # load models at startup, not on first scrape
+    
+    # HTTP Connection Pool
+    HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", 50))
+    HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", 4))
+    HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", 600))
+    HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", 30))
+    
+    # Retries and Circuit Breakers
+    HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 2))
+    HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", 0.5))  # seconds, doubled per attempt
+    HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", 10))
+    BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", 3))
+    BREAKER_RESET_TIMEOUT = int(os.getenv("BREAKER_RESET_TIMEOUT", 6 * 3600))  # before a half-open probe
+    
+    # Persisted scraper state (HTTP cache, watermarks, ...)
+    DATA_DIR = os.getenv("DATA_DIR", os.path.join(BASE_DIR, "data"))
+    HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "True").lower() == "true"
+    HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", os.path.join(DATA_DIR, "http_cache.json"))
+    WATERMARK_PATH = os.getenv("WATERMARK_PATH", os.path.join(DATA_DIR, "watermarks.json"))
+    WATERMARK_MAX_RECENT = int(os.getenv("WATERMARK_MAX_RECENT", 500))  # hashes / URLs kept per source
+    WATERMARK_STOP_AFTER = int(os.getenv("WATERMARK_STOP_AFTER", 3))  # consecutive known articles
+    SELECTOR_MEMORY_PATH = os.getenv("SELECTOR_MEMORY_PATH", os.path.join(DATA_DIR, "selectors.json"))
+    BREAKER_STATE_PATH = os.getenv("BREAKER_STATE_PATH", os.path.join(DATA_DIR, "circuit_breakers.json"))
+    NVD_DB_PATH = os.getenv("NVD_DB_PATH", os.path.join(DATA_DIR, "nvd.sqlite3"))  # local CVE mirror
+    NVD_FEED_DIR = os.getenv("NVD_FEED_DIR", os.path.join(DATA_DIR, "nvd"))  # nvdcve-*.json[.gz] to import
+    
+    # Keyword rule sets for relevance, severity, category, tag and sector matching
+    KEYWORD_RULES_PATH = os.getenv("KEYWORD_RULES_PATH", os.path.join(BASE_DIR, "src", "ml", "keyword_rules.json"))
+    # spaCy NER (only the components NER needs are loaded)
+    SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+    NER_BATCH_SIZE = int(os.getenv("NER_BATCH_SIZE", 64))  # texts per nlp.pipe batch
+    NER_N_PROCESS = int(os.getenv("NER_N_PROCESS", 1))  # nlp.pipe processes per enrichment worker
+    # Versioned technology / threat-actor gazetteers (one JSON file per entity kind)
+    GAZETTEER_DIR = os.getenv("GAZETTEER_DIR", os.path.join(BASE_DIR, "src", "ml", "gazetteers"))
+    
+    # Backfill
+    BACKFILL_MAX_PAGES = int(os.getenv("BACKFILL_MAX_PAGES", 20))  # listing pages per source
+    BACKFILL_CHECKPOINT_PATH = os.getenv("BACKFILL_CHECKPOINT_PATH", os.path.join(DATA_DIR, "backfill.json"))
+    
+    # HTTP record / replay (off, record or replay)
+    HTTP_ARCHIVE_MODE = os.getenv("HTTP_ARCHIVE_MODE", "off").lower()
+    HTTP_ARCHIVE_PATH = os.getenv("HTTP_ARCHIVE_PATH", os.path.join(DATA_DIR, "http_archive.jsonl.gz"))
+    HTTP_REPLAY_LATENCY_MS = float(os.getenv("HTTP_REPLAY_LATENCY_MS", 0))  # simulated per-response latency
+    HTTP_REPLAY_JITTER_MS = float(os.getenv("HTTP_REPLAY_JITTER_MS", 0))
     
     # CORS Configuration
     CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:4000").split(",")
@@ -40,10 +99,15 @@ class Config:
     CERT_IN_ENABLED = os.getenv("CERT_IN_ENABLED", "True").lower() == "true"
     NEWS_SCRAPING_ENABLED = os.getenv("NEWS_SCRAPING_ENABLED", "True").lower() == "true"
     TEST_DATA_ENABLED = os.getenv("TEST_DATA_ENABLED", "False").lower() == "true"
+    CERT_IN_ADVISORY_LIMIT = int(os.getenv("CERT_IN_ADVISORY_LIMIT", 10))  # advisory pages per web fallback
     
     # Rate Limiting
     RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", 100))
     RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", 3600))  # 1 hour
+    # Per-host overrides as "host=requests/window_seconds,..."
+    RATE_LIMIT_OVERRIDES = os.getenv("RATE_LIMIT_OVERRIDES", "services.nvd.nist.gov=5/30")
+    # Longest Retry-After we wait out; a host asking for more is skipped until then
+    MAX_RETRY_AFTER = int(os.getenv("MAX_RETRY_AFTER", 300))
     
     # Data Filtering
     INDIA_ONLY = os.getenv("INDIA_ONLY", "True").lower() == "true"
@@ -55,6 +119,19 @@ class Config:
         """Get CORS origins as a list"""
         return [origin.strip() for origin in cls.CORS_ORIGINS if origin.strip()]
     
+    @classmethod
+    def get_rate_limit_overrides(cls) -> Dict[str, Tuple[int, float]]:
+        """Get per-host rate limits as {host: (requests, window_seconds)}"""
+        overrides = {}
+        for entry in cls.RATE_LIMIT_OVERRIDES.split(","):
+            host, _, limit = entry.strip().partition("=")
+            requests, _, window = limit.partition("/")
+            try:
+                overrides[host.strip().lower()] = (int(requests), float(window))
+            except ValueError:
+                continue
+        return overrides
+    
     @classmethod
     def get_mongodb_uri(cls) -> str:
         """Get MongoDB URI with fallback"""
@@ -14,6 +14,14 @@ from src.scrapers.cert_in_scraper import CertInScraper
 from src.scrapers.news_scraper import NewsScraper
 from src.scrapers.test_scraper import TestScraper
 from src.services.mongo_service import MongoService
+from src.services.http_client import HttpClient
+from src.services.executor import get_worker_pools
+from src.services.watermark_store import get_watermark_store
+from src.services.circuit_breaker import get_circuit_breakers
+from src.scrapers.selector_memory import get_selector_memory
+from src.scrapers.date_parser import get_date_parser
+from src.ml.model_registry import get_model_registry
+from src.ml.nvd_store import get_nvd_store
 from src.models.incident import IncidentModel
 from config import Config
 
@@ -29,6 +37,8 @@ logger = logging.getLogger(__name__)
 
 # Initialize services
 mongo_service = MongoService()
+http_client = HttpClient()
+worker_pools = get_worker_pools()
 scheduler = AsyncIOScheduler()
 
 from contextlib import asynccontextmanager
@@ -36,6 +46,11 @@ from contextlib import asynccontextmanager
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup logic
+    await http_client.start()
+    worker_pools.start()
+    if Config.MODEL_WARM_UP:
+        asyncio.create_task(worker_pools.warm_up())  # load models without delaying startup
+    
     scheduler.add_job(
         run_scrapers, 
         trigger=CronTrigger(hour="0,6,12,18"),
@@ -56,6 +71,8 @@ async def lifespan(app: FastAPI):
     # Shutdown logic
     scheduler.shutdown()
     logger.info("APScheduler shut down.")
+    await http_client.close()
+    worker_pools.shutdown()
 
 app = FastAPI(
     title="Cyber Incident Scraper",
@@ -90,11 +107,11 @@ async def run_scrapers(sources=None):
         for source in sources:
             try:
                 if source == "cert-in":
-                    scraper = CertInScraper()
+                    scraper = CertInScraper(http_client=http_client)
                     count = await scraper.scrape_and_save()
                     incidents_collected += count
                 elif source == "news":
-                    scraper = NewsScraper()
+                    scraper = NewsScraper(http_client=http_client)
                     count = await scraper.scrape_and_save()
                     incidents_collected += count
                 elif source == "test":
@@ -105,6 +122,7 @@ async def run_scrapers(sources=None):
                 logger.error(f"Error scraping {source}: {str(e)}")
                 continue
                 
+        http_client.save_state()
         logger.info(f"Background scrape completed. Collected: {incidents_collected}")
         return incidents_collected
     except Exception as e:
@@ -117,6 +135,12 @@ class ScrapeRequest(BaseModel):
     sources: Optional[List[str]] = None
     force_refresh: bool = False
 
+class BackfillRequest(BaseModel):
+    sources: Optional[List[str]] = None
+    max_pages: Optional[int] = None
+    until: Optional[datetime] = None
+    reset: bool = False
+
 class ScrapeResponse(BaseModel):
     success: bool
     message: str
@@ -154,23 +178,59 @@ async def scrape_incidents(request: ScrapeRequest, background_tasks: BackgroundT
         logger.error(f"Scraping failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/scrape/backfill")
+async def backfill_news(request: BackfillRequest):
+    """Backfill news sources from their paginated listings (resumable)"""
+    try:
+        scraper = NewsScraper(http_client=http_client)
+        until = request.until.replace(tzinfo=None) if request.until else None
+        report = await scraper.backfill(
+            source_names=request.sources,
+            max_pages=request.max_pages,
+            until=until,
+            reset=request.reset
+        )
+        return {
+            "success": True,
+            "sources": report,
+            "incidents_saved": sum(r.get("incidents_saved", 0) for r in report.values()),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Backfill failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/scrape/status")
 async def get_scrape_status():
     """Get current scraping status and statistics"""
     try:
-        stats = await mongo_service.get_incident_stats()
+        stats = await worker_pools.run_thread(mongo_service.get_incident_stats)
         return {
             "success": True,
             "total_incidents": stats.get("total", 0),
             "recent_incidents": stats.get("recent", 0),
             "sources": stats.get("sources", []),
             "last_updated": stats.get("last_updated"),
+            "http": http_client.get_stats(),
+            "workers": worker_pools.get_stats(),
+            "nvd": await worker_pools.run_thread(get_nvd_store().get_summary),
             "timestamp": datetime.utcnow().isoformat()
         }
     except Exception as e:
         logger.error(f"Failed to get scrape status: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/models")
+async def get_models():
+    """Load time and resident memory of the enrichment models, per process"""
+    workers = await worker_pools.collect_model_stats()
+    return {
+        "success": True,
+        "api_process": get_model_registry().get_stats(),
+        "workers": list(workers.values()),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
 @app.get("/scrape/sources")
 async def get_available_sources():
     """Get list of available scraping sources"""
@@ -196,6 +256,10 @@ async def get_available_sources():
                 "enabled": Config.TEST_DATA_ENABLED
             }
         ],
+        "watermarks": get_watermark_store().get_summary(),
+        "circuit_breakers": get_circuit_breakers().get_summary(),
+        "selectors": get_selector_memory().get_summary(),
+        "dates": get_date_parser().get_summary(),
         "timestamp": datetime.utcnow().isoformat()
     }
 
@@ -1,8 +1,12 @@
+import argparse
 import asyncio
 import logging
+from datetime import datetime
 from src.scrapers.cert_in_scraper import CertInScraper
 from src.scrapers.news_scraper import NewsScraper
 from src.services.mongo_service import MongoService
+from src.services.http_client import HttpClient
+from src.services.executor import get_worker_pools
 from config import Config
 from dotenv import load_dotenv
 
@@ -30,24 +34,54 @@ async def run_scrapers_once():
         
     incidents_collected = 0
     
-    for source in sources:
-        try:
-            logger.info(f"Processing source: {source}")
-            if source == "cert-in":
-                scraper = CertInScraper()
-                count = await scraper.scrape_and_save()
-                incidents_collected += count
-            elif source == "news":
-                scraper = NewsScraper()
-                count = await scraper.scrape_and_save()
-                incidents_collected += count
-        except Exception as e:
-            logger.error(f"Error scraping {source}: {str(e)}")
-            continue
+    # One pooled client for every source in this pass
+    async with HttpClient() as http_client:
+        for source in sources:
+            try:
+                logger.info(f"Processing source: {source}")
+                if source == "cert-in":
+                    scraper = CertInScraper(http_client=http_client)
+                    count = await scraper.scrape_and_save()
+                    incidents_collected += count
+                elif source == "news":
+                    scraper = NewsScraper(http_client=http_client)
+                    count = await scraper.scrape_and_save()
+                    incidents_collected += count
+            except Exception as e:
+                logger.error(f"Error scraping {source}: {str(e)}")
+                continue
+        
+        logger.info(f"HTTP connection stats: {http_client.get_stats()}")
             
     logger.info(f"Ingestion complete. Total signals captured: {incidents_collected}")
     # Small sleep to ensure all connections close gracefully
     await asyncio.sleep(2)
 
+async def run_backfill(sources=None, max_pages=None, until=None, reset=False):
+    """Backfill news sources from their paginated listings, resuming from checkpoints."""
+    logger.info("Starting news backfill...")
+    
+    async with HttpClient() as http_client:
+        scraper = NewsScraper(http_client=http_client)
+        report = await scraper.backfill(source_names=sources, max_pages=max_pages, until=until, reset=reset)
+    
+    for name, progress in report.items():
+        logger.info(f"{name}: {progress}")
+    logger.info(f"Backfill complete. Total signals captured: {sum(p.get('incidents_saved', 0) for p in report.values())}")
+
 if __name__ == "__main__":
-    asyncio.run(run_scrapers_once())
+    parser = argparse.ArgumentParser(description="Run a single ingestion pass")
+    parser.add_argument("--backfill", action="store_true", help="walk paginated news listings instead of a normal pass")
+    parser.add_argument("--sources", nargs="+", help="news source names to backfill (default: all paginated sources)")
+    parser.add_argument("--max-pages", type=int, help=f"listing depth per source (default: {Config.BACKFILL_MAX_PAGES})")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="stop at articles older than this date (YYYY-MM-DD)")
+    parser.add_argument("--reset", action="store_true", help="discard backfill checkpoints and start over")
+    args = parser.parse_args()
+    
+    try:
+        if args.backfill:
+            asyncio.run(run_backfill(args.sources, args.max_pages, args.until, args.reset))
+        else:
+            asyncio.run(run_scrapers_once())
+    finally:
+        get_worker_pools().shutdown()
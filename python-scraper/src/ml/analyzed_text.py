@@ -0,0 +1,77 @@
+"""
+Incident text analyzed once and shared by every enrichment stage
+"""
+
+from typing import Dict, List, Optional
+
+from .gazetteer import TOKEN
+from .ioc_extractor import get_ioc_extractor
+from .keyword_engine import KeywordHits, get_keyword_engine
+
+class AnalyzedText:
+    """An incident's title + description with its derived views cached
+
+    The lower-cased text, word tokens, keyword hits, indicators of compromise
+    and spaCy Doc are each computed on first use and then reused, so the
+    classifier, entity extractor, MITRE mapper, IOC / CVE extraction and
+    sector tagging never re-normalize, re-scan or re-tokenize the same text.
+    Stages accept a plain string too and wrap it with AnalyzedText.of().
+    """
+
+    __slots__ = ("text", "_lower", "_tokens", "_hits", "_iocs", "_doc")
+
+    def __init__(self, text: str):
+        self.text = text
+        self._lower: Optional[str] = None
+        self._tokens: Optional[List[str]] = None
+        self._hits: Optional[KeywordHits] = None
+        self._iocs: Optional[Dict[str, List[str]]] = None
+        self._doc = None
+
+    @classmethod
+    def of(cls, text) -> "AnalyzedText":
+        return text if isinstance(text, cls) else cls(text or "")
+
+    @classmethod
+    def from_incident(cls, incident_data: dict) -> "AnalyzedText":
+        return cls(f"{incident_data.get('title', '')} {incident_data.get('description', '')}")
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def tokens(self) -> List[str]:
+        """Lower-cased word tokens (runs of \\w), as the gazetteer and TF-IDF features use"""
+        if self._tokens is None:
+            self._tokens = TOKEN.findall(self.lower)
+        return self._tokens
+
+    @property
+    def hits(self) -> KeywordHits:
+        if self._hits is None:
+            self._hits = get_keyword_engine().scan(self.lower, lowered=True)
+        return self._hits
+
+    @property
+    def iocs(self) -> Dict[str, List[str]]:
+        """Indicators of compromise by type, CVE ids included (one regex pass)"""
+        if self._iocs is None:
+            self._iocs = get_ioc_extractor().extract(self.text)
+        return self._iocs
+
+    @property
+    def has_doc(self) -> bool:
+        return self._doc is not None
+
+    def set_doc(self, doc):
+        """Attach a Doc parsed elsewhere, e.g. in an nlp.pipe batch"""
+        self._doc = doc
+
+    def doc(self, nlp):
+        """spaCy Doc for the text, parsed by `nlp` once"""
+        if self._doc is None:
+            self._doc = nlp(self.text)
+        return self._doc
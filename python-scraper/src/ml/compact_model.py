@@ -0,0 +1,115 @@
+"""
+Compact, memory-mapped form of the TF-IDF + logistic regression classifier
+"""
+
+import json
+import os
+from typing import Dict, Optional
+
+import numpy as np
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+ARRAYS = ("terms", "idf", "coef", "intercept")
+
+def _save_array(directory: str, name: str, array: np.ndarray):
+    path = os.path.join(directory, f"{name}.npy")
+    np.save(path + ".tmp.npy", np.ascontiguousarray(array))
+    os.replace(path + ".tmp.npy", path)
+
+def export_compact_model(pipeline, directory: str) -> dict:
+    """Write a fitted TfidfVectorizer + LogisticRegression pipeline as .npy arrays
+
+    terms holds the vocabulary in column order (feature i is terms[i]). The
+    manifest is written last; a reader never sees it pointing at arrays from
+    an older export.
+    """
+    from .threat_classifier import ThreatClassifier
+
+    vectorizer, estimator = ThreatClassifier._shared_token_steps(pipeline)
+    if vectorizer is None or not all(hasattr(estimator, a) for a in ("coef_", "intercept_", "classes_")):
+        raise ValueError("Only a default-tokenized TfidfVectorizer + linear classifier pipeline can be exported")
+
+    terms = vectorizer.get_feature_names_out().astype(str)
+    multi_class = getattr(estimator, "multi_class", None)
+    ovr = multi_class == "ovr" or (multi_class in ("auto", "deprecated", "warn")
+                                   and getattr(estimator, "solver", None) == "liblinear")
+    manifest = {
+        "format": FORMAT_VERSION,
+        "classes": [c.item() if hasattr(c, "item") else c for c in estimator.classes_],
+        "ngram_range": list(vectorizer.ngram_range),
+        "sublinear_tf": bool(vectorizer.sublinear_tf),
+        "use_idf": bool(vectorizer.use_idf),
+        "norm": vectorizer.norm,
+        "stop_words": sorted(vectorizer.get_stop_words() or ()),
+        "probability": "ovr" if ovr and len(estimator.classes_) > 2 else "softmax"
+    }
+
+    os.makedirs(directory, exist_ok=True)
+    _save_array(directory, "terms", terms)
+    _save_array(directory, "idf", vectorizer.idf_ if vectorizer.use_idf else np.ones(len(terms)))
+    _save_array(directory, "coef", np.asarray(estimator.coef_, dtype=np.float64))
+    _save_array(directory, "intercept", np.asarray(estimator.intercept_, dtype=np.float64))
+    tmp = os.path.join(directory, MANIFEST + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(directory, MANIFEST))
+    return manifest
+
+class CompactModel:
+    """TF-IDF settings and logistic regression weights, memory-mapped from disk
+
+    Stands in for both pipeline steps of ThreatClassifier: it carries the
+    vectorizer attributes _tfidf_matrix() reads (vocabulary_, ngram_range,
+    sublinear_tf, use_idf, idf_, norm) and the estimator's classes_ /
+    predict_proba(). The arrays are mapped read-only, so loading takes
+    milliseconds and every worker process shares the same pages of the OS
+    page cache. Only the term -> column dict is built per process, on first
+    use, since per-term Python lookups are as slow in any array form.
+    """
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, MANIFEST), "r") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact model format {manifest.get('format')}")
+
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in ARRAYS}
+        self.directory = directory
+        self.terms = arrays["terms"]
+        self.idf_ = arrays["idf"]
+        self.coef_ = arrays["coef"]
+        self.intercept_ = arrays["intercept"]
+        self.classes_ = np.array(manifest["classes"])
+        self.ngram_range = tuple(manifest["ngram_range"])
+        self.sublinear_tf = manifest["sublinear_tf"]
+        self.use_idf = manifest["use_idf"]
+        self.norm = manifest["norm"]
+        self.stop_words = frozenset(manifest["stop_words"])
+        self.probability = manifest["probability"]
+        self._vocabulary: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def load(cls, directory: str) -> Optional["CompactModel"]:
+        """The compact model in a directory, or None if none has been exported there"""
+        if not os.path.exists(os.path.join(directory, MANIFEST)):
+            return None
+        return cls(directory)
+
+    @property
+    def vocabulary_(self) -> Dict[str, int]:
+        if self._vocabulary is None:
+            self._vocabulary = dict(zip(self.terms.tolist(), range(len(self.terms))))
+        return self._vocabulary
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Class probabilities as LogisticRegression.predict_proba computes them"""
+        scores = np.asarray(X @ self.coef_.T) + self.intercept_
+        if scores.shape[1] == 1:
+            positive = 1 / (1 + np.exp(-scores[:, 0]))
+            return np.column_stack([1 - positive, positive])
+        if self.probability == "ovr":
+            scores = 1 / (1 + np.exp(-scores))
+            return scores / scores.sum(axis=1, keepdims=True)
+        scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+        return scores / scores.sum(axis=1, keepdims=True)
@@ -1,36 +1,69 @@
 import re
+import json
+import sqlite3
 import requests
 import logging
 
+from ..services.rate_limiter import get_rate_limiter
+from ..services.http_archive import get_http_archive
+from ..services.http_client import FetchResult
+from .analyzed_text import AnalyzedText
+from .nvd_store import get_nvd_store
+
 logger = logging.getLogger(__name__)
 
+# Regex for CVE-YYYY-NNNNN
+CVE_PATTERN = re.compile(r'CVE-\d{4}-\d{4,7}', re.IGNORECASE)
+
 class CveExtractor:
     def __init__(self):
-        # Regex for CVE-YYYY-NNNNN
-        self.cve_pattern = r'CVE-\d{4}-\d{4,7}'
+        self.cve_pattern = CVE_PATTERN
+        self.nvd = get_nvd_store()
 
     def extract_cves(self, text):
-        """Extract all CVE IDs from text"""
+        """Extract all CVE IDs from text (a string, or AnalyzedText whose IOC pass already found them)"""
+        if isinstance(text, AnalyzedText):
+            return sorted(text.iocs["cves"])
         if not text:
             return []
         
-        matches = re.findall(self.cve_pattern, text, re.IGNORECASE)
+        matches = CVE_PATTERN.findall(text)
         # Normalize to uppercase and remove duplicates
         cves = sorted(list(set([m.upper() for m in matches])))
         return cves
 
+    def lookup_cves(self, cve_ids):
+        """Details of CVEs found in the local NVD mirror, in one batched query (no network)"""
+        if not cve_ids:
+            return {}
+        try:
+            return self.nvd.lookup(cve_ids)
+        except sqlite3.Error as e:
+            logger.error(f"NVD mirror lookup failed: {e}")
+            return {}
+
+    def max_cvss(self, cve_ids, details=None):
+        """Highest CVSS base score of the CVEs known to the mirror, or None if none is known"""
+        details = self.lookup_cves(cve_ids) if details is None else details
+        scores = [details[cve_id]["cvss_score"] for cve_id in cve_ids if cve_id in details]
+        return max(scores) if scores else None
+
     def fetch_cve_details(self, cve_id):
         """
-        Fetch CVE details from NVD API
-        Note: In a production environment, you should use an API key 
-        and handle rate limiting. This is a basic implementation.
+        Fetch CVE details, from the local NVD mirror when it has the CVE, else the NVD API
+        Note: In a production environment, you should use an API key.
+        Requests go through the shared per-host rate limiter and the HTTP
+        archive when recording or replaying.
         """
+        local = self.lookup_cves([cve_id]).get(cve_id.upper())
+        if local:
+            return local
         try:
             url = f"https://services.nvd.nist.gov/rest/json/cves/2.0?cveId={cve_id}"
-            response = requests.get(url, timeout=10)
+            response = self._get(url)
             
-            if response.status_code == 200:
-                data = response.json()
+            if response.status == 200:
+                data = json.loads(response.body)
                 vulnerabilities = data.get('vulnerabilities', [])
                 if not vulnerabilities:
                     return None
@@ -56,6 +89,23 @@ class CveExtractor:
             
         return None
 
+    def _get(self, url):
+        archive = get_http_archive()
+        if archive and archive.replaying:
+            return archive.replay_blocking(url)
+
+        rate_limiter = get_rate_limiter()
+        rate_limiter.acquire_blocking(url)
+        response = requests.get(url, timeout=10)
+        if response.status_code in (429, 503):
+            rate_limiter.apply_retry_after(url, response.headers.get("Retry-After"))
+
+        result = FetchResult(url=response.url, status=response.status_code,
+                             headers=response.headers, body=response.content)
+        if archive:
+            archive.record(url, result)
+        return result
+
 if __name__ == "__main__":
     # Quick test
     extractor = CveExtractor()
@@ -1,19 +1,70 @@
+import logging
+import time
+from typing import List, Optional
+
 import spacy
-import re
+
+from config import Config
+from .analyzed_text import AnalyzedText
+from .gazetteer import get_gazetteer
+
+logger = logging.getLogger(__name__)
+
+# Components extract_entities never reads: it only uses doc.ents
+UNUSED_COMPONENTS = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
 
 class EntityExtractor:
-    def __init__(self):
+    def __init__(self, model: Optional[str] = None):
+        model = model or Config.SPACY_MODEL
         try:
-            # Load small model for efficiency
-            self.nlp = spacy.load("en_core_web_sm")
+            # Load only what NER needs (tok2vec + ner)
+            self.nlp = spacy.load(model, exclude=UNUSED_COMPONENTS)
         except OSError:
             # If model is not found, we can't do much NER
             # User will need to run 'python -m spacy download en_core_web_sm'
-            print("Warning: spaCy model 'en_core_web_sm' not found.")
+            logger.warning(f"spaCy model '{model}' not found, NER disabled")
             self.nlp = None
+        self.gazetteer = get_gazetteer()
+        self.stats = {"docs": 0, "seconds": 0.0}
+
+    def parse_batch(self, texts, batch_size: Optional[int] = None,
+                    n_process: Optional[int] = None) -> List[AnalyzedText]:
+        """Parse many texts with one nlp.pipe call, caching each Doc on its AnalyzedText"""
+        analyzed = [AnalyzedText.of(text) for text in texts]
+        pending = [a for a in analyzed if a.text and not a.has_doc]
+        if not self.nlp or not pending:
+            return analyzed
+
+        started = time.perf_counter()
+        docs = self.nlp.pipe(
+            (a.text for a in pending),
+            batch_size=batch_size or Config.NER_BATCH_SIZE,
+            n_process=n_process or Config.NER_N_PROCESS
+        )
+        for text, doc in zip(pending, docs):
+            text.set_doc(doc)
+        elapsed = time.perf_counter() - started
+
+        self.stats["docs"] += len(pending)
+        self.stats["seconds"] += elapsed
+        logger.info(f"NER: {len(pending)} docs in {elapsed:.2f}s "
+                    f"({len(pending) / elapsed if elapsed else 0:.0f} docs/sec)")
+        return analyzed
+
+    def extract_entities_batch(self, texts) -> List[dict]:
+        """extract_entities for many texts, parsed together with nlp.pipe"""
+        return [self.extract_entities(text) for text in self.parse_batch(texts)]
+
+    def get_throughput(self) -> dict:
+        seconds = self.stats["seconds"]
+        return {
+            "docs": self.stats["docs"],
+            "seconds": round(seconds, 3),
+            "docs_per_sec": round(self.stats["docs"] / seconds, 1) if seconds else None
+        }
 
     def extract_entities(self, text):
-        """Extract various entities from text"""
+        """Extract various entities from text (a string or AnalyzedText)"""
         entities = {
             "organizations": [],
             "locations": [],
@@ -21,56 +72,28 @@ class EntityExtractor:
             "threat_actors": []
         }
 
-        if not self.nlp or not text:
+        analyzed = AnalyzedText.of(text)
+        if not analyzed.text:
             return entities
 
-        doc = self.nlp(text)
-
-        for ent in doc.ents:
-            if ent.label_ == "ORG":
-                # Clean up and filter common non-orgs if necessary
-                name = ent.text.strip()
-                if len(name) > 2 and name not in entities["organizations"]:
-                    entities["organizations"].append(name)
-            elif ent.label_ == "GPE" or ent.label_ == "LOC":
-                name = ent.text.strip()
-                if name not in entities["locations"]:
-                    entities["locations"].append(name)
-
-        # Custom extraction for technologies (common products/software)
-        tech_keywords = [
-            'windows', 'linux', 'macos', 'android', 'ios', 'cisco', 'fortinet',
-            'apache', 'nginx', 'wordpress', 'vmware', 'exchange', 'sql', 'oracle',
-            'kubernetes', 'docker', 'chrome', 'firefox', 'safari', 'vpn', 'router',
-            'firewall', 'cloud', 'aws', 'azure', 'googleg', 'microsoft', 'intel',
-            'whatsapp', 'facebook', 'instagram', 'twitter', 'telegram'
-        ]
-        
-        lower_text = text.lower()
-        for tech in tech_keywords:
-            if re.search(rf'\b{tech}\b', lower_text):
-                # Capitalize nicely
-                tech_display = tech.capitalize()
-                if tech == 'aws': tech_display = 'AWS'
-                if tech == 'vpn': tech_display = 'VPN'
-                if tech == 'sql': tech_display = 'SQL'
-                
-                if tech_display not in entities["technologies"]:
-                    entities["technologies"].append(tech_display)
-
-        # Custom extraction for threat actors (common patterns like APTxx, Lazarus, etc.)
-        actor_patterns = [
-            r'APT\d+', r'Lazarus Group', r'Fancy Bear', r'Cozy Bear', 
-            r'LockBit', r'Conti', r'REvil', r'ALPHV', r'BlackCat',
-            r'DarkSide', r'Wizard Spider', r'Sandworm', r'Guccifer'
-        ]
-        
-        for pattern in actor_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                actor = match.group()
-                if actor not in entities["threat_actors"]:
-                    entities["threat_actors"].append(actor)
+        if self.nlp:
+            doc = analyzed.doc(self.nlp)
+
+            for ent in doc.ents:
+                if ent.label_ == "ORG":
+                    # Clean up and filter common non-orgs if necessary
+                    name = ent.text.strip()
+                    if len(name) > 2 and name not in entities["organizations"]:
+                        entities["organizations"].append(name)
+                elif ent.label_ == "GPE" or ent.label_ == "LOC":
+                    name = ent.text.strip()
+                    if name not in entities["locations"]:
+                        entities["locations"].append(name)
+
+        # Technologies and threat actors come from the gazetteers, aliases mapped to canonical names
+        for kind, names in self.gazetteer.match_tokens(analyzed.tokens).items():
+            if kind in entities:
+                entities[kind] = names
 
         return entities
 
@@ -0,0 +1,138 @@
+"""
+Gazetteer matching: alias phrases to canonical entity names through a token trie
+"""
+
+import glob
+import json
+import logging
+import os
+import re
+from typing import Dict, List, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+TOKEN = re.compile(r"\w+")
+
+# Trie key holding the (kind, canonical name) pairs a phrase ends on
+_END = ""
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN.findall(text.lower())
+
+class Gazetteer:
+    """Whole-word, case-insensitive phrase matching over versioned gazetteer files
+
+    Each file names an entity kind and maps canonical names to aliases, e.g.
+    "Lazarus Group": ["lazarus", "apt38", "hidden cobra"]. All aliases of all
+    files go into one token trie, so a text is matched in a single pass whose
+    cost depends on its length, not on the number of aliases. Where aliases
+    overlap the longest one wins. A file may also list `patterns`: regexes
+    matched against single leftover tokens (like apt\\d+ for unlisted APT
+    numbers), reported upper-cased. Aliases listed in `qualified_aliases`
+    are ordinary words ("monsoon", "patchwork") and only match when a token
+    just before or after them is one of the file's `qualifiers` ("APT",
+    "group").
+    """
+
+    def __init__(self):
+        self.trie: dict = {}
+        self.patterns: Dict[str, re.Pattern] = {}
+        self.qualifiers: Dict[str, set] = {}
+        self.kinds: List[str] = []
+        self.versions: Dict[str, str] = {}
+        self.alias_count = 0
+
+    @classmethod
+    def from_dir(cls, directory: str) -> "Gazetteer":
+        gazetteer = cls()
+        for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+            with open(path, "r", encoding="utf-8") as f:
+                gazetteer.add_file(json.load(f), source=os.path.basename(path))
+        return gazetteer
+
+    def add_file(self, data: dict, source: str = ""):
+        """Add one gazetteer file's entries and patterns"""
+        kind = data["kind"]
+        if kind not in self.kinds:
+            self.kinds.append(kind)
+        self.versions[kind] = data.get("version", "")
+        self.qualifiers.setdefault(kind, set()).update(q.lower() for q in data.get("qualifiers", []))
+        qualified = {tuple(tokenize(alias)) for alias in data.get("qualified_aliases", [])}
+        for canonical, aliases in data.get("entries", {}).items():
+            for alias in [canonical, *aliases]:
+                self.add(kind, canonical, alias, qualified=tuple(tokenize(alias)) in qualified)
+        patterns = data.get("patterns", [])
+        if kind in self.patterns:
+            patterns = [self.patterns[kind].pattern, *patterns]
+        if patterns:
+            self.patterns[kind] = re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+        logger.debug(f"Gazetteer {kind} {self.versions[kind]} loaded from {source}")
+
+    def add(self, kind: str, canonical: str, alias: str, qualified: bool = False):
+        tokens = tokenize(alias)
+        if not tokens:
+            return
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        targets = node.setdefault(_END, [])
+        if not any(target[:2] == (kind, canonical) for target in targets):
+            targets.append((kind, canonical, qualified))
+            self.alias_count += 1
+
+    def _qualified(self, kind: str, tokens: List[str], start: int, end: int) -> bool:
+        """Whether a qualifier of the kind sits right before or after tokens[start:end]"""
+        qualifiers = self.qualifiers.get(kind, ())
+        return ((start > 0 and tokens[start - 1] in qualifiers)
+                or (end < len(tokens) and tokens[end] in qualifiers))
+
+    def match(self, text: str) -> Dict[str, List[str]]:
+        """Canonical names per kind, in order of first mention"""
+        return self.match_tokens(tokenize(text))
+
+    def match_tokens(self, tokens: List[str]) -> Dict[str, List[str]]:
+        """match() for text already split by tokenize()"""
+        found: Dict[str, List[str]] = {kind: [] for kind in self.kinds}
+        position = 0
+        while position < len(tokens):
+            node = self.trie
+            targets, end = None, position
+            for index in range(position, len(tokens)):
+                node = node.get(tokens[index])
+                if node is None:
+                    break
+                if _END in node:
+                    matched = [
+                        (kind, canonical) for kind, canonical, qualified in node[_END]
+                        if not qualified or self._qualified(kind, tokens, position, index + 1)
+                    ]
+                    if matched:
+                        targets, end = matched, index + 1
+
+            if targets:
+                for kind, canonical in targets:
+                    if canonical not in found[kind]:
+                        found[kind].append(canonical)
+                position = end
+                continue
+
+            token = tokens[position]
+            for kind, pattern in self.patterns.items():
+                if pattern.fullmatch(token):
+                    name = token.upper()
+                    if name not in found[kind]:
+                        found[kind].append(name)
+            position += 1
+        return found
+
+_gazetteer: Optional[Gazetteer] = None
+
+def get_gazetteer() -> Gazetteer:
+    """Process-wide gazetteer loaded from GAZETTEER_DIR"""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer.from_dir(Config.GAZETTEER_DIR)
+        logger.info(f"Gazetteer: {_gazetteer.alias_count} aliases, versions {_gazetteer.versions}")
+    return _gazetteer
@@ -0,0 +1,158 @@
+"""
+Single-pass extraction of indicators of compromise (IPs, domains, URLs, hashes, CVEs)
+"""
+
+import ipaddress
+import re
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+# Dots as written in defanged advisories: evil[.]com, evil(.)com, evil{.}com, evil[dot]com
+_DOT = r"(?:\.|\[\.\]|\(\.\)|\{\.\}|\[dot\]|\(dot\))"
+_OCTET = r"(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)"
+_LABEL = r"[a-z0-9][a-z0-9-]*"
+
+# Domains need a known TLD, otherwise file names (payload.exe, config.js) and
+# abbreviations (e.g) would match
+TLDS = (
+    "com net org info biz io co gov edu mil int xyz top site online club shop app dev cloud live tech "
+    "me tv cc ws su ru cn in uk us de fr jp br au ca nl eu ch se no es it pl kr ir kp ua tk ml ga cf gq "
+    "pw ly to is sh onion"
+).split()
+# TLDs that are also file extensions (install.sh, main.pl, lib.cc, model.ml) or
+# English words (it, is, to, me): a domain ending in one counts only when it
+# is defanged or is a URL's host
+CONTEXT_TLDS = frozenset("sh pl cc ml it is to me no us".split())
+
+# Dotted product names that read as domains in prose
+NOT_DOMAINS = frozenset(["asp.net", "vb.net", "ado.net"])
+
+# Page text is joined without separators, so "users.</p><p>In a statement"
+# reads "users.In a statement": a capitalised TLD after a lowercase label is
+# a sentence start, unless the domain is defanged or a URL's host
+_SENTENCE_JOIN = re.compile(r"[a-z0-9-]\.[A-Z][a-z]*$")
+
+# A dotted four-part version ("version 10.2.3.4", "build 6.1.76.2") is not
+# an address. Without such a word in front it cannot be told apart from one,
+# so "Chrome 10.2.3.4" is still reported as an IPv4 address.
+_VERSION_BEFORE = re.compile(r"\b(?:version|ver\.?|build|release|firmware)\s*$", re.IGNORECASE)
+
+_TLD = "(?:" + "|".join(sorted(TLDS, key=len, reverse=True)) + ")"
+_CVE = r"CVE-\d{4}-\d{4,7}\b"
+_HASH = r"[a-f0-9]{32}(?:[a-f0-9]{8}(?:[a-f0-9]{24})?)?\b"
+
+# One alternation, tried in this order: a URL swallows its host. Python's re
+# tries every branch at every position, so the shared lookbehind rejects
+# mid-word positions at once, the hash lengths share one branch and the IPv6
+# and domain branches check for a colon / dot before doing any real work.
+IOC_PATTERN = re.compile(
+    r"(?<![\w.-])(?:"
+    rf"(?P<url>(?:h(?:tt|xx)ps?|fxp|ftp)(?:://|\[://\]|\[:\]//)[^\s<>\"']+)"
+    rf"|(?P<cve>{_CVE})"
+    rf"|(?P<hash>{_HASH})"
+    rf"|(?P<ipv6>(?<!:)(?=[a-f0-9]{{0,4}}:)(?:[a-f0-9]{{0,4}}:){{2,7}}[a-f0-9]{{0,4}}(?![\w:]))"
+    rf"|(?P<ipv4>{_OCTET}(?:{_DOT}{_OCTET}){{3}}(?!\d|\.\d))"
+    rf"|(?P<domain>(?=[\w-]*[.\[({{])(?:{_LABEL}{_DOT})+{_TLD}\b(?!\.\w))"
+    ")",
+    re.IGNORECASE
+)
+
+# The url branch consumes its whole match, so CVE ids and hashes in a URL
+# (nvd.nist.gov/vuln/detail/CVE-..., /file/<sha256>) are found by rescanning it
+EMBEDDED_PATTERN = re.compile(rf"(?<![\w.-])(?:(?P<cve>{_CVE})|(?P<hash>{_HASH}))", re.IGNORECASE)
+
+# MD5, SHA-1 and SHA-256 by hex length
+HASH_TYPES = {32: "md5", 40: "sha1", 64: "sha256"}
+
+_DEFANGED = re.compile(r"\[\.\]|\(\.\)|\{\.\}|\[dot\]|\(dot\)|\[://\]|\[:\]|^hxxp|^fxp", re.IGNORECASE)
+_REFANG = {"[.]": ".", "(.)": ".", "{.}": ".", "[dot]": ".", "(dot)": ".", "[://]": "://", "[:]": ":",
+           "hxxp": "http", "fxp": "ftp"}
+
+# Sentence punctuation a URL match picks up at its end
+_URL_TRAILING = ".,;:!?)]}'\""
+
+IOC_TYPES = ["ipv4", "ipv6", "domains", "urls", "md5", "sha1", "sha256", "cves"]
+
+def refang(value: str) -> str:
+    """Undo defanging: hxxp -> http, [.] / (dot) -> ., [:]// -> ://"""
+    return _DEFANGED.sub(lambda m: _REFANG[m.group(0).lower()], value)
+
+class IocExtractor:
+    """Every indicator type found in one regex pass, refanged and deduplicated
+
+    Each kind is reported once, in order of first appearance. URLs also add
+    their host to the domains or IP addresses.
+    """
+
+    def extract(self, text: str) -> Dict[str, List[str]]:
+        found = {kind: {} for kind in IOC_TYPES}  # dicts as ordered sets
+        if not text:
+            return {kind: [] for kind in IOC_TYPES}
+
+        for match in IOC_PATTERN.finditer(text):
+            kind, value = match.lastgroup, match.group()
+            if kind == "url":
+                url = refang(value).rstrip(_URL_TRAILING)
+                found["urls"][url] = None
+                self._add_host(found, urlsplit(url).hostname)
+                for embedded in EMBEDDED_PATTERN.finditer(url):
+                    self._add_id(found, embedded.lastgroup, embedded.group())
+            elif kind in ("cve", "hash"):
+                self._add_id(found, kind, value)
+            elif kind == "ipv6":
+                address = self._ipv6(value)
+                if address:
+                    found["ipv6"][address] = None
+            elif kind == "ipv4":
+                address = refang(value)
+                if address != value or not _VERSION_BEFORE.search(text, max(0, match.start() - 12), match.start()):
+                    found["ipv4"][address] = None
+            else:
+                domain = refang(value).lower()
+                if domain != value.lower() or self._plain_domain_ok(value):
+                    found["domains"][domain] = None
+
+        return {kind: list(values) for kind, values in found.items()}
+
+    @staticmethod
+    def _plain_domain_ok(value: str) -> bool:
+        """Whether a domain written without defanging, outside a URL, is an indicator"""
+        domain = value.lower()
+        return (domain.rsplit(".", 1)[-1] not in CONTEXT_TLDS and domain not in NOT_DOMAINS
+                and not _SENTENCE_JOIN.search(value))
+
+    @staticmethod
+    def _add_id(found: dict, kind: str, value: str):
+        """Add a CVE id or a hash (typed by its length)"""
+        if kind == "cve":
+            found["cves"][value.upper()] = None
+        else:
+            found[HASH_TYPES[len(value)]][value.lower()] = None
+
+    @staticmethod
+    def _ipv6(value: str) -> Optional[str]:
+        """Compressed form of a real IPv6 address (times like 10:30:45 and a bare :: are rejected)"""
+        try:
+            address = ipaddress.IPv6Address(value)
+        except ValueError:
+            return None
+        return None if address.is_unspecified else address.compressed
+
+    def _add_host(self, found: dict, host: Optional[str]):
+        if not host:
+            return
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            found["domains"][host.lower()] = None
+            return
+        found["ipv4" if address.version == 4 else "ipv6"][address.compressed] = None
+
+_ioc_extractor: Optional[IocExtractor] = None
+
+def get_ioc_extractor() -> IocExtractor:
+    """Process-wide IOC extractor"""
+    global _ioc_extractor
+    if _ioc_extractor is None:
+        _ioc_extractor = IocExtractor()
+    return _ioc_extractor
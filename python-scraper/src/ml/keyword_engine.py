@@ -0,0 +1,155 @@
+"""
+Single-pass keyword matching for every keyword rule set (Aho-Corasick)
+"""
+
+import json
+import logging
+from collections import deque
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+from config import Config
+
+try:
+    import ahocorasick
+except ImportError:  # optional C automaton
+    ahocorasick = None
+
+logger = logging.getLogger(__name__)
+
+# (rule set, label, whole-word only) for every rule a keyword belongs to
+Payload = Tuple[str, str, bool]
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+class _PythonAutomaton:
+    """Aho-Corasick automaton in pure Python, used when pyahocorasick is not installed"""
+
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[list] = [[]]
+
+    def add_word(self, term: str, value):
+        state = 0
+        for char in term:
+            state = self.goto[state].setdefault(char, len(self.goto))
+            if state == len(self.goto):
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+        self.out[state].append(value)
+
+    def make_automaton(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+
+    def iter(self, text: str) -> Iterator[Tuple[int, tuple]]:
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for value in out[state]:
+                yield index, value
+
+class KeywordHits:
+    """Labels matched in one text, grouped by rule set"""
+
+    def __init__(self, engine: "KeywordEngine", hits: FrozenSet[Tuple[str, str]]):
+        self.engine = engine
+        self.hits = hits
+
+    def has(self, rule_set: str, label: Optional[str] = None) -> bool:
+        """Whether any label of a rule set (or the given label) matched"""
+        if label is not None:
+            return (rule_set, label) in self.hits
+        return any(hit_set == rule_set for hit_set, _ in self.hits)
+
+    def labels(self, rule_set: str) -> List[str]:
+        """Matched labels of a rule set, in rules-file order"""
+        return [label for label in self.engine.labels(rule_set) if (rule_set, label) in self.hits]
+
+    def first(self, rule_set: str, default: Optional[str] = None) -> Optional[str]:
+        """First matched label of a rule set in rules-file order"""
+        for label in self.engine.labels(rule_set):
+            if (rule_set, label) in self.hits:
+                return label
+        return default
+
+class KeywordEngine:
+    """One automaton over the keywords of every rule set, matched in a single pass
+
+    Rules map a rule set to ordered labels and their keywords. Keywords match
+    anywhere in the lower-cased text, like `keyword in text`, unless marked
+    `"word": true`, in which case they must not touch a letter or digit on
+    either side. Scanning cost depends on the text length, not the number of
+    keywords.
+    """
+
+    def __init__(self, rules: Dict[str, Dict[str, list]]):
+        self._labels: Dict[str, List[str]] = {}
+        terms: Dict[str, List[Payload]] = {}
+        for rule_set, labels in rules.items():
+            if rule_set.startswith("_"):
+                continue
+            self._labels[rule_set] = list(labels)
+            for label, keywords in labels.items():
+                for keyword in keywords:
+                    if isinstance(keyword, dict):
+                        term, word = keyword["term"], keyword.get("word", False)
+                    else:
+                        term, word = keyword, False
+                    terms.setdefault(term.lower(), []).append((rule_set, label, word))
+
+        self.automaton = ahocorasick.Automaton() if ahocorasick else _PythonAutomaton()
+        for term, payloads in terms.items():
+            self.automaton.add_word(term, (len(term), tuple(payloads)))
+        self.automaton.make_automaton()
+        self.keyword_count = len(terms)
+
+    @classmethod
+    def from_file(cls, path: str) -> "KeywordEngine":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def labels(self, rule_set: str) -> List[str]:
+        return self._labels.get(rule_set, [])
+
+    def scan(self, text: str, lowered: bool = False) -> KeywordHits:
+        """Every (rule set, label) with a keyword in the text"""
+        if not lowered:
+            text = text.lower()
+        hits = set()
+        for end, (length, payloads) in self.automaton.iter(text):
+            start = end - length + 1
+            bounded = None
+            for rule_set, label, word in payloads:
+                if word:
+                    if bounded is None:
+                        bounded = not ((start > 0 and _is_word_char(text[start - 1])) or
+                                       (end + 1 < len(text) and _is_word_char(text[end + 1])))
+                    if not bounded:
+                        continue
+                hits.add((rule_set, label))
+        return KeywordHits(self, frozenset(hits))
+
+_keyword_engine: Optional[KeywordEngine] = None
+
+def get_keyword_engine() -> KeywordEngine:
+    """Process-wide engine built from KEYWORD_RULES_PATH"""
+    global _keyword_engine
+    if _keyword_engine is None:
+        _keyword_engine = KeywordEngine.from_file(Config.KEYWORD_RULES_PATH)
+        logger.info(f"Keyword engine: {_keyword_engine.keyword_count} keywords "
+                    f"({'pyahocorasick' if ahocorasick else 'pure Python'})")
+    return _keyword_engine
@@ -1,84 +1,71 @@
-import re
+from .analyzed_text import AnalyzedText
 
 class MitreMapper:
     def __init__(self):
         # A dictionary of common MITRE ATT&CK techniques with their IDs and tactics
-        # This is a curated subset for the project
+        # This is a curated subset for the project; the keywords for each are the
+        # "mitre_techniques" rule set in keyword_rules.json
         self.techniques_map = {
             "Phishing": {
                 "id": "T1566",
-                "tactic": "Initial Access",
-                "keywords": [r'phish', r'email', r'spoof', r'social engineering']
+                "tactic": "Initial Access"
             },
             "Exploit Public-Facing Application": {
                 "id": "T1190",
-                "tactic": "Initial Access",
-                "keywords": [r'vulnerability', r'exploit', r'cve', r'web application', r'remote code execution', r'rce']
+                "tactic": "Initial Access"
             },
             "External Remote Services": {
                 "id": "T1133",
-                "tactic": "Initial Access",
-                "keywords": [r'vpn', r'rdp', r'remote desktop', r'ssh']
+                "tactic": "Initial Access"
             },
             "Supply Chain Compromise": {
                 "id": "T1195",
-                "tactic": "Initial Access",
-                "keywords": [r'supply chain', r'vendor', r'software update', r'upstream']
+                "tactic": "Initial Access"
             },
             "PowerShell": {
                 "id": "T1059.001",
-                "tactic": "Execution",
-                "keywords": [r'powershell', r'ps1', r'scripting']
+                "tactic": "Execution"
             },
             "Scheduled Task/Job": {
                 "id": "T1053",
-                "tactic": "Persistence",
-                "keywords": [r'scheduled task', r'cron job', r'persistence']
+                "tactic": "Persistence"
             },
             "Brute Force": {
                 "id": "T1110",
-                "tactic": "Credential Access",
-                "keywords": [r'brute force', r'password guessing', r'credential stuffing']
+                "tactic": "Credential Access"
             },
             "Adversary-in-the-Middle": {
                 "id": "T1557",
-                "tactic": "Credential Access",
-                "keywords": [r'man-in-the-middle', r'mitm', r'interception', r'sniffing']
+                "tactic": "Credential Access"
             },
             "Data from Local System": {
                 "id": "T1005",
-                "tactic": "Collection",
-                "keywords": [r'data exfiltration', r'stealing', r'scraping', r'collection']
+                "tactic": "Collection"
             },
             "Data Encrypted for Impact": {
                 "id": "T1486",
-                "tactic": "Impact",
-                "keywords": [r'ransomware', r'encrypt', r'locked', r'extortion']
+                "tactic": "Impact"
             },
             "Endpoint Denial of Service": {
                 "id": "T1499",
-                "tactic": "Impact",
-                "keywords": [r'ddos', r'denial of service', r'shutdown', r'unavailable']
+                "tactic": "Impact"
             }
         }
 
     def map_techniques(self, text):
-        """Map text to MITRE techniques based on keywords"""
+        """Map text (a string or AnalyzedText) to MITRE techniques based on keywords"""
         mapped_techniques = []
-        lower_text = text.lower()
 
-        for name, info in self.techniques_map.items():
-            for pattern in info["keywords"]:
-                if re.search(pattern, lower_text):
-                    technique = {
-                        "id": info["id"],
-                        "name": name,
-                        "tactic": info["tactic"],
-                        "url": f"https://attack.mitre.org/techniques/{info['id'].replace('.', '/')}/"
-                    }
-                    if technique not in mapped_techniques:
-                        mapped_techniques.append(technique)
-                    break # Move to next technique after finding one match
+        for name in AnalyzedText.of(text).hits.labels("mitre_techniques"):
+            info = self.techniques_map.get(name)
+            if info is None:
+                continue
+            mapped_techniques.append({
+                "id": info["id"],
+                "name": name,
+                "tactic": info["tactic"],
+                "url": f"https://attack.mitre.org/techniques/{info['id'].replace('.', '/')}/"
+            })
 
         return mapped_techniques
 
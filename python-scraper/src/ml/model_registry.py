@@ -0,0 +1,119 @@
+"""
+Process-wide registry of the enrichment models, each loaded lazily and once per process
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+def resident_memory() -> Optional[int]:
+    """Resident set size of this process in bytes (Linux /proc), or None"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+# Loaders import their modules themselves, so importing the scrapers or the
+# API never pulls in spaCy or scikit-learn
+def _load_classifier():
+    from .threat_classifier import ThreatClassifier
+    return ThreatClassifier()
+
+def _load_entity_extractor():
+    from .entity_extractor import EntityExtractor
+    return EntityExtractor()
+
+def _load_mitre_mapper():
+    from .mitre_mapper import MitreMapper
+    return MitreMapper()
+
+def _load_cve_extractor():
+    from .cve_extractor import CveExtractor
+    return CveExtractor()
+
+def _load_keywords():
+    from .keyword_engine import get_keyword_engine
+    return get_keyword_engine()
+
+DEFAULT_LOADERS: Dict[str, Callable[[], Any]] = {
+    "classifier": _load_classifier,
+    "entity_extractor": _load_entity_extractor,
+    "mitre_mapper": _load_mitre_mapper,
+    "cve_extractor": _load_cve_extractor,
+    "keywords": _load_keywords
+}
+
+class ModelRegistry:
+    """Named models shared by every EnrichmentService in the process
+
+    A model is loaded on its first get() and then reused by every scraper and
+    run. Load time and the growth in resident memory while loading (imports
+    included) are recorded per model.
+    """
+
+    def __init__(self, loaders: Optional[Dict[str, Callable[[], Any]]] = None):
+        self.loaders = dict(DEFAULT_LOADERS if loaders is None else loaders)
+        self.models: Dict[str, Any] = {}
+        self.stats: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        if name not in self.models:
+            with self._lock:  # enrichment threads may ask for the same model at once
+                if name not in self.models:
+                    self._load(name)
+        return self.models[name]
+
+    def _load(self, name: str):
+        loader = self.loaders.get(name)
+        if loader is None:
+            raise KeyError(f"Unknown model '{name}'")
+
+        rss_before = resident_memory()
+        started = time.perf_counter()
+        self.models[name] = loader()
+        seconds = time.perf_counter() - started
+        rss_after = resident_memory()
+
+        rss_bytes = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+        self.stats[name] = {
+            "load_seconds": round(seconds, 3),
+            "rss_mb": round(rss_bytes / 2**20, 1) if rss_bytes is not None else None
+        }
+        logger.info(f"Model '{name}' loaded in {seconds:.2f}s"
+                    + (f" (+{rss_bytes / 2**20:.0f} MB resident)" if rss_bytes is not None else ""))
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self.models
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> dict:
+        """Load the given models (default: all) now instead of on first use"""
+        for name in names or self.loaders:
+            self.get(name)
+        return self.get_stats()
+
+    def get_stats(self) -> dict:
+        """Load time and resident memory per model, for this process"""
+        rss = resident_memory()
+        return {
+            "pid": os.getpid(),
+            "rss_mb": round(rss / 2**20, 1) if rss is not None else None,
+            "models": {
+                name: {"loaded": name in self.models, **self.stats.get(name, {})}
+                for name in self.loaders
+            }
+        }
+
+_model_registry: Optional[ModelRegistry] = None
+
+def get_model_registry() -> ModelRegistry:
+    """Process-wide model registry (one per enrichment worker process)"""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry()
+    return _model_registry
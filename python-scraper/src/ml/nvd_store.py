@@ -0,0 +1,230 @@
+"""
+Local NVD mirror: CVE feed files imported into an indexed SQLite database
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# SQLite's default limit on bound parameters is 999 on older builds
+LOOKUP_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cves (
+    id TEXT PRIMARY KEY,
+    cvss_score REAL,
+    cvss_version TEXT,
+    severity TEXT,
+    published TEXT,
+    last_modified TEXT,
+    description TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS feeds (
+    name TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime REAL,
+    cves INTEGER,
+    imported_at TEXT
+);
+"""
+
+# Newer records win; a feed imported out of order never downgrades a CVE
+UPSERT = """
+INSERT INTO cves (id, cvss_score, cvss_version, severity, published, last_modified, description)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    cvss_score = excluded.cvss_score,
+    cvss_version = excluded.cvss_version,
+    severity = excluded.severity,
+    published = excluded.published,
+    last_modified = excluded.last_modified,
+    description = excluded.description
+WHERE excluded.last_modified >= cves.last_modified
+"""
+
+Row = Tuple[str, Optional[float], Optional[str], Optional[str], str, str, str]
+
+def _pick_metric(entries: list) -> dict:
+    """The NVD ("Primary") entry of a metric list, else the first one"""
+    for entry in entries:
+        if entry.get("type") == "Primary":
+            return entry
+    return entries[0]
+
+def _row_from_v2(cve: dict) -> Row:
+    """Row for a CVE in the NVD 2.0 format (API responses and nvdcve-2.0-*.json feeds)"""
+    metrics = cve.get("metrics", {})
+    score = version = severity = None
+    # CVSS v3.1 first, then v3.0, then v2 (as fetch_cve_details did)
+    for key, name in (("cvssMetricV31", "3.1"), ("cvssMetricV30", "3.0"), ("cvssMetricV2", "2.0")):
+        if metrics.get(key):
+            metric = _pick_metric(metrics[key])
+            score = metric["cvssData"]["baseScore"]
+            severity = metric["cvssData"].get("baseSeverity") or metric.get("baseSeverity")
+            version = name
+            break
+    description = next(
+        (d.get("value", "") for d in cve.get("descriptions", []) if d.get("lang") == "en"), ""
+    )
+    return (cve["id"], score, version, severity, cve.get("published", ""),
+            cve.get("lastModified", ""), description)
+
+def _row_from_v1(item: dict) -> Row:
+    """Row for a CVE_Items entry of the legacy 1.1 feeds"""
+    impact = item.get("impact", {})
+    score = version = severity = None
+    if "baseMetricV3" in impact:
+        cvss = impact["baseMetricV3"]["cvssV3"]
+        score, version, severity = cvss["baseScore"], cvss.get("version", "3.x"), cvss.get("baseSeverity")
+    elif "baseMetricV2" in impact:
+        score, version = impact["baseMetricV2"]["cvssV2"]["baseScore"], "2.0"
+        severity = impact["baseMetricV2"].get("severity")
+    cve = item["cve"]
+    description = next(
+        (d.get("value", "") for d in cve.get("description", {}).get("description_data", [])
+         if d.get("lang") == "en"), ""
+    )
+    return (cve["CVE_data_meta"]["ID"], score, version, severity, item.get("publishedDate", ""),
+            item.get("lastModifiedDate", ""), description)
+
+def iter_feed_rows(path: str) -> Iterator[Row]:
+    """Rows of one NVD JSON feed file (.json or .json.gz, 2.0 or legacy 1.1 format)"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        data = json.load(f)
+    if "vulnerabilities" in data:
+        for entry in data["vulnerabilities"]:
+            yield _row_from_v2(entry["cve"])
+    else:
+        for item in data.get("CVE_Items", []):
+            yield _row_from_v1(item)
+
+class NvdStore:
+    """CVE id -> CVSS score and metadata, served from a local SQLite mirror
+
+    Feeds are imported with import_feeds(): yearly files once, then the
+    modified feed as often as it is downloaded. A file whose size and mtime
+    are unchanged since its last import is skipped, and a CVE is only
+    replaced by a record with a newer lastModified. Lookups hit the primary
+    key index and never touch the network.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or Config.NVD_DB_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()  # enrichment threads share the connection
+
+    def import_feeds(self, paths: Iterable[str], force: bool = False) -> Dict[str, int]:
+        """Import feed files, returning the CVEs read per imported file"""
+        imported = {}
+        for path in sorted(paths):
+            name = os.path.basename(path)
+            stat = os.stat(path)
+            with self._lock:
+                known = self.conn.execute("SELECT size, mtime FROM feeds WHERE name = ?", (name,)).fetchone()
+            if not force and known == (stat.st_size, stat.st_mtime):
+                logger.info(f"NVD feed {name} unchanged, skipped")
+                continue
+
+            started = time.perf_counter()
+            count = 0
+            with self._lock, self.conn:
+                batch = []
+                for row in iter_feed_rows(path):
+                    batch.append(row)
+                    if len(batch) >= 5000:
+                        self.conn.executemany(UPSERT, batch)
+                        count += len(batch)
+                        batch = []
+                self.conn.executemany(UPSERT, batch)
+                count += len(batch)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO feeds (name, size, mtime, cves, imported_at) "
+                    "VALUES (?, ?, ?, ?, datetime('now'))",
+                    (name, stat.st_size, stat.st_mtime, count)
+                )
+            imported[name] = count
+            logger.info(f"NVD feed {name}: {count} CVEs in {time.perf_counter() - started:.1f}s")
+        return imported
+
+    def import_dir(self, directory: Optional[str] = None, force: bool = False) -> Dict[str, int]:
+        """Import every nvdcve-*.json[.gz] file in a directory (default NVD_FEED_DIR)"""
+        directory = directory or Config.NVD_FEED_DIR
+        paths = glob.glob(os.path.join(directory, "*.json")) + glob.glob(os.path.join(directory, "*.json.gz"))
+        return self.import_feeds(paths, force=force)
+
+    def lookup(self, cve_ids: Iterable[str]) -> Dict[str, dict]:
+        """Details of the given CVEs that are in the mirror, in one query per 500 ids"""
+        ids = list(dict.fromkeys(cve_id.upper() for cve_id in cve_ids))
+        found = {}
+        with self._lock:
+            for start in range(0, len(ids), LOOKUP_CHUNK):
+                chunk = ids[start:start + LOOKUP_CHUNK]
+                rows = self.conn.execute(
+                    "SELECT id, cvss_score, cvss_version, severity, published, description "
+                    f"FROM cves WHERE id IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+                for cve_id, score, version, severity, published, description in rows:
+                    found[cve_id] = {
+                        "id": cve_id,
+                        "cvss_score": score or 0.0,
+                        "cvss_version": version,
+                        "severity": severity,
+                        "description": description,
+                        "published": published
+                    }
+        return found
+
+    def get_summary(self) -> dict:
+        with self._lock:
+            count = self.conn.execute("SELECT COUNT(*) FROM cves").fetchone()[0]
+            feeds = self.conn.execute(
+                "SELECT name, cves, imported_at FROM feeds ORDER BY imported_at DESC"
+            ).fetchall()
+        return {
+            "path": self.path,
+            "cves": count,
+            "feeds": [{"name": name, "cves": cves, "imported_at": at} for name, cves, at in feeds]
+        }
+
+    def close(self):
+        self.conn.close()
+
+_nvd_store: Optional[NvdStore] = None
+
+def get_nvd_store() -> NvdStore:
+    """Process-wide NVD mirror at NVD_DB_PATH"""
+    global _nvd_store
+    if _nvd_store is None:
+        _nvd_store = NvdStore()
+    return _nvd_store
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import NVD JSON feeds into the local CVE mirror")
+    parser.add_argument("paths", nargs="*", help="Feed files (default: every feed in NVD_FEED_DIR)")
+    parser.add_argument("--force", action="store_true", help="Re-import files that have not changed")
+    args = parser.parse_args()
+    logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL), format=Config.LOG_FORMAT)
+
+    store = get_nvd_store()
+    if args.paths:
+        store.import_feeds(args.paths, force=args.force)
+    else:
+        store.import_dir(force=args.force)
+    print(json.dumps(store.get_summary(), indent=2))
@@ -1,55 +1,163 @@
 import os
-import joblib
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-from sklearn.pipeline import Pipeline
+from scipy.sparse import csr_matrix
+
+from .analyzed_text import AnalyzedText
+from .compact_model import CompactModel
+
+# TfidfVectorizer's default tokenization, which AnalyzedText.tokens reproduces
+SHARED_TOKEN_PATTERN = r"(?u)\b\w\w+\b"
 
 class ThreatClassifier:
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, arrays_dir=None, use_arrays=True):
         self.model_path = model_path or os.path.join(os.path.dirname(__file__), 'model.joblib')
+        # train_model.py exports model.joblib's arrays to model_arrays/
+        self.arrays_dir = arrays_dir or os.path.splitext(self.model_path)[0] + '_arrays'
+        self.use_arrays = use_arrays
         self.pipeline = None
+        self.compact = None
+        self.vectorizer = None
+        self.estimator = None
+        self.stop_words = frozenset()
         self.load_model()
 
     def load_model(self):
-        """Load the trained model pipeline from disk"""
+        """Load the exported compact arrays, else the trained model pipeline from disk
+
+        The compact model is memory-mapped and needs neither scikit-learn nor
+        unpickling; the pipeline is only loaded when no export exists (or
+        use_arrays is False).
+        """
+        if self.use_arrays:
+            try:
+                self.compact = CompactModel.load(self.arrays_dir)
+            except Exception as e:
+                print(f"Error loading compact model: {e}")
+                self.compact = None
+            if self.compact is not None:
+                self.vectorizer = self.estimator = self.compact
+                self.stop_words = self.compact.stop_words
+                return
+
         if os.path.exists(self.model_path):
             try:
+                import joblib
                 self.pipeline = joblib.load(self.model_path)
+                self.vectorizer, self.estimator = self._shared_token_steps(self.pipeline)
+                if self.vectorizer is not None:
+                    self.stop_words = frozenset(self.vectorizer.get_stop_words() or ())
             except Exception as e:
                 print(f"Error loading model: {e}")
                 self.pipeline = None
 
+    @staticmethod
+    def _shared_token_steps(pipeline):
+        """(vectorizer, estimator) if the TF-IDF step can be fed AnalyzedText tokens, else (None, None)"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        steps = getattr(pipeline, "steps", None)
+        if not steps or len(steps) != 2:
+            return None, None
+        vectorizer, estimator = steps[0][1], steps[1][1]
+        if (not isinstance(vectorizer, TfidfVectorizer) or vectorizer.analyzer != "word"
+                or vectorizer.tokenizer is not None or vectorizer.preprocessor is not None
+                or vectorizer.token_pattern != SHARED_TOKEN_PATTERN or not vectorizer.lowercase
+                or vectorizer.strip_accents is not None or vectorizer.binary
+                or vectorizer.norm not in ("l2", "l1", None)):
+            return None, None
+        return vectorizer, estimator
+
+    def _tfidf_matrix(self, token_lists):
+        """The vectorizer's transform() of many texts, computed from their word tokens
+
+        Every n-gram of the batch is looked up at once and the counts are
+        summed by the sparse matrix constructor.
+        """
+        vectorizer = self.vectorizer
+        min_n, max_n = vectorizer.ngram_range
+        grams, row_lengths = [], []
+        for tokens in token_lists:
+            words = [token for token in tokens if len(token) > 1]
+            if self.stop_words:
+                words = [word for word in words if word not in self.stop_words]
+
+            count = len(grams)
+            for n in range(min_n, max_n + 1):
+                if n == 1:
+                    grams.extend(words)
+                else:
+                    grams.extend(" ".join(words[start:start + n]) for start in range(len(words) - n + 1))
+            row_lengths.append(len(grams) - count)
+
+        rows = np.repeat(np.arange(len(row_lengths)), row_lengths)
+        columns = self._term_columns(grams)
+        known = columns >= 0
+        shape = (len(row_lengths), len(vectorizer.idf_))
+        matrix = csr_matrix((np.ones(int(known.sum())), (rows[known], columns[known])), shape=shape)
+        matrix.sum_duplicates()
+
+        if vectorizer.sublinear_tf:
+            matrix.data = np.log(matrix.data) + 1
+        if vectorizer.use_idf:
+            matrix.data *= vectorizer.idf_[matrix.indices]
+        if vectorizer.norm and matrix.nnz:
+            row_of = np.repeat(np.arange(shape[0]), np.diff(matrix.indptr))
+            if vectorizer.norm == "l2":
+                norms = np.sqrt(np.bincount(row_of, weights=matrix.data ** 2, minlength=shape[0]))
+            else:
+                norms = np.bincount(row_of, weights=np.abs(matrix.data), minlength=shape[0])
+            matrix.data /= norms[row_of]
+        return matrix
+
+    def _term_columns(self, grams):
+        """Vocabulary column of each n-gram, -1 where it has none"""
+        vocabulary = self.vectorizer.vocabulary_
+        return np.fromiter((vocabulary.get(gram, -1) for gram in grams), dtype=np.int64, count=len(grams))
+
+    def _tfidf_row(self, tokens):
+        """The vectorizer's transform() of one text, computed from its word tokens"""
+        return self._tfidf_matrix([tokens])
+
     def predict(self, text):
-        """Predict severity and confidence for a given text"""
-        if not self.pipeline:
+        """Predict severity and confidence for a given text (a string or AnalyzedText)"""
+        return self.predict_batch([text])[0]
+
+    def predict_batch(self, texts):
+        """Predict severity and confidence for many texts with one vectorization pass
+
+        The whole batch is vectorized into one matrix and scored with a single
+        predict_proba(); each label is the most probable class of its row, as
+        predict() would return.
+        """
+        analyzed = [AnalyzedText.of(text) for text in texts]
+        if not analyzed:
+            return []
+        if self.pipeline is None and self.compact is None:
             # Fallback to a very simple heuristic if model is not trained
-            return self._heuristic_predict(text)
+            return [self._heuristic_predict(text) for text in analyzed]
 
         try:
-            prediction = self.pipeline.predict([text])[0]
-            probabilities = self.pipeline.predict_proba([text])[0]
-            confidence = float(np.max(probabilities)) * 100
-            
-            return {
-                "severity": prediction,
-                "confidence": round(confidence, 2)
-            }
+            if self.vectorizer is not None:
+                probabilities = self.estimator.predict_proba(self._tfidf_matrix([a.tokens for a in analyzed]))
+                classes = self.estimator.classes_
+            else:
+                probabilities = self.pipeline.predict_proba([a.text for a in analyzed])
+                classes = self.pipeline.classes_
+            best = np.argmax(probabilities, axis=1)
+            confidences = probabilities[np.arange(len(best)), best] * 100
+
+            return [
+                {"severity": classes[index], "confidence": round(float(confidence), 2)}
+                for index, confidence in zip(best, confidences)
+            ]
         except Exception as e:
             print(f"Prediction error: {e}")
-            return self._heuristic_predict(text)
+            return [self._heuristic_predict(text) for text in analyzed]
 
     def _heuristic_predict(self, text):
         """Fallback prediction logic when ML model is unavailable"""
-        text = text.lower()
-        if any(word in text for word in ['critical', 'zero-day', 'emergency', 'immediate', 'breach']):
-            return {"severity": "Critical", "confidence": 50.0}
-        elif any(word in text for word in ['high', 'severe', 'ransomware', 'malware']):
-            return {"severity": "High", "confidence": 50.0}
-        elif any(word in text for word in ['medium', 'moderate', 'vulnerability']):
-            return {"severity": "Medium", "confidence": 50.0}
-        else:
-            return {"severity": "Low", "confidence": 50.0}
+        hits = AnalyzedText.of(text).hits
+        return {"severity": hits.first("heuristic_severity", "Low"), "confidence": 50.0}
 
 if __name__ == "__main__":
     # Quick test
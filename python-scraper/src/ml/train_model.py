@@ -1,3 +1,4 @@
+import argparse
 import json
 import os
 import joblib
@@ -8,6 +9,14 @@ from sklearn.pipeline import Pipeline
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report
 
+from .compact_model import export_compact_model
+
+def export_arrays(pipeline, model_path):
+    """Write the compact arrays ThreatClassifier memory-maps next to the pipeline"""
+    arrays_dir = os.path.splitext(model_path)[0] + '_arrays'
+    manifest = export_compact_model(pipeline, arrays_dir)
+    print(f"Compact model ({len(manifest['classes'])} classes) exported to {arrays_dir}")
+
 def train_model():
     # File paths
     base_dir = os.path.dirname(__file__)
@@ -62,6 +71,19 @@ def train_model():
     # Save model
     joblib.dump(pipeline, model_path)
     print(f"\nModel saved to {model_path}")
+    export_arrays(pipeline, model_path)
+
+def export_existing_model():
+    """Export the arrays of the already trained model.joblib"""
+    model_path = os.path.join(os.path.dirname(__file__), 'model.joblib')
+    export_arrays(joblib.load(model_path), model_path)
 
 if __name__ == "__main__":
-    train_model()
+    parser = argparse.ArgumentParser(description="Train the severity classifier")
+    parser.add_argument("--export-only", action="store_true",
+                        help="Export the compact arrays of the existing model.joblib without retraining")
+    args = parser.parse_args()
+    if args.export_only:
+        export_existing_model()
+    else:
+        train_model()
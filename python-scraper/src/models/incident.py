@@ -27,6 +27,7 @@ class IncidentModel(BaseModel):
     entities: Optional[dict] = Field(default={"organizations": [], "locations": [], "technologies": [], "threat_actors": []})
     mitre_techniques: Optional[List[dict]] = Field(default=[])
     cve_ids: Optional[List[str]] = Field(default=[])
+    iocs: Optional[dict] = Field(default={"ipv4": [], "ipv6": [], "domains": [], "urls": [], "md5": [], "sha1": [], "sha256": [], "cves": []})
     cvss_score: Optional[float] = Field(default=0.0)
     ml_severity: Optional[str] = Field(None)
     ml_confidence: Optional[float] = Field(None)
@@ -3,7 +3,6 @@ CERT-In scraper for Indian cyber security advisories
 """
 
 import asyncio
-import aiohttp
 import logging
 from datetime import datetime
 from typing import List, Optional
@@ -12,8 +11,17 @@ import hashlib
 import re
 from urllib.parse import urljoin, urlparse
 
+from ..models.incident import IncidentModel
 from ..services.mongo_service import MongoService
+from ..services.dedup_gate import DedupGate
+from ..services.executor import get_worker_pools
 from ..services.enrichment_service import EnrichmentService
+from ..services.http_client import HttpClient, use_http_client
+from ..services.validator_cache import PendingValidators
+from ..services.watermark_store import get_watermark_store
+from ..ml.keyword_engine import KeywordHits, get_keyword_engine
+from .date_parser import get_date_parser
+from .feed_parser import iter_feed_items
 from config import Config
 
 logger = logging.getLogger(__name__)
@@ -21,27 +29,44 @@ logger = logging.getLogger(__name__)
 class CertInScraper:
     """Scraper for CERT-In advisories and alerts"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[HttpClient] = None, mongo_service: Optional[MongoService] = None):
+        self.http_client = http_client
         self.base_url = "https://www.cert-in.org.in"
         self.rss_url = "https://www.cert-in.org.in/rss.xml"
-        self.mongo_service = MongoService()
+        self.source_name = "CERT-In"
+        self.mongo_service = mongo_service or MongoService()
         self.enrichment_service = EnrichmentService()
+        self.dedup = DedupGate(self.mongo_service)
+        self.dates = get_date_parser()
+        self.keywords = get_keyword_engine()
+        self.watermarks = get_watermark_store()
+        self.pending_validators: Optional[PendingValidators] = None  # RSS feed's, committed once saved
+        self.last_run_report = {}
         
     async def scrape_and_save(self) -> int:
         """Scrape CERT-In data and save to MongoDB"""
         try:
             incidents = await self.scrape_incidents()
+            pools = get_worker_pools()
             saved_count = 0
             
-            for incident in incidents:
-                # Convert model to dict, enrich, then save
-                incident_dict = incident.to_dict()
-                enriched_data = await self.enrichment_service.enrich_incident(incident_dict)
-                
-                if self.mongo_service.save_incident(enriched_data):
+            # Only incidents not already stored reach enrichment; enrich them as one batch, then save in order
+            new_incidents = await pools.run_thread(self.dedup.filter, incidents)
+            enriched = await self.enrichment_service.enrich_incidents([incident.to_dict() for incident in new_incidents])
+            for enriched_data in enriched:
+                if await pools.run_thread(self.mongo_service.save_incident, enriched_data):
                     saved_count += 1
             
-            logger.info(f"CERT-In scraper: Collected {len(incidents)} incidents, enriched and saved {saved_count}")
+            self.watermarks.advance(self.source_name, incidents)
+            self.watermarks.save()
+            # Only now may the next run get a 304 for the feed
+            if self.pending_validators:
+                self.pending_validators.commit()
+                self.pending_validators = None
+            
+            self.last_run_report = {"dedup": self.dedup.get_summary()}
+            logger.info(f"CERT-In scraper: Collected {len(incidents)} incidents, "
+                        f"skipped enrichment for {len(incidents) - len(new_incidents)} known, saved {saved_count}")
             return saved_count
             
         except Exception as e:
@@ -53,16 +78,17 @@ class CertInScraper:
         incidents = []
         
         try:
-            timeout = aiohttp.ClientTimeout(total=Config.REQUEST_TIMEOUT)
-            headers = {"User-Agent": Config.USER_AGENT}
-            async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
+            async with use_http_client(self.http_client) as client:
                 # Try RSS feed first
-                rss_incidents = await self._scrape_rss_feed(session)
+                rss_incidents = await self._scrape_rss_feed(client)
+                if rss_incidents is None:
+                    logger.info("CERT-In RSS feed has nothing new since last run")
+                    return incidents
                 incidents.extend(rss_incidents)
                 
                 # If RSS fails, try web scraping
                 if not incidents:
-                    web_incidents = await self._scrape_web_page(session)
+                    web_incidents = await self._scrape_web_page(client)
                     incidents.extend(web_incidents)
                 
         except Exception as e:
@@ -70,176 +96,175 @@ class CertInScraper:
         
         return incidents
     
-    async def _scrape_rss_feed(self, session: aiohttp.ClientSession) -> List[IncidentModel]:
-        """Scrape RSS feed"""
+    async def _scrape_rss_feed(self, client: HttpClient) -> Optional[List[IncidentModel]]:
+        """Stream the RSS feed, stopping at the first item we already have
+        
+        Returns None when the feed has nothing new since the last run. The
+        feed's new validators are kept in pending_validators only if it was
+        read without error.
+        """
         incidents = []
+        self.pending_validators = None
+        await get_worker_pools().run_thread(self.watermarks.seed_from, self.source_name, self.mongo_service)
         
         try:
-            async with session.get(self.rss_url) as response:
-                if response.status == 200:
-                    content = await response.text()
-                    soup = BeautifulSoup(content, 'xml')
-                    
-                    items = soup.find_all('item')
-                    for item in items:
-                        try:
-                            title = item.find('title').text.strip()
-                            description = item.find('description').text.strip()
-                            link = item.find('link').text.strip()
-                            pub_date = item.find('pubDate').text.strip()
-                            
-                            # Parse date
-                            try:
-                                pub_date_obj = datetime.strptime(pub_date, '%a, %d %b %Y %H:%M:%S %Z')
-                            except:
-                                pub_date_obj = datetime.utcnow()
-                            
-                            # Determine severity and category
-                            severity, category = self._classify_incident(title, description)
-                            
-                            # Generate hash
-                            content_hash = hashlib.md5(f"{title}{description}{link}".encode()).hexdigest()
-                            
-                            incident = IncidentModel(
-                                title=title,
-                                description=description,
-                                url=link,
-                                published_date=pub_date_obj,
-                                source="CERT-In",
-                                category=category,
-                                severity=severity,
-                                location="India",
-                                hash=content_hash,
-                                tags=self._extract_tags(title, description)
-                            )
-                            
-                            incidents.append(incident)
-                            
-                        except Exception as e:
-                            logger.error(f"Error parsing RSS item: {e}")
+            async with client.stream(self.rss_url, conditional=True) as response:
+                if response.not_modified:
+                    return None
+                if response.status != 200:
+                    return incidents
+                
+                async for item in iter_feed_items(response.chunks):
+                    try:
+                        title, description, link = item.title, item.description, item.link
+                        if not title:
                             continue
-                            
+                        
+                        # Generate hash
+                        content_hash = hashlib.md5(f"{title}{description}{link}".encode()).hexdigest()
+                        
+                        # Feeds are newest first, so everything after a known item is known too
+                        if self.watermarks.is_known(self.source_name, content_hash, link):
+                            logger.info(f"CERT-In RSS: reached already-stored item after {len(incidents)} new")
+                            self.pending_validators = response.validators
+                            return incidents or None
+                        
+                        # An undated item sorts with the newer item above it, not at "now"
+                        newer_date = incidents[-1].published_date if incidents else None
+                        pub_date_obj = self.dates.parse(item.published, self.source_name) or newer_date or datetime.utcnow()
+                        
+                        # Determine severity and category
+                        hits = self.keywords.scan(f"{title} {description}")
+                        severity, category = self._classify_incident(title, description, hits)
+                        
+                        incident = IncidentModel(
+                            title=title,
+                            description=description,
+                            url=link,
+                            published_date=pub_date_obj,
+                            source="CERT-In",
+                            category=category,
+                            severity=severity,
+                            location="India",
+                            hash=content_hash,
+                            tags=self._extract_tags(title, description, hits)
+                        )
+                        
+                        incidents.append(incident)
+                        
+                    except Exception as e:
+                        logger.error(f"Error parsing RSS item: {e}")
+                        continue
+                
+                # Read to the end: the validators are committed after the incidents are saved
+                self.pending_validators = response.validators
+                        
         except Exception as e:
             logger.error(f"Failed to scrape RSS feed: {e}")
         
         return incidents
     
-    async def _scrape_web_page(self, session: aiohttp.ClientSession) -> List[IncidentModel]:
+    async def _scrape_web_page(self, client: HttpClient) -> List[IncidentModel]:
         """Scrape web page as fallback"""
         incidents = []
         
         try:
             # Scrape advisories page
             advisories_url = f"{self.base_url}/advisories"
-            async with session.get(advisories_url) as response:
-                if response.status == 200:
-                    content = await response.text()
-                    soup = BeautifulSoup(content, 'html.parser')
-                    
-                    # Look for advisory links
-                    advisory_links = soup.find_all('a', href=re.compile(r'advisory'))
-                    
-                    for link in advisory_links[:10]:  # Limit to 10 most recent
-                        try:
-                            advisory_url = urljoin(self.base_url, link['href'])
-                            incident = await self._scrape_advisory_page(session, advisory_url)
-                            if incident:
-                                incidents.append(incident)
-                        except Exception as e:
-                            logger.error(f"Error scraping advisory: {e}")
-                            continue
+            response = await client.fetch(advisories_url)
+            if response.status == 200:
+                pools = get_worker_pools()
+                advisory_urls = await pools.run_thread(self._advisory_links, response.body)
+                
+                # Skip advisories we already stored before making any request
+                known_urls = await pools.run_thread(self.mongo_service.get_existing_urls, advisory_urls)
+                new_urls = [url for url in advisory_urls if url not in known_urls]
+                logger.info(f"CERT-In advisories: {len(advisory_urls)} found, {len(new_urls)} new")
+                
+                semaphore = asyncio.Semaphore(max(1, Config.MAX_CONCURRENT_REQUESTS))
+                
+                async def scrape_advisory(url: str) -> Optional[IncidentModel]:
+                    async with semaphore:
+                        return await self._scrape_advisory_page(client, url)
+                
+                results = await asyncio.gather(*(scrape_advisory(url) for url in new_urls))
+                incidents = [incident for incident in results if incident]
                             
         except Exception as e:
             logger.error(f"Failed to scrape web page: {e}")
         
         return incidents
     
-    async def _scrape_advisory_page(self, session: aiohttp.ClientSession, url: str) -> Optional[IncidentModel]:
+    def _advisory_links(self, body: bytes) -> List[str]:
+        """Advisory links on the advisories page, most recent first"""
+        soup = BeautifulSoup(body, 'lxml')
+        advisory_urls = []
+        for link in soup.find_all('a', href=re.compile(r'advisory')):
+            advisory_url = urljoin(self.base_url, link['href'])
+            if advisory_url not in advisory_urls:
+                advisory_urls.append(advisory_url)
+            if len(advisory_urls) >= Config.CERT_IN_ADVISORY_LIMIT:
+                break
+        return advisory_urls
+    
+    async def _scrape_advisory_page(self, client: HttpClient, url: str) -> Optional[IncidentModel]:
         """Scrape individual advisory page"""
         try:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    content = await response.text()
-                    soup = BeautifulSoup(content, 'html.parser')
-                    
-                    # Extract title
-                    title_elem = soup.find('h1') or soup.find('title')
-                    title = title_elem.text.strip() if title_elem else "CERT-In Advisory"
-                    
-                    # Extract description
-                    desc_elem = soup.find('div', class_='content') or soup.find('p')
-                    description = desc_elem.text.strip() if desc_elem else "CERT-In security advisory"
-                    
-                    # Determine severity and category
-                    severity, category = self._classify_incident(title, description)
-                    
-                    # Generate hash
-                    content_hash = hashlib.md5(f"{title}{description}{url}".encode()).hexdigest()
-                    
-                    return IncidentModel(
-                        title=title,
-                        description=description,
-                        url=url,
-                        published_date=datetime.utcnow(),
-                        source="CERT-In",
-                        category=category,
-                        severity=severity,
-                        location="India",
-                        hash=content_hash,
-                        tags=self._extract_tags(title, description)
-                    )
-                    
+            response = await client.fetch(url)
+            if response.status == 200:
+                return await get_worker_pools().run_thread(self._parse_advisory_page, url, response.body)
         except Exception as e:
             logger.error(f"Error scraping advisory page {url}: {e}")
         
         return None
     
-    def _classify_incident(self, title: str, description: str) -> tuple[str, str]:
-        """Classify incident severity and category"""
-        text = f"{title} {description}".lower()
-        
-        # Determine severity
-        if any(word in text for word in ['critical', 'emergency', 'urgent', 'immediate']):
-            severity = 'Critical'
-        elif any(word in text for word in ['high', 'severe', 'serious']):
-            severity = 'High'
-        elif any(word in text for word in ['medium', 'moderate']):
-            severity = 'Medium'
-        else:
-            severity = 'Low'
-        
-        # Determine category
-        if any(word in text for word in ['advisory', 'guidance', 'recommendation']):
-            category = 'Advisory'
-        elif any(word in text for word in ['vulnerability', 'exploit', 'patch']):
-            category = 'Vulnerability'
-        elif any(word in text for word in ['attack', 'breach', 'incident']):
-            category = 'Alert'
-        else:
-            category = 'News'
+    def _parse_advisory_page(self, url: str, body: bytes) -> Optional[IncidentModel]:
+        """Build an incident from an advisory page"""
+        try:
+            soup = BeautifulSoup(body, 'lxml')
+            
+            # Extract title
+            title_elem = soup.find('h1') or soup.find('title')
+            title = title_elem.text.strip() if title_elem else "CERT-In Advisory"
+            
+            # Extract description
+            desc_elem = soup.find('div', class_='content') or soup.find('p')
+            description = desc_elem.text.strip() if desc_elem else "CERT-In security advisory"
+            
+            # Determine severity and category
+            hits = self.keywords.scan(f"{title} {description}")
+            severity, category = self._classify_incident(title, description, hits)
+            
+            # Generate hash
+            content_hash = hashlib.md5(f"{title}{description}{url}".encode()).hexdigest()
+            
+            return IncidentModel(
+                title=title,
+                description=description,
+                url=url,
+                published_date=datetime.utcnow(),
+                source="CERT-In",
+                category=category,
+                severity=severity,
+                location="India",
+                hash=content_hash,
+                tags=self._extract_tags(title, description, hits)
+            )
+            
+        except Exception as e:
+            logger.error(f"Error parsing advisory page {url}: {e}")
         
-        return severity, category
+        return None
     
-    def _extract_tags(self, title: str, description: str) -> List[str]:
+    def _keyword_hits(self, title: str, description: str, hits: Optional[KeywordHits]) -> KeywordHits:
+        return hits if hits is not None else self.keywords.scan(f"{title} {description}")
+    
+    def _classify_incident(self, title: str, description: str,
+                           hits: Optional[KeywordHits] = None) -> tuple[str, str]:
+        """Classify incident severity and category"""
+        hits = self._keyword_hits(title, description, hits)
+        return hits.first("cert_in.severity", "Low"), hits.first("cert_in.category", "News")
+    
+    def _extract_tags(self, title: str, description: str, hits: Optional[KeywordHits] = None) -> List[str]:
         """Extract relevant tags from incident content"""
-        text = f"{title} {description}".lower()
-        tags = []
-        
-        # Common cyber security tags
-        tag_keywords = {
-            'ransomware': ['ransomware', 'ransom'],
-            'phishing': ['phishing', 'phish'],
-            'malware': ['malware', 'virus', 'trojan'],
-            'ddos': ['ddos', 'denial of service'],
-            'data-breach': ['breach', 'leak', 'exposed'],
-            'vulnerability': ['vulnerability', 'cve', 'exploit'],
-            'banking': ['bank', 'financial', 'payment'],
-            'government': ['government', 'govt', 'ministry'],
-            'critical-infrastructure': ['infrastructure', 'power', 'grid']
-        }
-        
-        for tag, keywords in tag_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                tags.append(tag)
-        
-        return tags
+        return self._keyword_hits(title, description, hits).labels("cert_in.tags")
@@ -0,0 +1,188 @@
+"""
+Publication date parsing with a per-source memory of the format that matched
+"""
+
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ISO = "iso"
+RFC822 = "rfc822"
+RELATIVE = "relative"
+
+# Listing-page formats, tried in order after the fast paths
+STRPTIME_FORMATS = [
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+    '%d %b %Y',
+    '%b %d, %Y',
+    '%d/%m/%Y',
+    '%B %d, %Y',
+    '%d %B %Y',
+    '%b %d, %Y %I:%M %p',
+    '%B %d, %Y %I:%M %p',
+    '%d %b %Y %H:%M',
+    '%d-%m-%Y',
+    '%A, %B %d, %Y'
+]
+
+RFC822_PREFIX = re.compile(r"^(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun),?\s+\d")
+ISO_PREFIX = re.compile(r"^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2})")
+RELATIVE_DATE = re.compile(
+    r"\b(\d+|an?|one)\s+(second|sec|minute|min|hour|hr|day|week|month|year)s?\s+ago\b",
+    re.IGNORECASE
+)
+ORDINAL_SUFFIX = re.compile(r"(?<=\d)(?:st|nd|rd|th)\b", re.IGNORECASE)
+LABEL_PREFIX = re.compile(r"^(?:published|posted|updated|last updated)(?:\s+on)?\s*:?\s*", re.IGNORECASE)
+TRAILING_ZONE = re.compile(r"\s+(?:IST|UTC|GMT)$")
+
+RELATIVE_UNITS = {
+    "second": timedelta(seconds=1), "sec": timedelta(seconds=1),
+    "minute": timedelta(minutes=1), "min": timedelta(minutes=1),
+    "hour": timedelta(hours=1), "hr": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365)
+}
+
+# "UTC" / "GMT" dates are already UTC; IST is fixed at +05:30
+ZONE_OFFSETS = {"IST": timedelta(hours=5, minutes=30), "UTC": timedelta(0), "GMT": timedelta(0)}
+
+def _naive_utc(value: datetime) -> datetime:
+    # Incidents store naive UTC datetimes, like datetime.utcnow()
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def _parse_iso(text: str, now: datetime) -> Optional[datetime]:
+    if not ISO_PREFIX.match(text):
+        return None
+    try:
+        return _naive_utc(datetime.fromisoformat(text))
+    except ValueError:
+        return None
+
+def _parse_rfc822(text: str, now: datetime) -> Optional[datetime]:
+    if not RFC822_PREFIX.match(text):
+        return None
+    # parsedate_to_datetime reads zone names it does not know (IST) as UTC
+    zone = TRAILING_ZONE.search(text)
+    offset = ZONE_OFFSETS[zone.group().strip()] if zone else timedelta(0)
+    try:
+        return _naive_utc(parsedate_to_datetime(text[:zone.start()] if zone else text)) - offset
+    except (TypeError, ValueError):
+        return None
+
+def _parse_relative(text: str, now: datetime) -> Optional[datetime]:
+    lowered = text.lower()
+    if lowered in ("just now", "now", "today"):
+        return now
+    if lowered == "yesterday":
+        return now - timedelta(days=1)
+    match = RELATIVE_DATE.search(text)
+    if match is None:
+        return None
+    amount = match.group(1).lower()
+    count = 1 if amount in ("a", "an", "one") else int(amount)
+    return now - count * RELATIVE_UNITS[match.group(2).lower()]
+
+def _strptime_parser(fmt: str) -> Callable[[str, datetime], Optional[datetime]]:
+    def parse(text: str, now: datetime) -> Optional[datetime]:
+        zone = TRAILING_ZONE.search(text)
+        offset = ZONE_OFFSETS[zone.group().strip()] if zone else timedelta(0)
+        try:
+            return datetime.strptime(text[:zone.start()] if zone else text, fmt) - offset
+        except ValueError:
+            return None
+    return parse
+
+# Cheap, unambiguous forms first so the first article of a source learns them quickly
+PARSERS: Dict[str, Callable[[str, datetime], Optional[datetime]]] = {
+    ISO: _parse_iso,
+    RFC822: _parse_rfc822,
+    RELATIVE: _parse_relative,
+    **{fmt: _strptime_parser(fmt) for fmt in STRPTIME_FORMATS}
+}
+
+def normalize_date_text(text: str) -> str:
+    """Collapse whitespace and drop "Published on:" labels and ordinal suffixes"""
+    text = " ".join(text.split())
+    text = LABEL_PREFIX.sub("", text)
+    return ORDINAL_SUFFIX.sub("", text)
+
+class DateParser:
+    """Parses publication dates, trying the format that last worked for the source first
+
+    Sites use one date format throughout, so after the first article of a
+    source each date normally costs a single parse attempt. A date no format
+    matches is counted against the source and None is returned; the caller
+    chooses the fallback.
+    """
+
+    def __init__(self, now: Optional[Callable[[], datetime]] = None):
+        self._now = now or datetime.utcnow
+        self.sources: Dict[str, dict] = {}
+
+    def _stats(self, source: str) -> dict:
+        return self.sources.setdefault(source, {
+            "format": None,
+            "parsed": 0,
+            "learned_hits": 0,
+            "unparseable": 0,
+            "last_unparseable": None
+        })
+
+    def _order(self, learned: Optional[str]) -> List[str]:
+        if learned is None:
+            return list(PARSERS)
+        return [learned] + [name for name in PARSERS if name != learned]
+
+    def parse(self, text: Optional[str], source: str) -> Optional[datetime]:
+        """Naive UTC datetime for a date string, or None if it cannot be parsed"""
+        stats = self._stats(source)
+        cleaned = normalize_date_text(text or "")
+        if cleaned:
+            now = self._now()
+            for position, name in enumerate(self._order(stats["format"])):
+                value = PARSERS[name](cleaned, now)
+                if value is not None:
+                    stats["parsed"] += 1
+                    if position == 0 and stats["format"] is not None:
+                        stats["learned_hits"] += 1
+                    elif name != stats["format"]:
+                        logger.debug(f"{source}: dates parse as '{name}'")
+                        stats["format"] = name
+                    return value
+
+        stats["unparseable"] += 1
+        stats["last_unparseable"] = cleaned[:80] or None
+        return None
+
+    def get_summary(self) -> Dict[str, dict]:
+        """Learned format and unparseable-date rate per source"""
+        summary = {}
+        for source, stats in self.sources.items():
+            total = stats["parsed"] + stats["unparseable"]
+            summary[source] = {
+                "format": stats["format"],
+                "parsed": stats["parsed"],
+                "unparseable": stats["unparseable"],
+                "unparseable_rate": round(stats["unparseable"] / total, 3) if total else None,
+                "learned_hit_rate": round(stats["learned_hits"] / stats["parsed"], 3) if stats["parsed"] else None,
+                "last_unparseable": stats["last_unparseable"]
+            }
+        return summary
+
+_date_parser: Optional[DateParser] = None
+
+def get_date_parser() -> DateParser:
+    """Process-wide date parser shared by the scrapers"""
+    global _date_parser
+    if _date_parser is None:
+        _date_parser = DateParser()
+    return _date_parser
@@ -0,0 +1,97 @@
+"""
+Streaming RSS 2.0 / Atom parser that emits items as their bytes arrive
+"""
+
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterator, List, Optional
+
+from lxml import etree
+
+@dataclass
+class FeedItem:
+    """One RSS <item> or Atom <entry>"""
+
+    title: str = ""
+    description: str = ""
+    link: str = ""
+    published: str = ""
+    guid: str = ""
+
+ITEM_TAGS = {"item", "entry"}
+
+def _local_name(tag) -> str:
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+def _text(elem) -> str:
+    # Join nested text so markup inside a field does not truncate it
+    return "".join(elem.itertext()).strip()
+
+class StreamingFeedParser:
+    """Incremental feed parser built on lxml's pull parser
+
+    Feed it byte chunks; every completed item is returned straight away and
+    then removed from the tree, so memory stays flat however long the feed is.
+    """
+
+    def __init__(self):
+        self._parser = etree.XMLPullParser(events=("end",), recover=True, resolve_entities=False)
+
+    def feed(self, chunk: bytes) -> List[FeedItem]:
+        self._parser.feed(chunk)
+        return list(self._drain())
+
+    def close(self) -> List[FeedItem]:
+        try:
+            self._parser.close()
+        except etree.XMLSyntaxError:
+            pass
+        return list(self._drain())
+
+    def _drain(self) -> Iterator[FeedItem]:
+        for _, elem in self._parser.read_events():
+            if _local_name(elem.tag) not in ITEM_TAGS:
+                continue
+            yield self._to_item(elem)
+
+            # Drop the finished item and anything before it
+            elem.clear()
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+                parent.remove(elem)
+
+    def _to_item(self, elem) -> FeedItem:
+        item = FeedItem()
+        for child in elem:
+            name = _local_name(child.tag)
+            if name == "title":
+                item.title = _text(child)
+            elif name in ("description", "summary"):
+                item.description = _text(child)
+            elif name in ("encoded", "content") and not item.description:
+                item.description = _text(child)
+            elif name == "link":
+                # RSS puts the URL in the text, Atom in href (prefer rel="alternate")
+                href = child.get("href")
+                if href is None:
+                    item.link = _text(child)
+                elif child.get("rel", "alternate") == "alternate" or not item.link:
+                    item.link = href.strip()
+            elif name in ("pubDate", "published", "date"):
+                item.published = _text(child)
+            elif name == "updated" and not item.published:
+                item.published = _text(child)
+            elif name in ("guid", "id"):
+                item.guid = _text(child)
+        return item
+
+async def iter_feed_items(chunks: AsyncIterator[bytes],
+                          parser: Optional[StreamingFeedParser] = None) -> AsyncIterator[FeedItem]:
+    """Yield feed items from a byte stream; stop iterating to stop reading"""
+    parser = parser or StreamingFeedParser()
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
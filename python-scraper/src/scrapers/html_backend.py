@@ -0,0 +1,137 @@
+"""
+HTML parser backends for listing pages: selectolax (lexbor) with a BeautifulSoup fallback
+"""
+
+import logging
+from typing import Optional
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+from config import Config
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional fast path
+    LexborHTMLParser = None
+
+logger = logging.getLogger(__name__)
+
+# BeautifulSoup's get_text() leaves the contents of these out
+NON_TEXT_TAGS = ["script", "style", "template"]
+
+class HtmlBackend:
+    """Parses raw page bytes and runs CSS selectors on the resulting nodes
+
+    Scrapers only touch nodes through these methods, so every backend must give
+    the same text and attributes for the same page. Selectors may be passed as
+    strings or in the form returned by compile().
+    """
+
+    name = ""
+
+    def __init__(self):
+        self._compiled = {}
+
+    def compile(self, selector: str):
+        """Pre-compiled form of a selector, cached for the backend's lifetime"""
+        compiled = self._compiled.get(selector)
+        if compiled is None:
+            compiled = self._compiled[selector] = self._compile(selector)
+        return compiled
+
+    def _compile(self, selector: str):
+        return selector
+
+    def parse(self, body: bytes):
+        raise NotImplementedError
+
+    def select(self, node, selector) -> list:
+        raise NotImplementedError
+
+    def select_one(self, node, selector):
+        raise NotImplementedError
+
+    def text(self, node) -> str:
+        raise NotImplementedError
+
+    def attr(self, node, name: str) -> Optional[str]:
+        raise NotImplementedError
+
+class SoupBackend(HtmlBackend):
+    """BeautifulSoup on lxml with soupsieve selectors"""
+
+    name = "soup"
+
+    def _compile(self, selector: str):
+        return soupsieve.compile(selector)
+
+    def parse(self, body: bytes):
+        return BeautifulSoup(body, "lxml")
+
+    def select(self, node, selector) -> list:
+        if isinstance(selector, str):
+            return node.select(selector)
+        return selector.select(node)
+
+    def select_one(self, node, selector):
+        if isinstance(selector, str):
+            return node.select_one(selector)
+        return selector.select_one(node)
+
+    def text(self, node) -> str:
+        return node.get_text()
+
+    def attr(self, node, name: str) -> Optional[str]:
+        return node.get(name)
+
+class SelectolaxBackend(HtmlBackend):
+    """lexbor via selectolax: C parser and selector engine working on the raw bytes
+
+    selectolax takes selectors as strings only, so compile() is the identity.
+    """
+
+    name = "selectolax"
+
+    def parse(self, body: bytes):
+        # encoding=True honours a BOM or <meta charset> like BeautifulSoup does
+        tree = LexborHTMLParser(body, encoding=True)
+        tree.strip_tags(NON_TEXT_TAGS)
+        return tree
+
+    def select(self, node, selector) -> list:
+        matches = node.css(selector)
+        # lexbor can match the context element itself; soupsieve only searches descendants
+        if matches and matches[0] == node:
+            matches = matches[1:]
+        return matches
+
+    def select_one(self, node, selector):
+        match = node.css_first(selector)
+        if match is not None and match == node:
+            matches = node.css(selector)
+            return matches[1] if len(matches) > 1 else None
+        return match
+
+    def text(self, node) -> str:
+        return node.text(deep=True)
+
+    def attr(self, node, name: str) -> Optional[str]:
+        return node.attributes.get(name)
+
+BACKENDS = {
+    SoupBackend.name: SoupBackend,
+    SelectolaxBackend.name: SelectolaxBackend
+}
+
+def get_html_backend(name: Optional[str] = None) -> HtmlBackend:
+    """Backend named by HTML_PARSER_BACKEND ("auto" prefers selectolax when installed)"""
+    name = (name or Config.HTML_PARSER_BACKEND).lower()
+    if name == "auto":
+        name = SelectolaxBackend.name if LexborHTMLParser else SoupBackend.name
+    if name == SelectolaxBackend.name and LexborHTMLParser is None:
+        logger.warning("selectolax is not installed, falling back to BeautifulSoup")
+        name = SoupBackend.name
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {name}")
+    return BACKENDS[name]()
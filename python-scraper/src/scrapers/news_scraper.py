@@ -3,26 +3,52 @@ News scraper for cyber security news from various sources
 """
 
 import asyncio
-import aiohttp
 import logging
 from datetime import datetime, timedelta
-from typing import List, Optional
-from bs4 import BeautifulSoup
+from typing import Dict, List, Optional
 import hashlib
 import re
 from urllib.parse import urljoin, urlparse
 
+from .date_parser import get_date_parser
+from .html_backend import get_html_backend
+from .html_region import extract_region, strip_non_text, with_charset
+from .selector_memory import get_selector_memory
+from ..ml.keyword_engine import KeywordHits, get_keyword_engine
 from ..models.incident import IncidentModel
 from ..services.mongo_service import MongoService
+from ..services.dedup_gate import DedupGate
 from ..services.enrichment_service import EnrichmentService
+from ..services.http_client import HttpClient, use_http_client
+from ..services.validator_cache import PendingValidators
+from ..services.watermark_store import get_watermark_store
+from ..services.backfill_checkpoints import BackfillCheckpoints
+from ..services.circuit_breaker import get_circuit_breakers
+from ..services.rate_limiter import HostBackoffError
+from ..services.executor import get_worker_pools
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Generic selectors tried after a source's configured one, per field
+FALLBACK_SELECTORS = {
+    "articles": ["article", ".article", ".news-item", ".story", ".post", ".entry", ".content-item", ".news"],
+    "title": ["h1", "h2", "h3", ".title", ".headline", "a", ".post-title"],
+    "description": ["p", ".excerpt", ".summary", ".content", ".description"],
+    "link": ["a", ".title a", ".headline a", ".post-title a"],
+    "date": [".date", ".time", ".published", ".timestamp"]
+}
+
+class NoArticlesFound(Exception):
+    """A listing page matched no article selector, usually a changed layout"""
+
 class NewsScraper:
     """Scraper for cyber security news from various sources"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[HttpClient] = None, mongo_service: Optional[MongoService] = None):
+        self.http_client = http_client
+        # "pagination" is a URL template for listing page {page} >= 2, used by backfill;
+        # "container" is the element holding the article list, the only part parsed
         self.sources = [
             {
                 "name": "The Hacker News",
@@ -38,6 +64,8 @@ class NewsScraper:
             {
                 "name": "Economic Times CISO",
                 "url": "https://ciso.economictimes.indiatimes.com/news/cybercrime-fraud",
+                "container": ".news_listing",
+                "pagination": "https://ciso.economictimes.indiatimes.com/news/cybercrime-fraud/{page}",
                 "selectors": {
                     "articles": ".news_listing .news_item",
                     "title": ".news_title a",
@@ -49,6 +77,8 @@ class NewsScraper:
             {
                 "name": "Indian Express Technology",
                 "url": "https://indianexpress.com/section/technology/",
+                "container": ".articles",
+                "pagination": "https://indianexpress.com/section/technology/page/{page}/",
                 "selectors": {
                     "articles": ".articles .story",
                     "title": ".headlines a",
@@ -60,6 +90,7 @@ class NewsScraper:
             {
                 "name": "Times of India Tech",
                 "url": "https://timesofindia.indiatimes.com/technology",
+                "container": ".list5_wrap",
                 "selectors": {
                     "articles": ".list5_wrap .list5",
                     "title": ".list5_wrap .list5 a",
@@ -71,6 +102,7 @@ class NewsScraper:
             {
                 "name": "Cybersecurity News",
                 "url": "https://cybersecuritynews.com",
+                "pagination": "https://cybersecuritynews.com/page/{page}/",
                 "selectors": {
                     "articles": ".post",
                     "title": ".post-title a",
@@ -82,6 +114,7 @@ class NewsScraper:
             {
                 "name": "Dark Reading",
                 "url": "https://www.darkreading.com",
+                "container": "main",
                 "selectors": {
                     "articles": ".article-card",
                     "title": ".article-card-title a",
@@ -93,6 +126,7 @@ class NewsScraper:
             {
                 "name": "Krebs on Security",
                 "url": "https://krebsonsecurity.com",
+                "pagination": "https://krebsonsecurity.com/page/{page}/",
                 "selectors": {
                     "articles": ".post",
                     "title": ".post-title a",
@@ -104,6 +138,7 @@ class NewsScraper:
             {
                 "name": "Bleeping Computer",
                 "url": "https://www.bleepingcomputer.com",
+                "pagination": "https://www.bleepingcomputer.com/page/{page}/",
                 "selectors": {
                     "articles": ".article",
                     "title": ".article-title a",
@@ -115,6 +150,7 @@ class NewsScraper:
             {
                 "name": "Security Week",
                 "url": "https://www.securityweek.com",
+                "pagination": "https://www.securityweek.com/page/{page}/",
                 "selectors": {
                     "articles": ".article-item",
                     "title": ".article-title a",
@@ -126,6 +162,7 @@ class NewsScraper:
             {
                 "name": "Threat Post",
                 "url": "https://threatpost.com",
+                "pagination": "https://threatpost.com/page/{page}/",
                 "selectors": {
                     "articles": ".post",
                     "title": ".post-title a",
@@ -137,6 +174,7 @@ class NewsScraper:
             {
                 "name": "InfoSec Magazine",
                 "url": "https://www.infosecurity-magazine.com",
+                "pagination": "https://www.infosecurity-magazine.com/news/page-{page}/",
                 "selectors": {
                     "articles": ".article",
                     "title": ".article-title a",
@@ -170,6 +208,7 @@ class NewsScraper:
             {
                 "name": "Help Net Security",
                 "url": "https://www.helpnetsecurity.com",
+                "pagination": "https://www.helpnetsecurity.com/page/{page}/",
                 "selectors": {
                     "articles": ".post",
                     "title": ".post-title a",
@@ -190,131 +229,364 @@ class NewsScraper:
                 }
             }
         ]
-        self.mongo_service = MongoService()
+        self.mongo_service = mongo_service or MongoService()
         self.enrichment_service = EnrichmentService()
+        self.html = get_html_backend()
+        self.selectors = get_selector_memory()
+        self.dates = get_date_parser()
+        self.keywords = get_keyword_engine()
+        self.watermarks = get_watermark_store()
+        self.checkpoints = BackfillCheckpoints()
+        self.breakers = get_circuit_breakers()
+        self.dedup = DedupGate(self.mongo_service)
+        self.last_run_report = {"finished": [], "timed_out": [], "failed": [], "skipped": []}
+        self.pending_validators: Dict[str, PendingValidators] = {}  # per source, committed once saved
         
     async def scrape_and_save(self) -> int:
         """Scrape news data and save to MongoDB"""
         try:
             incidents = await self.scrape_incidents()
-            saved_count = 0
+            saved_count = await self._save_incidents(incidents)
             
+            # Remember what this run saw so the next one can stop early
+            by_source = {}
             for incident in incidents:
-                # Convert model to dict, enrich, then save
-                incident_dict = incident.to_dict()
-                enriched_data = await self.enrichment_service.enrich_incident(incident_dict)
-                
-                if self.mongo_service.save_incident(enriched_data):
-                    saved_count += 1
+                by_source.setdefault(incident.source, []).append(incident)
+            listing_urls = {source["name"]: source["url"] for source in self.sources}
+            for source_name in self.last_run_report["finished"]:
+                self.watermarks.advance(source_name, by_source.get(source_name, []), listing_urls.get(source_name))
+                # Only now may the next run get a 304 for this listing
+                validators = self.pending_validators.pop(source_name, None)
+                if validators:
+                    validators.commit()
+            self.watermarks.save()
             
-            logger.info(f"News scraper: Collected {len(incidents)} incidents, enriched and saved {saved_count}")
+            self.last_run_report["dedup"] = self.dedup.get_summary()
+            logger.info(f"News scraper: Collected {len(incidents)} incidents, "
+                        f"skipped enrichment for {self.last_run_report['dedup']['enrichment_skipped']} known, "
+                        f"saved {saved_count}")
             return saved_count
             
         except Exception as e:
             logger.error(f"News scraping failed: {e}")
             return 0
     
+    async def _save_incidents(self, incidents: List[IncidentModel]) -> int:
+        """Enrich and save incidents, returning how many were new"""
+        pools = get_worker_pools()
+        saved_count = 0
+        
+        # Only incidents not already stored reach the NLP stages
+        incidents = await pools.run_thread(self.dedup.filter, incidents)
+        if not incidents:
+            return 0
+        
+        # Enrich as one batch (split across the worker processes), then save in order
+        enriched = await self.enrichment_service.enrich_incidents([incident.to_dict() for incident in incidents])
+        for enriched_data in enriched:
+            if await pools.run_thread(self.mongo_service.save_incident, enriched_data):
+                saved_count += 1
+        
+        return saved_count
+    
     async def scrape_incidents(self) -> List[IncidentModel]:
-        """Scrape incidents from news sources"""
+        """Scrape incidents from news sources concurrently"""
         incidents = []
+        report = {"finished": [], "timed_out": [], "failed": [], "skipped": []}
+        self.pending_validators = {}
+        semaphore = asyncio.Semaphore(max(1, Config.MAX_CONCURRENT_REQUESTS))
         
+        # Sources with an open circuit are skipped until their next probe
+        sources = []
         for source in self.sources:
-            try:
-                source_incidents = await self._scrape_source(source)
-                incidents.extend(source_incidents)
-            except Exception as e:
-                logger.error(f"Failed to scrape {source['name']}: {e}")
+            if self.breakers.allow(source["name"]):
+                sources.append(source)
+            else:
+                report["skipped"].append(source["name"])
+        
+        async with use_http_client(self.http_client) as client:
+            async def run_source(source: dict) -> List[IncidentModel]:
+                async with semaphore:
+                    # The per-source timeout only starts once a slot is free
+                    return await asyncio.wait_for(self._scrape_source(client, source), timeout=Config.SOURCE_TIMEOUT)
+            
+            tasks = {asyncio.create_task(run_source(source)): source for source in sources}
+            done, pending = await asyncio.wait(tasks, timeout=Config.SCRAPE_RUN_DEADLINE)
+            
+            # Sources still running at the run deadline are abandoned
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        # Collect results in source order so output stays deterministic
+        for task, source in tasks.items():
+            if task in pending:
+                report["timed_out"].append(source["name"])
+                self.breakers.record_failure(source["name"], "run deadline reached")
+                logger.warning(f"Run deadline reached before {source['name']} finished")
                 continue
+            
+            error = task.exception()
+            if error is None:
+                incidents.extend(task.result())
+                report["finished"].append(source["name"])
+                self.breakers.record_success(source["name"])
+            elif isinstance(error, asyncio.TimeoutError):
+                report["timed_out"].append(source["name"])
+                self.breakers.record_failure(source["name"], f"timed out after {Config.SOURCE_TIMEOUT}s")
+                logger.warning(f"Timed out scraping {source['name']} after {Config.SOURCE_TIMEOUT}s")
+            else:
+                report["failed"].append(source["name"])
+                # A host that asked for a longer pause than we wait out is not retried every run
+                self.breakers.record_failure(source["name"], str(error) or type(error).__name__,
+                                             open_now=isinstance(error, HostBackoffError))
+                logger.error(f"Failed to scrape {source['name']}: {error}")
         
+        self.breakers.save()
+        self.selectors.save()
+        self.last_run_report = report
+        logger.info(
+            f"News sources finished: {len(report['finished'])}, "
+            f"timed out: {report['timed_out']}, failed: {report['failed']}, "
+            f"skipped (circuit open): {report['skipped']}"
+        )
         return incidents
     
-    async def _scrape_source(self, source: dict) -> List[IncidentModel]:
-        """Scrape a specific news source"""
+    async def _scrape_source(self, client: HttpClient, source: dict) -> List[IncidentModel]:
+        """Scrape a specific news source
+        
+        Network and HTTP errors propagate so the caller can report the source as failed.
+        The listing's new HTTP validators are held in pending_validators until the
+        incidents are saved, so a failed run re-fetches the page next time.
+        """
         incidents = []
         
-        try:
-            timeout = aiohttp.ClientTimeout(total=Config.REQUEST_TIMEOUT)
-            headers = {"User-Agent": Config.USER_AGENT}
-            async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
-                async with session.get(source["url"]) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        soup = BeautifulSoup(content, 'lxml')
-                        
-                        # Find articles with multiple selector strategies
-                        articles = []
-                        
-                        # Try primary selector
-                        articles = soup.select(source["selectors"]["articles"])
-                        
-                        # If no articles found, try alternative selectors
-                        if not articles:
-                            alternative_selectors = [
-                                "article", ".article", ".news-item", ".story", 
-                                ".post", ".entry", ".content-item", ".news"
-                            ]
-                            for alt_selector in alternative_selectors:
-                                articles = soup.select(alt_selector)
-                                if articles:
-                                    logger.info(f"Using alternative selector '{alt_selector}' for {source['name']}")
-                                    break
-                        
-                        logger.info(f"Found {len(articles)} articles from {source['name']}")
-                        
-                        for article in articles[:10]:  # Limit to 10 articles per source (reduced due to more sources)
-                            try:
-                                incident = self._parse_article(article, source)
-                                if incident:
-                                    incidents.append(incident)
-                            except Exception as e:
-                                logger.error(f"Error parsing article: {e}")
-                                continue
-                                
-        except Exception as e:
-            logger.error(f"Failed to scrape {source['name']}: {e}")
+        response = await client.fetch(source["url"], conditional=True)
+        response.raise_for_status()
+        if response.not_modified:
+            logger.info(f"{source['name']} unchanged since last run, skipping")
+            return incidents
         
+        # Parsing and the MongoDB lookup block, so they run in the thread pool
+        pools = get_worker_pools()
+        await pools.run_thread(self.watermarks.seed_from, source["name"], self.mongo_service)
+        incidents = await pools.run_thread(self._parse_listing, response.body, source)
+        # Committed by scrape_and_save after the incidents are saved
+        if response.validators:
+            self.pending_validators[source["name"]] = response.validators
         return incidents
     
-    def _parse_article(self, article, source: dict) -> Optional[IncidentModel]:
-        """Parse individual article with flexible extraction"""
-        try:
-            # Extract title with multiple strategies
-            title = self._extract_text(article, [
-                source["selectors"]["title"],
-                "h1", "h2", "h3", ".title", ".headline", "a", ".post-title"
-            ])
+    def _parse_listing(self, body: bytes, source: dict) -> List[IncidentModel]:
+        """Turn a listing page into incidents, stopping once known articles are reached"""
+        with self.selectors.page(source["name"]):  # selectors are learned per page
+            incidents = []
+            articles = self._listing_articles(body, source)
+            if not articles:
+                raise NoArticlesFound(f"no article selector matched {source['url']}")
+            logger.info(f"Found {len(articles)} articles from {source['name']}")
             
-            if not title or len(title) < 10:  # Skip very short titles
-                return None
+            known_streak = 0
+            newer_date = None
+            
+            for article in articles[:10]:  # Limit to 10 articles per source (reduced due to more sources)
+                try:
+                    incident = self._parse_article(article, source, newer_date)
+                    if not incident:
+                        continue
+                    newer_date = incident.published_date
+                
+                    # Listings are newest first: a run of known articles means we caught up
+                    if self.watermarks.is_known(source["name"], incident.hash, incident.url, listing_url=source["url"]):
+                        known_streak += 1
+                        if known_streak >= Config.WATERMARK_STOP_AFTER:
+                            break
+                        continue
+                
+                    known_streak = 0
+                    incidents.append(incident)
+                except Exception as e:
+                    logger.error(f"Error parsing article: {e}")
+                    continue
+        
+        return incidents
+    
+    def _selector_chain(self, source: dict, field: str) -> List[str]:
+        """Selectors for a field, starting with the one that matched last time"""
+        return self.selectors.chain(source["name"], field, source["selectors"][field], FALLBACK_SELECTORS[field])
+    
+    def _listing_articles(self, body: bytes, source: dict) -> list:
+        """Parse a listing page and return its article elements
+        
+        Script and style blocks are dropped from the raw bytes first. When the
+        source declares a "container", only that element is parsed; if it is
+        missing or holds no articles the whole page is parsed instead, and the
+        miss is counted with the selector stats.
+        """
+        body = strip_non_text(body)
+        container = source.get("container")
+        if container:
+            region = extract_region(body, container)
+            if region is not None:
+                articles = self._select_articles(self.html.parse(with_charset(body, region)), source)
+                if articles:
+                    self.selectors.record(source["name"], "container", container, 0, configured=container)
+                    return articles
+            self.selectors.record(source["name"], "container", None, 0, configured=container)
+            logger.info(f"Container '{container}' not usable for {source['name']}, parsing the whole page")
+        
+        return self._select_articles(self.html.parse(body), source)
+    
+    def _select_articles(self, document, source: dict) -> list:
+        """Find article elements, trying the learned selector first"""
+        chain = self._selector_chain(source, "articles")
+        for position, selector in enumerate(chain):
+            articles = self.html.select(document, self.html.compile(selector))
+            if articles:
+                if position:
+                    logger.info(f"Using alternative selector '{selector}' for {source['name']}")
+                self.selectors.record(source["name"], "articles", selector, position)
+                return articles
+        
+        self.selectors.record(source["name"], "articles", None, len(chain))
+        return []
+    
+    async def backfill(self, source_names: Optional[List[str]] = None, max_pages: Optional[int] = None,
+                       until: Optional[datetime] = None, reset: bool = False) -> dict:
+        """Walk paginated listings of news sources to recover older articles
+        
+        Pages are fetched concurrently (bounded by MAX_CONCURRENT_REQUESTS and the
+        per-host rate limits). Progress is checkpointed after every batch of pages,
+        so an interrupted backfill resumes where it stopped.
+        """
+        max_pages = max_pages or Config.BACKFILL_MAX_PAGES
+        sources = [
+            source for source in self.sources
+            if source.get("pagination") and (not source_names or source["name"] in source_names)
+        ]
+        semaphore = asyncio.Semaphore(max(1, Config.MAX_CONCURRENT_REQUESTS))
+        report = {}
+        
+        async with use_http_client(self.http_client) as client:
+            async def run_source(source: dict):
+                try:
+                    report[source["name"]] = await self._backfill_source(
+                        client, source, semaphore, max_pages, until, reset
+                    )
+                except Exception as e:
+                    logger.error(f"Backfill failed for {source['name']}: {e}")
+                    report[source["name"]] = {"error": str(e), **(self.checkpoints.get(source["name"]) or {})}
+                finally:
+                    self.checkpoints.save()
             
-            # Extract description with multiple strategies
-            description = self._extract_text(article, [
-                source["selectors"]["description"],
-                "p", ".excerpt", ".summary", ".content", ".description"
-            ])
+            await asyncio.gather(*(run_source(source) for source in sources))
+        self.selectors.save()
+        
+        logger.info(f"News backfill finished: {report}")
+        return report
+    
+    async def _backfill_source(self, client: HttpClient, source: dict, semaphore: asyncio.Semaphore,
+                               max_pages: int, until: Optional[datetime], reset: bool) -> dict:
+        """Backfill one source from its checkpoint, a batch of pages at a time"""
+        name = source["name"]
+        if reset:
+            self.checkpoints.reset(name)
+        checkpoint = self.checkpoints.get(name) or self.checkpoints.start(name, until)
+        if checkpoint["done"]:
+            logger.info(f"Backfill for {name} already complete, skipping (use reset to rerun)")
+            return checkpoint
+        
+        # A resumed backfill keeps the cutoff it was started with
+        stored_until = datetime.fromisoformat(checkpoint["until"]) if checkpoint.get("until") else None
+        if stored_until != until:
+            logger.warning(f"Resuming backfill for {name} with its checkpoint's until={checkpoint.get('until')}, "
+                           f"not {until.isoformat() if until else None} (use reset to change it)")
+        until = stored_until
+        
+        async def fetch_page(page: int) -> tuple[int, List[IncidentModel]]:
+            """Return the number of articles on a listing page and the incidents among them"""
+            url = source["url"] if page == 1 else source["pagination"].format(page=page)
+            async with semaphore:
+                response = await client.fetch(url)
+            if response.status == 404:
+                return 0, []
+            response.raise_for_status()
+            return await get_worker_pools().run_thread(parse_page, response.body)
+        
+        def parse_page(body: bytes) -> tuple[int, List[IncidentModel]]:
+            with self.selectors.page(name):
+                articles = self._listing_articles(body, source)
+                incidents = []
+                newer_date = None
+                for article in articles:
+                    incident = self._parse_article(article, source, newer_date)
+                    if incident:
+                        incidents.append(incident)
+                        newer_date = incident.published_date
+            return len(articles), incidents
+        
+        batch_size = max(1, Config.MAX_CONCURRENT_REQUESTS)
+        while not checkpoint["done"]:
+            first_page = checkpoint["next_page"]
+            pages = list(range(first_page, min(first_page + batch_size, max_pages + 1)))
+            if not pages:
+                self.checkpoints.update(name, done=True, stopped="max_pages")
+                break
             
-            # Extract link with multiple strategies
-            link = self._extract_link(article, [
-                source["selectors"]["link"],
-                "a", ".title a", ".headline a", ".post-title a"
-            ])
+            results = await asyncio.gather(*(fetch_page(page) for page in pages))
             
-            if link and not link.startswith('http'):
-                link = urljoin(source["url"], link)
+            stopped = None
+            for page, (article_count, incidents) in zip(pages, results):
+                if not article_count:
+                    stopped = "end_of_listing"
+                    break
+                if until:
+                    recent = [i for i in incidents if i.published_date >= until]
+                    if len(recent) < len(incidents):
+                        stopped = "reached_until"
+                    incidents = recent
+                
+                saved = await self._save_incidents(incidents)
+                self.checkpoints.update(
+                    name,
+                    next_page=page + 1,
+                    pages_done=checkpoint["pages_done"] + 1,
+                    incidents_found=checkpoint["incidents_found"] + len(incidents),
+                    incidents_saved=checkpoint["incidents_saved"] + saved
+                )
+                if stopped:
+                    break
             
-            # Extract date with multiple strategies
-            date_text = self._extract_text(article, [
-                source["selectors"]["date"],
-                ".date", ".time", ".published", ".timestamp"
-            ])
-            pub_date = self._parse_date(date_text)
+            if stopped:
+                self.checkpoints.update(name, done=True, stopped=stopped)
+            self.checkpoints.save()
+            checkpoint = self.checkpoints.get(name)
+        
+        return checkpoint
+    
+    def _parse_article(self, article, source: dict, newer_date: Optional[datetime] = None) -> Optional[IncidentModel]:
+        """Parse individual article with flexible extraction
+        
+        Listings are newest first, so an article whose date cannot be parsed
+        takes the date of the article above it (`newer_date`) rather than the
+        current time, which would sort it ahead of everything on the page.
+        """
+        try:
+            fields = self._extract_fields(article, source)
+            if fields is None:
+                return None
+            title, description, link = fields["title"], fields["description"], fields["link"]
+            pub_date = self.dates.parse(fields["date"], source["name"]) or newer_date or datetime.utcnow()
+            
+            # One keyword scan serves the relevance filter, classification and tags
+            hits = self.keywords.scan(f"{title} {description}")
             
             # Filter for cyber security related content
-            if not self._is_cyber_security_related(title, description):
+            if not self._is_cyber_security_related(title, description, hits):
                 return None
             
             # Determine severity and category
-            severity, category = self._classify_incident(title, description)
+            severity, category = self._classify_incident(title, description, hits)
             
             # Generate hash
             content_hash = hashlib.md5(f"{title}{description}{link}".encode()).hexdigest()
@@ -329,162 +601,80 @@ class NewsScraper:
                 severity=severity,
                 location="India",
                 hash=content_hash,
-                tags=self._extract_tags(title, description)
+                tags=self._extract_tags(title, description, hits)
             )
             
         except Exception as e:
             logger.error(f"Error parsing article: {e}")
             return None
     
-    def _extract_text(self, element, selectors: list) -> str:
-        """Extract text using multiple selector strategies"""
-        for selector in selectors:
+    def _extract_fields(self, article, source: dict) -> Optional[dict]:
+        """Raw title, description, link and date text of an article, or None if untitled"""
+        title = self._extract_text(article, source, "title")
+        if not title or len(title) < 10:  # Skip very short titles
+            return None
+        
+        description = self._extract_text(article, source, "description")
+        link = self._extract_link(article, source)
+        if link and not link.startswith('http'):
+            link = urljoin(source["url"], link)
+        date_text = self._extract_text(article, source, "date")
+        
+        return {"title": title, "description": description, "link": link, "date": date_text}
+    
+    def _extract_text(self, element, source: dict, field: str) -> str:
+        """Extract a field's text, trying the learned selector first"""
+        chain = self._selector_chain(source, field)
+        for position, selector in enumerate(chain):
             try:
-                elem = element.select_one(selector)
-                if elem:
-                    text = elem.get_text().strip()
+                elem = self.html.select_one(element, self.html.compile(selector))
+                if elem is not None:
+                    text = self.html.text(elem).strip()
                     if text:
+                        self.selectors.record(source["name"], field, selector, position)
                         return text
-            except:
+            except Exception:
                 continue
+        self.selectors.record(source["name"], field, None, len(chain))
         return ""
     
-    def _extract_link(self, element, selectors: list) -> str:
-        """Extract link using multiple selector strategies"""
-        for selector in selectors:
+    def _extract_link(self, element, source: dict) -> str:
+        """Extract the article link, trying the learned selector first"""
+        chain = self._selector_chain(source, "link")
+        for position, selector in enumerate(chain):
             try:
-                elem = element.select_one(selector)
-                if elem:
-                    link = elem.get('href')
+                elem = self.html.select_one(element, self.html.compile(selector))
+                if elem is not None:
+                    link = self.html.attr(elem, 'href')
                     if link:
+                        self.selectors.record(source["name"], "link", selector, position)
                         return link
-            except:
+            except Exception:
                 continue
+        self.selectors.record(source["name"], "link", None, len(chain))
         return ""
     
-    def _parse_date(self, date_str: str) -> datetime:
-        """Parse date string to datetime object"""
-        try:
-            # Try different date formats
-            date_formats = [
-                '%Y-%m-%d %H:%M:%S',
-                '%Y-%m-%d',
-                '%d %b %Y',
-                '%b %d, %Y',
-                '%d/%m/%Y'
-            ]
-            
-            for fmt in date_formats:
-                try:
-                    return datetime.strptime(date_str, fmt)
-                except ValueError:
-                    continue
-            
-            # If no format matches, return current time
-            return datetime.utcnow()
-            
-        except Exception:
-            return datetime.utcnow()
+    def _keyword_hits(self, title: str, description: str, hits: Optional[KeywordHits]) -> KeywordHits:
+        return hits if hits is not None else self.keywords.scan(f"{title} {description}")
     
-    def _is_cyber_security_related(self, title: str, description: str) -> bool:
+    def _is_cyber_security_related(self, title: str, description: str, hits: Optional[KeywordHits] = None) -> bool:
         """Check if content is cyber security related"""
-        text = f"{title} {description}".lower()
-        
-        cyber_keywords = [
-            'cyber', 'security', 'hack', 'hacker', 'breach', 'data leak',
-            'ransomware', 'malware', 'phishing', 'vulnerability', 'exploit',
-            'attack', 'threat', 'incident', 'compromise', 'fraud', 'scam',
-            'privacy', 'encryption', 'firewall', 'antivirus', 'virus',
-            'trojan', 'ddos', 'botnet', 'spyware', 'adware', 'rootkit',
-            'social engineering', 'identity theft', 'cybercrime', 'digital',
-            'information security', 'network security', 'data protection',
-            'cyber attack', 'cyber threat', 'cyber incident', 'cyber fraud',
-            'data breach', 'security breach', 'system compromise'
-        ]
-        
-        return any(keyword in text for keyword in cyber_keywords)
+        return self._keyword_hits(title, description, hits).has("news.cyber")
     
-    def _is_india_related(self, title: str, description: str) -> bool:
-        """Check if content is India-related or globally relevant cyber security news"""
-        text = f"{title} {description}".lower()
-        
-        india_keywords = [
-            'india', 'indian', 'delhi', 'mumbai', 'bangalore', 'chennai',
-            'kolkata', 'hyderabad', 'pune', 'ahmedabad', 'jaipur', 'gurgaon',
-            'noida', 'kerala', 'tamil nadu', 'karnataka', 'maharashtra',
-            'cert-in', 'government of india', 'ministry of', 'indian bank',
-            'indian government', 'indian cyber', 'indian it', 'indian tech',
-            'reserve bank of india', 'rbi', 'sebi', 'irctc', 'uidai', 'aadhaar',
-            'digital india', 'make in india', 'startup india', 'smart cities'
-        ]
+    def _is_india_related(self, title: str, description: str, hits: Optional[KeywordHits] = None) -> bool:
+        """Check if content is India-related or globally relevant cyber security news
         
-        # Check for India-specific content
-        if any(keyword in text for keyword in india_keywords):
-            return True
-        
-        # For international sources, include globally relevant cyber security news
-        # that could impact India or be relevant to Indian organizations
-        global_cyber_keywords = [
-            'ransomware', 'data breach', 'cyber attack', 'malware', 'phishing',
-            'vulnerability', 'zero-day', 'apt', 'nation-state', 'cyber espionage',
-            'critical infrastructure', 'power grid', 'banking', 'financial',
-            'healthcare', 'education', 'government', 'military', 'defense'
-        ]
-        
-        # Include if it's globally significant cyber security news
-        return any(keyword in text for keyword in global_cyber_keywords)
+        International sources are kept when the story is globally significant
+        (the "global" keywords) and so could impact Indian organizations.
+        """
+        return self._keyword_hits(title, description, hits).has("news.india")
     
-    def _classify_incident(self, title: str, description: str) -> tuple[str, str]:
+    def _classify_incident(self, title: str, description: str,
+                           hits: Optional[KeywordHits] = None) -> tuple[str, str]:
         """Classify incident severity and category"""
-        text = f"{title} {description}".lower()
-        
-        # Determine severity
-        if any(word in text for word in ['critical', 'emergency', 'urgent', 'immediate', 'severe']):
-            severity = 'Critical'
-        elif any(word in text for word in ['high', 'serious', 'major', 'significant']):
-            severity = 'High'
-        elif any(word in text for word in ['medium', 'moderate', 'minor']):
-            severity = 'Medium'
-        else:
-            severity = 'Low'
-        
-        # Determine category
-        if any(word in text for word in ['breach', 'leak', 'exposed', 'compromised']):
-            category = 'Data Breach'
-        elif any(word in text for word in ['attack', 'hack', 'ransomware', 'malware']):
-            category = 'Cyber Attack'
-        elif any(word in text for word in ['vulnerability', 'exploit', 'patch', 'cve']):
-            category = 'Vulnerability'
-        elif any(word in text for word in ['phishing', 'scam', 'fraud']):
-            category = 'Fraud'
-        else:
-            category = 'News'
-        
-        return severity, category
+        hits = self._keyword_hits(title, description, hits)
+        return hits.first("news.severity", "Low"), hits.first("news.category", "News")
     
-    def _extract_tags(self, title: str, description: str) -> List[str]:
+    def _extract_tags(self, title: str, description: str, hits: Optional[KeywordHits] = None) -> List[str]:
         """Extract relevant tags from incident content"""
-        text = f"{title} {description}".lower()
-        tags = []
-        
-        # Common cyber security tags
-        tag_keywords = {
-            'ransomware': ['ransomware', 'ransom'],
-            'phishing': ['phishing', 'phish'],
-            'malware': ['malware', 'virus', 'trojan'],
-            'ddos': ['ddos', 'denial of service'],
-            'data-breach': ['breach', 'leak', 'exposed', 'compromised'],
-            'vulnerability': ['vulnerability', 'cve', 'exploit', 'patch'],
-            'banking': ['bank', 'financial', 'payment', 'atm'],
-            'government': ['government', 'govt', 'ministry', 'public'],
-            'critical-infrastructure': ['infrastructure', 'power', 'grid', 'utilities'],
-            'e-commerce': ['ecommerce', 'e-commerce', 'online shopping'],
-            'healthcare': ['healthcare', 'hospital', 'medical'],
-            'education': ['education', 'school', 'university', 'college']
-        }
-        
-        for tag, keywords in tag_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                tags.append(tag)
-        
-        return tags
+        return self._keyword_hits(title, description, hits).labels("news.tags")
@@ -0,0 +1,172 @@
+"""
+Per-source memory of which CSS selector matched each field
+"""
+
+import logging
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from ..services.state_store import load_json_state, save_json_state
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Fields matched once per listing page; every other field is matched per article
+PAGE_FIELDS = ("articles", "container")
+
+# Articles a per-article selector must match, all of them on one page, to be learned
+MIN_PAGE_MATCHES = 2
+
+# Bare element selectors (p, a, h2, article) match unrelated markup, such as a
+# byline paragraph, so they are never learned
+GENERIC_SELECTOR = re.compile(r"^[a-z][a-z0-9]*$")
+
+def is_generic(selector: str) -> bool:
+    return bool(GENERIC_SELECTOR.match(selector))
+
+class SelectorMemory:
+    """Learned selector and hit counts per source and field, persisted between runs
+
+    A selector is learned from a listing page (see page()) when it matched
+    the field on every article of that page and is neither the configured
+    selector nor a generic element selector. For per-article fields the
+    configured selector is still tried first and the learned one replaces
+    only the generic fallbacks; for the page-level article list the learned
+    selector is tried first. `hits` counts first-try matches, `fallbacks`
+    matches further down the chain and `misses` fields nothing matched.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or Config.SELECTOR_MEMORY_PATH
+        self.sources: Dict[str, Dict[str, dict]] = load_json_state(self.path, {})
+        self._chains: Dict[tuple, List[str]] = {}
+        self._local = threading.local()  # the listing page being parsed, per thread
+        self._dirty = False
+
+    def _field(self, source: str, field: str, configured: Optional[str] = None) -> dict:
+        stats = self.sources.setdefault(source, {}).setdefault(field, {
+            "configured": configured,
+            "selector": None,
+            "hits": 0,
+            "fallbacks": 0,
+            "misses": 0,
+            "matched": {}
+        })
+        if configured is not None:
+            stats["configured"] = configured
+        return stats
+
+    def chain(self, source: str, field: str, configured: str, fallbacks: List[str]) -> List[str]:
+        """Selectors to try for a field
+
+        Per-article fields: configured, learned, then the fallbacks. Page-level
+        fields: learned, configured, then the fallbacks. A generic learned
+        selector (saved before they were excluded) is ignored. The ordered
+        chain is cached until the learned selector changes.
+        """
+        key = (source, field)
+        chain = self._chains.get(key)
+        if chain is None:
+            learned = self._field(source, field, configured)["selector"]
+            if learned and is_generic(learned):
+                learned = None
+            first = (learned, configured) if field in PAGE_FIELDS else (configured, learned)
+            chain = list(dict.fromkeys([s for s in first if s] + fallbacks))
+            self._chains[key] = chain
+        return chain
+
+    def record(self, source: str, field: str, selector: Optional[str], position: int,
+               configured: Optional[str] = None):
+        """Record which selector in the chain matched (None when none did)"""
+        stats = self._field(source, field, configured)
+        if selector is None:
+            stats["misses"] += 1
+        elif position == 0:
+            stats["hits"] += 1
+        else:
+            stats["fallbacks"] += 1
+        if selector is not None:
+            stats["matched"][selector] = stats["matched"].get(selector, 0) + 1
+        page = getattr(self._local, "page", None)
+        if page is not None and page[0] == source:
+            page[1].setdefault(field, []).append(selector)
+        self._dirty = True
+
+    @contextmanager
+    def page(self, source: str):
+        """Collect the matches of one listing page, learning from them when it is done
+
+        Pages parse in worker threads, so the matches are kept per thread.
+        """
+        matches: Dict[str, List[Optional[str]]] = {}
+        self._local.page = (source, matches)
+        try:
+            yield
+        finally:
+            self._local.page = None
+        for field, selectors in matches.items():
+            self._learn(source, field, selectors)
+
+    def _learn(self, source: str, field: str, selectors: List[Optional[str]]):
+        """Learn a field's selector if it matched every article of the page"""
+        minimum = 1 if field in PAGE_FIELDS else MIN_PAGE_MATCHES
+        if len(selectors) < minimum or len(set(selectors)) != 1 or selectors[0] is None:
+            return
+        stats = self._field(source, field)
+        selector = selectors[0]
+        if selector == stats["configured"]:
+            learned = None  # the configured selector works again
+        elif is_generic(selector):
+            return
+        else:
+            learned = selector
+        if learned != stats["selector"]:
+            if learned:
+                logger.info(f"{source}: learned selector '{learned}' for {field} "
+                            f"(configured '{stats['configured']}')")
+            stats["selector"] = learned
+            self._chains.pop((source, field), None)
+            self._dirty = True
+
+    def save(self):
+        """Persist learned selectors if anything changed"""
+        if not self._dirty:
+            return
+        try:
+            save_json_state(self.path, self.sources)
+            self._dirty = False
+        except OSError as e:
+            logger.error(f"Failed to save selector memory: {e}")
+
+    def get_summary(self) -> Dict[str, Dict[str, dict]]:
+        """Learned selector and hit rate per source and field
+
+        A learned selector that differs from the configured one, or a low hit
+        rate, points at a source config that needs updating.
+        """
+        summary = {}
+        for source, fields in self.sources.items():
+            summary[source] = {}
+            for field, stats in fields.items():
+                total = stats["hits"] + stats["fallbacks"] + stats["misses"]
+                configured_hits = stats["matched"].get(stats["configured"], 0)
+                summary[source][field] = {
+                    "configured": stats["configured"],
+                    "learned": stats["selector"],
+                    "hit_rate": round(stats["hits"] / total, 3) if total else None,
+                    "configured_hit_rate": round(configured_hits / total, 3) if total else None,
+                    "fallbacks": stats["fallbacks"],
+                    "misses": stats["misses"]
+                }
+        return summary
+
+_selector_memory: Optional[SelectorMemory] = None
+
+def get_selector_memory() -> SelectorMemory:
+    """Process-wide selector memory shared by news scrapers"""
+    global _selector_memory
+    if _selector_memory is None:
+        _selector_memory = SelectorMemory()
+    return _selector_memory
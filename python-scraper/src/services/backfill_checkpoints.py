@@ -0,0 +1,59 @@
+"""
+Checkpointed progress for resumable news backfills
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+
+from .state_store import load_json_state, save_json_state
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class BackfillCheckpoints:
+    """Next page to fetch and running totals per source, in DATA_DIR/backfill.json"""
+
+    def __init__(self, path: str = None):
+        self.path = path or Config.BACKFILL_CHECKPOINT_PATH
+        self.sources: Dict[str, dict] = load_json_state(self.path, {})
+        self._dirty = False
+
+    def get(self, source: str) -> Optional[dict]:
+        return self.sources.get(source)
+
+    def start(self, source: str, until: Optional[datetime] = None) -> dict:
+        """Create a fresh checkpoint for a source"""
+        self.sources[source] = {
+            "next_page": 1,
+            "pages_done": 0,
+            "incidents_found": 0,
+            "incidents_saved": 0,
+            "until": until.isoformat() if until else None,
+            "done": False,
+            "stopped": None,
+            "started_at": datetime.utcnow().isoformat(),
+            "updated_at": datetime.utcnow().isoformat()
+        }
+        self._dirty = True
+        return self.sources[source]
+
+    def update(self, source: str, **fields):
+        checkpoint = self.sources[source]
+        checkpoint.update(fields)
+        checkpoint["updated_at"] = datetime.utcnow().isoformat()
+        self._dirty = True
+
+    def reset(self, source: str):
+        if self.sources.pop(source, None) is not None:
+            self._dirty = True
+
+    def save(self):
+        """Persist checkpoints if anything changed"""
+        if not self._dirty:
+            return
+        try:
+            save_json_state(self.path, self.sources)
+            self._dirty = False
+        except OSError as e:
+            logger.error(f"Failed to save backfill checkpoints: {e}")
@@ -0,0 +1,121 @@
+"""
+Per-source circuit breakers so dead or broken sources stop slowing every run
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from .state_store import load_json_state, save_json_state
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitBreakerRegistry:
+    """Closed / open / half-open state per source, persisted between runs
+
+    A source opens after BREAKER_FAILURE_THRESHOLD consecutive failures (errors,
+    timeouts or zero-article pages) and is skipped until BREAKER_RESET_TIMEOUT
+    has passed. It then gets a single half-open probe: success closes it,
+    failure opens it again for another full timeout.
+    """
+
+    def __init__(self, path: str = None, failure_threshold: int = None,
+                 reset_timeout: float = None, clock: Callable[[], float] = time.time):
+        self.path = path or Config.BREAKER_STATE_PATH
+        self.failure_threshold = failure_threshold or Config.BREAKER_FAILURE_THRESHOLD
+        self.reset_timeout = reset_timeout or Config.BREAKER_RESET_TIMEOUT
+        self.clock = clock
+        self.breakers: Dict[str, dict] = load_json_state(self.path, {})
+        self._probing = set()
+        self._dirty = False
+
+    def _breaker(self, source: str) -> dict:
+        return self.breakers.setdefault(source, {
+            "state": CLOSED,
+            "failures": 0,
+            "opened_at": None,
+            "last_error": None,
+            "last_success": None
+        })
+
+    def allow(self, source: str) -> bool:
+        """Whether the source should be scraped now"""
+        breaker = self._breaker(source)
+        if breaker["state"] == CLOSED:
+            return True
+        if source in self._probing:
+            return False
+        if breaker["state"] == OPEN and self.clock() - breaker["opened_at"] < self.reset_timeout:
+            return False
+
+        # Let one probe request through
+        breaker["state"] = HALF_OPEN
+        self._probing.add(source)
+        self._dirty = True
+        logger.info(f"Circuit for {source} half-open, probing")
+        return True
+
+    def record_success(self, source: str):
+        breaker = self._breaker(source)
+        if breaker["state"] != CLOSED:
+            logger.info(f"Circuit for {source} closed")
+        breaker.update(state=CLOSED, failures=0, opened_at=None, last_success=datetime.utcnow().isoformat())
+        self._probing.discard(source)
+        self._dirty = True
+
+    def record_failure(self, source: str, reason: str, open_now: bool = False):
+        """Count a failure; open_now opens the circuit without waiting for the threshold"""
+        breaker = self._breaker(source)
+        breaker["failures"] += 1
+        breaker["last_error"] = reason
+        if open_now or breaker["state"] == HALF_OPEN or breaker["failures"] >= self.failure_threshold:
+            if breaker["state"] != OPEN:
+                logger.warning(f"Circuit for {source} opened after {breaker['failures']} failures: {reason}")
+            breaker["state"] = OPEN
+            breaker["opened_at"] = self.clock()
+        self._probing.discard(source)
+        self._dirty = True
+
+    def state(self, source: str) -> str:
+        return self.breakers.get(source, {}).get("state", CLOSED)
+
+    def save(self):
+        """Persist breaker state if anything changed"""
+        if not self._dirty:
+            return
+        try:
+            save_json_state(self.path, self.breakers)
+            self._dirty = False
+        except OSError as e:
+            logger.error(f"Failed to save circuit breaker state: {e}")
+
+    def get_summary(self) -> Dict[str, dict]:
+        """Breaker state per source, with the time until an open circuit is re-probed"""
+        summary = {}
+        for source, breaker in self.breakers.items():
+            retry_in = None
+            if breaker["state"] == OPEN and breaker["opened_at"] is not None:
+                retry_in = max(0, round(self.reset_timeout - (self.clock() - breaker["opened_at"])))
+            summary[source] = {
+                "state": breaker["state"],
+                "failures": breaker["failures"],
+                "last_error": breaker["last_error"],
+                "last_success": breaker["last_success"],
+                "retry_in_seconds": retry_in
+            }
+        return summary
+
+_breakers: Optional[CircuitBreakerRegistry] = None
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """Process-wide circuit breaker registry"""
+    global _breakers
+    if _breakers is None:
+        _breakers = CircuitBreakerRegistry()
+    return _breakers
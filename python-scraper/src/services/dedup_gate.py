@@ -0,0 +1,58 @@
+"""
+Dedup gate between parsing and enrichment
+"""
+
+import logging
+from typing import List
+
+from ..models.incident import IncidentModel
+
+logger = logging.getLogger(__name__)
+
+class DedupGate:
+    """Drops incidents already in storage (or repeated within a run) before enrichment
+
+    A run's hashes are looked up with one bulk query, so only new incidents
+    reach the NLP stages; save_incident still checks each hash, so a failed
+    lookup only costs wasted enrichment. Counts accumulate for the scraper's
+    run report.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.stats = {"checked": 0, "known": 0, "duplicates": 0, "passed": 0}
+
+    def filter(self, incidents: List[IncidentModel]) -> List[IncidentModel]:
+        """The incidents whose hash is neither stored nor seen earlier in the list"""
+        if not incidents:
+            return []
+        existing = self.store.get_existing_hashes([incident.hash for incident in incidents])
+
+        new, seen = [], set()
+        known = duplicates = 0
+        for incident in incidents:
+            if incident.hash in existing:
+                known += 1
+            elif incident.hash in seen:
+                duplicates += 1
+            else:
+                seen.add(incident.hash)
+                new.append(incident)
+
+        self.stats["checked"] += len(incidents)
+        self.stats["known"] += known
+        self.stats["duplicates"] += duplicates
+        self.stats["passed"] += len(new)
+        if known or duplicates:
+            logger.info(f"Dedup gate: {len(new)} of {len(incidents)} incidents are new "
+                        f"({known} already stored, {duplicates} repeated in this run)")
+        return new
+
+    def get_summary(self) -> dict:
+        checked = self.stats["checked"]
+        skipped = self.stats["known"] + self.stats["duplicates"]
+        return {
+            **self.stats,
+            "enrichment_skipped": skipped,
+            "enrichment_skipped_rate": round(skipped / checked, 3) if checked else 0.0
+        }
@@ -1,29 +1,97 @@
+import asyncio
 import logging
-from ..ml.threat_classifier import ThreatClassifier
-from ..ml.entity_extractor import EntityExtractor
-from ..ml.mitre_mapper import MitreMapper
-from ..ml.cve_extractor import CveExtractor
+from typing import List, Optional
+
+from ..ml.analyzed_text import AnalyzedText
+from ..ml.model_registry import get_model_registry
+from .executor import enrich_batch_in_worker, enrich_in_worker, get_worker_pools
 
 logger = logging.getLogger(__name__)
 
 class EnrichmentService:
     def __init__(self):
-        self.classifier = ThreatClassifier()
-        self.entity_extractor = EntityExtractor()
-        self.mitre_mapper = MitreMapper()
-        self.cve_extractor = CveExtractor()
+        # Models load on first use, once per process: with a process pool they only live in the workers
+        self.classifier = None
+        self.entity_extractor = None
+        self.mitre_mapper = None
+        self.cve_extractor = None
+        self.keywords = None
+
+    def load_models(self):
+        """Take the classifier, NER and mapping models from the process-wide registry"""
+        if self.classifier is None:
+            registry = get_model_registry()
+            self.classifier = registry.get("classifier")
+            self.entity_extractor = registry.get("entity_extractor")
+            self.mitre_mapper = registry.get("mitre_mapper")
+            self.cve_extractor = registry.get("cve_extractor")
+            self.keywords = registry.get("keywords")
 
     async def enrich_incident(self, incident_data: dict) -> dict:
         """
-        Enrich incident data with ML-powered intelligence
+        Enrich incident data with ML-powered intelligence, off the event loop
         input: dictionary of incident data
         output: enriched dictionary
         """
-        text = f"{incident_data.get('title', '')} {incident_data.get('description', '')}"
+        pools = get_worker_pools()
+        if pools.has_processes:
+            return await pools.run_process(enrich_in_worker, incident_data)
+        return await pools.run_thread(self.enrich_incident_sync, incident_data)
+
+    async def enrich_incidents(self, incidents: List[dict]) -> List[dict]:
+        """Enrich all incidents of a run, one chunk per worker process
+
+        Each chunk goes through spaCy with nlp.pipe instead of one nlp() call
+        per incident. Results keep the input order.
+        """
+        if not incidents:
+            return []
+        pools = get_worker_pools()
+        if not pools.has_processes:
+            return await pools.run_thread(self.enrich_incidents_sync, incidents)
+
+        size = -(-len(incidents) // pools.processes)
+        chunks = [incidents[i:i + size] for i in range(0, len(incidents), size)]
+        results = await asyncio.gather(*(pools.run_process(enrich_batch_in_worker, chunk) for chunk in chunks))
+        return [incident for chunk in results for incident in chunk]
+
+    def enrich_incidents_sync(self, incidents: List[dict]) -> List[dict]:
+        """Blocking batch enrichment: classify and parse every text in one pass, then enrich each"""
+        self.load_models()
+        texts = [AnalyzedText.from_incident(incident) for incident in incidents]
+        predictions = [None] * len(texts)
+        try:
+            predictions = self.classifier.predict_batch(texts)
+        except Exception as e:
+            # Per-incident classification still happens in enrich_incident_sync
+            logger.error(f"Enrichment error (batch classifier): {e}")
+        cve_details = None
+        try:
+            cve_details = self.cve_extractor.lookup_cves(
+                {cve_id for text in texts for cve_id in self.cve_extractor.extract_cves(text)}
+            )
+        except Exception as e:
+            logger.error(f"Enrichment error (batch CVE lookup): {e}")
+        try:
+            self.entity_extractor.parse_batch(texts)
+        except Exception as e:
+            # Per-incident parsing still happens in extract_entities
+            logger.error(f"Enrichment error (batch NER): {e}")
+        return [
+            self.enrich_incident_sync(incident, text, prediction, cve_details)
+            for incident, text, prediction in zip(incidents, texts, predictions)
+        ]
+
+    def enrich_incident_sync(self, incident_data: dict, text: Optional[AnalyzedText] = None,
+                             ml_result: Optional[dict] = None, cve_details: Optional[dict] = None) -> dict:
+        """Blocking enrichment, run in a worker process or thread"""
+        self.load_models()
+        # Normalized once: tokens, keyword hits and the spaCy Doc are shared by every stage
+        text = text or AnalyzedText.from_incident(incident_data)
 
-        # 1. ML Classification
+        # 1. ML Classification (precomputed for the whole batch by enrich_incidents_sync)
         try:
-            ml_result = self.classifier.predict(text)
+            ml_result = ml_result or self.classifier.predict(text)
             incident_data['ml_severity'] = ml_result['severity']
             incident_data['ml_confidence'] = ml_result['confidence']
             
@@ -45,60 +113,41 @@ class EnrichmentService:
         except Exception as e:
             logger.error(f"Enrichment error (mitre): {e}")
 
-        # 4. CVE Extraction & Scoring
+        # 4. IOC & CVE Extraction (one pass over the text) and Scoring
         try:
+            incident_data['iocs'] = text.iocs
             cve_ids = self.cve_extractor.extract_cves(text)
             incident_data['cve_ids'] = cve_ids
             
-            # For the first CVE found, we could fetch details (optional, could be slow)
-            # if cve_ids:
-            #     details = self.cve_extractor.fetch_cve_details(cve_ids[0])
-            #     if details:
-            #         incident_data['cvss_score'] = details['cvss_score']
+            # Highest CVSS score from the local NVD mirror (batch lookup from enrich_incidents_sync)
+            if cve_ids:
+                cvss_score = self.cve_extractor.max_cvss(cve_ids, cve_details)
+                if cvss_score is not None:
+                    incident_data['cvss_score'] = cvss_score
         except Exception as e:
             logger.error(f"Enrichment error (cve): {e}")
 
         # 5. Sector Tagging
         try:
-            incident_data['sector_tags'] = self._tag_sectors(text, incident_data.get('entities', {}))
+            incident_data['sector_tags'] = self._tag_sectors(text.hits, incident_data.get('entities', {}))
         except Exception as e:
             logger.error(f"Enrichment error (sector tagging): {e}")
 
         return incident_data
 
-    def _tag_sectors(self, text, entities):
-        """Identify which sectors are affected based on text and entities"""
-        text = text.lower()
-        sectors = []
-        
-        sector_map = {
-            "Banking & Finance": ['bank', 'finance', 'payment', 'atm', 'transaction', 'sbi', 'rbi', 'hdfc', 'icici'],
-            "Healthcare": ['hospital', 'medical', 'healthcare', 'patient', 'pharmaceutical', 'aiims'],
-            "Government": ['government', 'ministry', 'govt', 'public sector', 'nic', 'police', 'defense'],
-            "Technology": ['software', 'it', 'cloud', 'service provider', 'tech', 'saas', 'google', 'microsoft'],
-            "Critical Infrastructure": ['power', 'grid', 'water', 'energy', 'transportation', 'railway', 'airport'],
-            "E-commerce": ['retail', 'shopping', 'ecommerce', 'amazon', 'flipkart', 'order', 'customer']
-        }
+    def _tag_sectors(self, hits, entities):
+        """Identify which sectors are affected based on text keyword hits and entities"""
+        sectors = hits.labels("sectors")
 
-        # Check organizations first as they are strong indicators
-        orgs = [o.lower() for o in entities.get('organizations', [])]
-        
-        for sector, keywords in sector_map.items():
-            # Check keywords in text
-            if any(keyword in text for keyword in keywords):
-                sectors.append(sector)
-                continue
-            
-            # Check keywords in organizations
-            if any(keyword in org for org in orgs for keyword in keywords):
+        # Organizations are strong indicators even when the text alone is not
+        for org in entities.get('organizations', []):
+            for sector in self.keywords.scan(org).labels("sectors"):
                 if sector not in sectors:
                     sectors.append(sector)
 
         return sectors
 
 if __name__ == "__main__":
-    import asyncio
-    
     async def test():
         service = EnrichmentService()
         data = {
@@ -0,0 +1,177 @@
+"""
+Worker pools that keep CPU-bound and blocking work off the asyncio event loop
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Imported once by the forkserver so every worker forks with them loaded (the
+# API process itself only imports spaCy / scikit-learn if it enriches in threads)
+WORKER_PRELOAD = ["config", "src.services.enrichment_service", "src.ml.threat_classifier", "src.ml.entity_extractor"]
+
+# Per-process enrichment service, created by the worker initializer
+_worker_enrichment = None
+
+def _warm_start():
+    """Process pool initializer: load the ML models once per worker"""
+    global _worker_enrichment
+    from .enrichment_service import EnrichmentService
+
+    started = time.perf_counter()
+    _worker_enrichment = EnrichmentService()
+    _worker_enrichment.load_models()
+    logger.info(f"Worker {os.getpid()} warm in {time.perf_counter() - started:.1f}s")
+
+def _ping() -> int:
+    return os.getpid()
+
+def _model_stats() -> dict:
+    """The worker's model load times and resident memory"""
+    from ..ml.model_registry import get_model_registry
+    return get_model_registry().get_stats()
+
+def enrich_in_worker(incident_data: dict) -> dict:
+    """Enrich one incident with the worker's preloaded models"""
+    if _worker_enrichment is None:
+        _warm_start()
+    return _worker_enrichment.enrich_incident_sync(incident_data)
+
+def enrich_batch_in_worker(incidents: List[dict]) -> List[dict]:
+    """Enrich a chunk of incidents with the worker's preloaded models (NER via nlp.pipe)"""
+    if _worker_enrichment is None:
+        _warm_start()
+    return _worker_enrichment.enrich_incidents_sync(incidents)
+
+class WorkerPools:
+    """Process pool for parse / NLP-heavy work and a thread pool for light blocking calls
+
+    WORKER_PROCESSES=0 disables the process pool; CPU-bound work then runs in
+    the thread pool, which still keeps it off the event loop.
+    """
+
+    def __init__(self, processes: Optional[int] = None, threads: Optional[int] = None,
+                 start_method: Optional[str] = None):
+        self.processes = Config.WORKER_PROCESSES if processes is None else processes
+        self.threads = threads or Config.WORKER_THREADS
+        self.start_method = start_method or Config.WORKER_START_METHOD
+        self.process_pool: Optional[ProcessPoolExecutor] = None
+        self.thread_pool: Optional[ThreadPoolExecutor] = None
+        self.stats = {
+            "process": {"tasks": 0, "seconds": 0.0, "errors": 0},
+            "thread": {"tasks": 0, "seconds": 0.0, "errors": 0}
+        }
+        # Model stats reported by each worker process during warm_up(), by pid
+        self.worker_models: Dict[int, dict] = {}
+
+    def start(self):
+        """Create the pools; workers start on first use or in warm_up()"""
+        if self.thread_pool is None:
+            self.thread_pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="worker")
+        if self.process_pool is None and self.processes > 0:
+            context = multiprocessing.get_context(self.start_method)
+            if self.start_method == "forkserver":
+                # Never re-import __main__ (main.py would open MongoDB in every worker)
+                context.set_forkserver_preload(WORKER_PRELOAD)
+            self.process_pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=context,
+                initializer=_warm_start
+            )
+            logger.info(f"Worker pools started: {self.processes} processes ({self.start_method}), "
+                        f"{self.threads} threads")
+
+    async def warm_up(self):
+        """Load the models now so the first scrape does not pay for it
+
+        With a process pool every worker is started (its initializer loads the
+        models); otherwise the models are loaded into this process's registry
+        on a thread.
+        """
+        self.start()
+        started = time.perf_counter()
+        if not self.process_pool:
+            from ..ml.model_registry import get_model_registry
+            await self.run_thread(get_model_registry().warm_up)
+            logger.info(f"Models warm in {time.perf_counter() - started:.1f}s")
+            return
+        await self.collect_model_stats()
+        logger.info(f"Worker processes warm in {time.perf_counter() - started:.1f}s")
+
+    async def collect_model_stats(self) -> Dict[int, dict]:
+        """Ask the worker processes for their model stats
+
+        One request is sent per worker, but an idle worker may answer several,
+        so reports accumulate by pid across calls.
+        """
+        if not self.process_pool:
+            return self.worker_models
+        loop = asyncio.get_running_loop()
+        reports = await asyncio.gather(*(
+            loop.run_in_executor(self.process_pool, _model_stats) for _ in range(self.processes)
+        ))
+        for report in reports:
+            self.worker_models[report["pid"]] = report
+        return self.worker_models
+
+    @property
+    def has_processes(self) -> bool:
+        return self.processes > 0
+
+    async def _run(self, kind: str, executor, fn: Callable, *args) -> Any:
+        stats = self.stats[kind]
+        stats["tasks"] += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            stats["seconds"] += time.perf_counter() - started
+
+    async def run_process(self, fn: Callable, *args) -> Any:
+        """Run a picklable, module-level function in the process pool"""
+        self.start()
+        if not self.process_pool:
+            return await self._run("thread", self.thread_pool, fn, *args)
+        return await self._run("process", self.process_pool, fn, *args)
+
+    async def run_thread(self, fn: Callable, *args) -> Any:
+        """Run a blocking call in the thread pool"""
+        self.start()
+        return await self._run("thread", self.thread_pool, fn, *args)
+
+    def shutdown(self):
+        if self.process_pool:
+            self.process_pool.shutdown(wait=True, cancel_futures=True)
+            self.process_pool = None
+            self.worker_models = {}
+        if self.thread_pool:
+            self.thread_pool.shutdown(wait=True, cancel_futures=True)
+            self.thread_pool = None
+
+    def get_stats(self) -> Dict[str, dict]:
+        """Tasks run and seconds spent per pool"""
+        return {
+            kind: {**stats, "seconds": round(stats["seconds"], 3),
+                   "workers": self.processes if kind == "process" else self.threads}
+            for kind, stats in self.stats.items()
+        }
+
+_worker_pools: Optional[WorkerPools] = None
+
+def get_worker_pools() -> WorkerPools:
+    """Process-wide worker pools, started by the FastAPI lifespan"""
+    global _worker_pools
+    if _worker_pools is None:
+        _worker_pools = WorkerPools()
+    return _worker_pools
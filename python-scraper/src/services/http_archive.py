@@ -0,0 +1,145 @@
+"""
+Record / replay archive of HTTP responses for offline, reproducible runs
+"""
+
+import asyncio
+import base64
+import gzip
+import json
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from multidict import CIMultiDict
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+
+class HttpArchive:
+    """Responses (status, headers, body) keyed by request URL
+
+    Stored as gzip-compressed JSON lines. In record mode every live response is
+    captured, adding to what the archive already holds; in replay mode responses
+    are served from the archive after a simulated network latency.
+    """
+
+    def __init__(self, path: str = None, mode: str = RECORD,
+                 latency_ms: float = None, jitter_ms: float = None):
+        self.path = path or Config.HTTP_ARCHIVE_PATH
+        self.mode = mode
+        self.latency_ms = Config.HTTP_REPLAY_LATENCY_MS if latency_ms is None else latency_ms
+        self.jitter_ms = Config.HTTP_REPLAY_JITTER_MS if jitter_ms is None else jitter_ms
+        self.entries: Dict[str, dict] = {}
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    def load(self):
+        if not os.path.exists(self.path):
+            if self.replaying:
+                logger.warning(f"HTTP archive {self.path} not found, every request will miss")
+            return
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self.entries[entry["url"]] = entry
+        logger.info(f"Loaded {len(self.entries)} archived responses from {self.path}")
+
+    def record(self, url: str, result):
+        """Capture a fully-read response"""
+        entry = {
+            "url": url,
+            "final_url": result.url,
+            "status": result.status,
+            "headers": list(result.headers.items()),
+            "body": base64.b64encode(result.body).decode("ascii"),
+            "recorded_at": datetime.utcnow().isoformat()
+        }
+        with self._lock:
+            self.entries[url] = entry
+            self.stats["recorded"] += 1
+            self._dirty = True
+
+    def _lookup(self, url: str):
+        # Imported here to avoid a circular import with the HTTP client
+        from .http_client import FetchResult
+
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is None:
+                self.stats["misses"] += 1
+            else:
+                self.stats["replayed"] += 1
+
+        if entry is None:
+            logger.warning(f"No archived response for {url}")
+            return FetchResult(url=url, status=404)
+
+        return FetchResult(
+            url=entry.get("final_url", url),
+            status=entry["status"],
+            headers=CIMultiDict(entry["headers"]),
+            body=base64.b64decode(entry["body"])
+        )
+
+    def _delay(self) -> float:
+        jitter = random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    async def replay(self, url: str):
+        """Serve an archived response after the simulated latency"""
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return self._lookup(url)
+
+    def replay_blocking(self, url: str):
+        """Blocking variant for synchronous callers such as the NVD lookup"""
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        return self._lookup(url)
+
+    def save(self):
+        """Write the archive if new responses were recorded"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = list(self.entries.values())
+            self._dirty = False
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, self.path)
+        logger.info(f"Saved {len(entries)} archived responses to {self.path}")
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"mode": self.mode, "urls": len(self.entries), **self.stats}
+
+_archive: Optional[HttpArchive] = None
+
+def get_http_archive() -> Optional[HttpArchive]:
+    """Process-wide archive, or None when HTTP_ARCHIVE_MODE is off"""
+    global _archive
+    if _archive is None and Config.HTTP_ARCHIVE_MODE in (RECORD, REPLAY):
+        _archive = HttpArchive(mode=Config.HTTP_ARCHIVE_MODE)
+    return _archive
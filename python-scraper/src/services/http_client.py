@@ -0,0 +1,314 @@
+"""
+Shared, pooled HTTP client used by all scrapers
+"""
+
+import asyncio
+import logging
+import random
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Mapping, Optional
+
+import aiohttp
+from multidict import CIMultiDict
+
+from .http_archive import HttpArchive, get_http_archive
+from .rate_limiter import HostBackoffError, HostRateLimiter, get_rate_limiter
+from .validator_cache import PendingValidators, ValidatorCache
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 16 * 1024
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class HttpStatusError(Exception):
+    """Raised when a response has a non-success status code"""
+
+    def __init__(self, url: str, status: int):
+        super().__init__(f"HTTP {status} for {url}")
+        self.url = url
+        self.status = status
+
+@dataclass
+class FetchResult:
+    """Fully-read HTTP response"""
+
+    url: str
+    status: int
+    headers: Mapping[str, str] = field(default_factory=CIMultiDict)  # case-insensitive
+    body: bytes = b""
+    not_modified: bool = False  # 304, or same body digest as the last fetch
+    validators: Optional[PendingValidators] = None  # commit() once the content is saved
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300 or self.status == 304
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise HttpStatusError(self.url, self.status)
+
+    def text(self, encoding: Optional[str] = None) -> str:
+        """Decode the body using the declared charset, falling back to UTF-8"""
+        if not encoding:
+            content_type = self.headers.get("Content-Type", "")
+            for part in content_type.split(";"):
+                name, _, value = part.strip().partition("=")
+                if name.lower() == "charset" and value:
+                    encoding = value.strip('"')
+        try:
+            return self.body.decode(encoding or "utf-8", errors="replace")
+        except LookupError:
+            return self.body.decode("utf-8", errors="replace")
+
+@dataclass
+class StreamResult:
+    """HTTP response whose body is read incrementally via `chunks`"""
+
+    url: str
+    status: int
+    headers: Mapping[str, str]
+    chunks: AsyncIterator[bytes]
+    not_modified: bool = False
+    validators: Optional[PendingValidators] = None  # commit() once the content is saved
+
+async def _iter_bytes(body: bytes) -> AsyncIterator[bytes]:
+    for start in range(0, len(body), STREAM_CHUNK_SIZE):
+        yield body[start:start + STREAM_CHUNK_SIZE]
+
+class HttpClient:
+    """Process-wide aiohttp session with a tuned, keep-alive connection pool
+
+    One instance is owned by the FastAPI lifespan and handed to every scraper so
+    TCP/TLS connections and DNS lookups are reused across sources and runs.
+    With HTTP_ARCHIVE_MODE=record every response is also written to the HTTP
+    archive; with replay the archive answers instead of the network.
+    """
+
+    def __init__(self, validator_cache: Optional[ValidatorCache] = None,
+                 rate_limiter: Optional[HostRateLimiter] = None,
+                 archive: Optional[HttpArchive] = None):
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.archive = archive or get_http_archive()
+        self.validator_cache = validator_cache
+        if self.validator_cache is None and Config.HTTP_CACHE_ENABLED:
+            self.validator_cache = ValidatorCache()
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0
+        }
+
+    @property
+    def replaying(self) -> bool:
+        return self.archive is not None and self.archive.replaying
+
+    async def start(self):
+        """Open the pooled session"""
+        if self.replaying:
+            return
+        if self.session and not self.session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=Config.HTTP_POOL_LIMIT,
+            limit_per_host=Config.HTTP_POOL_LIMIT_PER_HOST,
+            use_dns_cache=True,
+            ttl_dns_cache=Config.HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=Config.HTTP_KEEPALIVE_TIMEOUT
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=Config.REQUEST_TIMEOUT),
+            headers={"User-Agent": Config.USER_AGENT},
+            trace_configs=[self._build_trace_config()]
+        )
+        logger.info("HTTP client started")
+
+    async def close(self):
+        """Close the session and its connection pool"""
+        self.save_state()
+        if self.session and not self.session.closed:
+            await self.session.close()
+            logger.info(f"HTTP client closed: {self.get_stats()}")
+        self.session = None
+
+    async def __aenter__(self) -> "HttpClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        """Count connection and DNS cache reuse via aiohttp tracing hooks"""
+        trace_config = aiohttp.TraceConfig()
+
+        def counter(key):
+            async def hook(session, context, params):
+                self.stats[key] += 1
+            return hook
+
+        trace_config.on_request_start.append(counter("requests"))
+        trace_config.on_connection_create_end.append(counter("connections_created"))
+        trace_config.on_connection_reuseconn.append(counter("connections_reused"))
+        trace_config.on_dns_cache_hit.append(counter("dns_cache_hits"))
+        trace_config.on_dns_cache_miss.append(counter("dns_cache_misses"))
+        return trace_config
+
+    async def _send(self, url: str, headers: Optional[Dict[str, str]]) -> aiohttp.ClientResponse:
+        """Send a rate-limited GET, retrying transient failures with jittered backoff
+
+        Connection errors, timeouts and 429/5xx responses are retried up to
+        HTTP_MAX_RETRIES times, unless a Retry-After exceeds MAX_RETRY_AFTER
+        (HostBackoffError). The caller must release the returned response.
+        """
+        if not self.session or self.session.closed:
+            await self.start()
+
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire(url)
+            try:
+                response = await self.session.get(url, headers=headers)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= Config.HTTP_MAX_RETRIES:
+                    raise
+                error = repr(e)
+            else:
+                if response.status in (429, 503):
+                    try:
+                        self.rate_limiter.apply_retry_after(url, response.headers.get("Retry-After"))
+                    except HostBackoffError:
+                        response.release()
+                        raise
+                if response.status not in RETRY_STATUSES or attempt >= Config.HTTP_MAX_RETRIES:
+                    return response
+                response.release()
+                error = f"HTTP {response.status}"
+
+            attempt += 1
+            self.stats["retries"] += 1
+            # Full jitter: spread retries so parallel sources don't retry in lockstep
+            delay = random.uniform(0, min(Config.HTTP_BACKOFF_MAX, Config.HTTP_BACKOFF_BASE * 2 ** attempt))
+            logger.info(f"Retrying {url} in {delay:.1f}s (attempt {attempt}/{Config.HTTP_MAX_RETRIES}): {error}")
+            await asyncio.sleep(delay)
+
+    def _conditional_cache(self, conditional: bool) -> Optional[ValidatorCache]:
+        # Recording needs full bodies, so never ask for a 304 then
+        if not conditional or (self.archive and not self.replaying):
+            return None
+        return self.validator_cache
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None,
+                    conditional: bool = False) -> FetchResult:
+        """GET a URL and read the whole body
+
+        With conditional=True the stored validators are sent and the result is
+        flagged not_modified when the server answers 304 or the body digest
+        matches the previous fetch, so callers can skip parsing it. The new
+        validators come back as result.validators and are only stored when
+        the caller commits them, after it has saved what the page held.
+        """
+        cache = self._conditional_cache(conditional)
+        if cache:
+            headers = {**cache.conditional_headers(url), **(headers or {})}
+
+        result = await self._get(url, headers)
+
+        if cache and result.status == 304:
+            cache.record_not_modified(url)
+            result.not_modified = True
+        elif cache and result.status == 200:
+            result.validators = cache.check(url, result.headers, result.body)
+            result.not_modified = result.validators.unchanged
+
+        return result
+
+    async def _get(self, url: str, headers: Optional[Dict[str, str]]) -> FetchResult:
+        """Read a whole response from the network or the archive, recording it if enabled"""
+        if self.replaying:
+            return await self.archive.replay(url)
+
+        async with await self._send(url, headers) as response:
+            result = FetchResult(
+                url=str(response.url),
+                status=response.status,
+                headers=CIMultiDict(response.headers),
+                body=await response.read()
+            )
+        if self.archive:
+            self.archive.record(url, result)
+        return result
+
+    @asynccontextmanager
+    async def stream(self, url: str, headers: Optional[Dict[str, str]] = None,
+                     conditional: bool = False):
+        """GET a URL and yield a StreamResult without reading the body up front
+
+        Leaving the context early stops the download. Conditional requests rely
+        on ETag / Last-Modified only, since no full-body digest is available.
+        """
+        cache = self._conditional_cache(conditional)
+        if cache:
+            headers = {**cache.conditional_headers(url), **(headers or {})}
+
+        if self.archive:
+            # Archived responses are stored whole, so read the body up front
+            fetched = await self._get(url, headers)
+            result = StreamResult(fetched.url, fetched.status, fetched.headers, _iter_bytes(fetched.body))
+            self._apply_stream_validators(cache, url, result)
+            yield result
+            return
+
+        async with await self._send(url, headers) as response:
+            result = StreamResult(
+                url=str(response.url),
+                status=response.status,
+                headers=CIMultiDict(response.headers),
+                chunks=response.content.iter_chunked(STREAM_CHUNK_SIZE)
+            )
+            self._apply_stream_validators(cache, url, result)
+            yield result
+
+    @staticmethod
+    def _apply_stream_validators(cache: Optional[ValidatorCache], url: str, result: StreamResult):
+        if cache and result.status == 304:
+            cache.record_not_modified(url)
+            result.not_modified = True
+        elif cache and result.status == 200:
+            result.validators = cache.check_headers(url, result.headers)
+
+    def save_state(self):
+        """Persist the validator cache and any recorded responses"""
+        if self.validator_cache:
+            self.validator_cache.save()
+        if self.archive:
+            self.archive.save()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Connection pool statistics"""
+        stats = dict(self.stats)
+        opened = stats["connections_created"] + stats["connections_reused"]
+        stats["connection_reuse_ratio"] = round(stats["connections_reused"] / opened, 3) if opened else 0.0
+        if self.validator_cache:
+            stats["validator_cache"] = self.validator_cache.get_stats()
+        stats["rate_limits"] = self.rate_limiter.get_stats()
+        if self.archive:
+            stats["archive"] = self.archive.get_stats()
+        return stats
+
+@asynccontextmanager
+async def use_http_client(client: Optional[HttpClient] = None):
+    """Yield the given shared client, or a temporary one closed on exit"""
+    if client is not None:
+        yield client
+        return
+
+    async with HttpClient() as temporary_client:
+        yield temporary_client
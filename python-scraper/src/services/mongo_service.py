@@ -81,6 +81,45 @@ class MongoService:
             logger.error(f"Failed to save incident: {e}")
             return False
     
+    def get_existing_urls(self, urls: List[str]) -> set:
+        """Return the subset of URLs already stored, using a single query"""
+        if not urls:
+            return set()
+        try:
+            cursor = self.collection.find({"url": {"$in": list(urls)}}, {"url": 1, "_id": 0})
+            return {doc["url"] for doc in cursor}
+        except Exception as e:
+            logger.error(f"Failed to look up existing URLs: {e}")
+            return set()
+    
+    def get_existing_hashes(self, hashes: List[str]) -> set:
+        """Return the subset of incident hashes already stored, using a single query"""
+        if not hashes:
+            return set()
+        try:
+            cursor = self.collection.find({"hash": {"$in": list(hashes)}}, {"hash": 1, "_id": 0})
+            return {doc["hash"] for doc in cursor}
+        except Exception as e:
+            logger.error(f"Failed to look up existing hashes: {e}")
+            return set()
+    
+    def get_recent_source_keys(self, source: str, limit: int = 200) -> tuple[set, set]:
+        """Return (hashes, urls) of the most recent incidents stored for a source"""
+        try:
+            cursor = self.collection.find(
+                {"source": source}, {"hash": 1, "url": 1, "_id": 0}
+            ).sort("published_date", -1).limit(limit)
+            hashes, urls = set(), set()
+            for doc in cursor:
+                if doc.get("hash"):
+                    hashes.add(doc["hash"])
+                if doc.get("url"):
+                    urls.add(doc["url"])
+            return hashes, urls
+        except Exception as e:
+            logger.error(f"Failed to look up recent incidents for {source}: {e}")
+            return set(), set()
+    
     def save_incidents_batch(self, incidents: List[IncidentModel]) -> int:
         """Save multiple incidents in batch"""
         try:
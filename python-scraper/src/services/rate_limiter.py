@@ -0,0 +1,159 @@
+"""
+Per-host token-bucket rate limiting for outbound requests
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class HostBackoffError(Exception):
+    """Raised when a host asked us to back off for longer than MAX_RETRY_AFTER"""
+
+    def __init__(self, host: str, seconds: float):
+        super().__init__(f"{host} asked us to back off for {seconds:.0f}s (more than MAX_RETRY_AFTER)")
+        self.host = host
+        self.seconds = seconds
+
+class TokenBucket:
+    """Token bucket allowing `capacity` requests per `window` seconds
+
+    Tokens may go negative: each caller reserves a slot and is told how long to
+    wait for it, which keeps callers in FIFO order without a background task.
+    """
+
+    def __init__(self, capacity: int, window: float, now: float):
+        self.capacity = max(1, capacity)
+        self.rate = self.capacity / max(window, 1e-9)  # tokens per second
+        self.tokens = float(self.capacity)
+        self.updated = now
+        self.blocked_until = 0.0
+
+    def reserve(self, now: float) -> float:
+        """Take one token and return the seconds to wait before using it"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+class HostRateLimiter:
+    """Token bucket per host, shared by async scrapers and blocking callers
+
+    A Retry-After pauses the host for as long as it asks. When that is more
+    than max_retry_after, the response and every request to the host until
+    the pause ends raise HostBackoffError instead of waiting.
+    """
+
+    def __init__(self, requests: Optional[int] = None, window: Optional[float] = None,
+                 overrides: Optional[Dict[str, Tuple[int, float]]] = None,
+                 clock: Callable[[], float] = time.monotonic, max_retry_after: Optional[float] = None):
+        self.requests = requests or Config.RATE_LIMIT_REQUESTS
+        self.window = window or Config.RATE_LIMIT_WINDOW
+        self.max_retry_after = Config.MAX_RETRY_AFTER if max_retry_after is None else max_retry_after
+        self.overrides = Config.get_rate_limit_overrides() if overrides is None else overrides
+        self.clock = clock
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.stats: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return (urlparse(url).hostname or url).lower()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            requests, window = self.overrides.get(host, (self.requests, self.window))
+            bucket = self.buckets[host] = TokenBucket(requests, window, self.clock())
+            self.stats[host] = {"requests": 0, "throttled": 0, "wait_seconds": 0.0, "retry_after": 0}
+        return bucket
+
+    def reserve(self, url: str) -> float:
+        """Reserve a request slot for the URL's host and return the wait in seconds"""
+        host = self.host_of(url)
+        with self._lock:
+            bucket = self._bucket(host)
+            now = self.clock()
+            if bucket.blocked_until - now > self.max_retry_after:
+                raise HostBackoffError(host, bucket.blocked_until - now)
+            wait = bucket.reserve(now)
+            stats = self.stats[host]
+            stats["requests"] += 1
+            if wait > 0:
+                stats["throttled"] += 1
+                stats["wait_seconds"] += wait
+        if wait > 0:
+            logger.debug(f"Rate limit: waiting {wait:.2f}s for {host}")
+        return wait
+
+    async def acquire(self, url: str):
+        """Wait asynchronously until a request to the URL's host is allowed"""
+        wait = self.reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def acquire_blocking(self, url: str):
+        """Blocking variant for synchronous callers such as the NVD lookup"""
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+
+    def apply_retry_after(self, url: str, retry_after: Optional[str]):
+        """Pause a host for the duration given by a Retry-After header
+
+        Raises HostBackoffError if the pause is longer than max_retry_after.
+        """
+        delay = self._parse_retry_after(retry_after)
+        if delay is None:
+            return
+
+        host = self.host_of(url)
+        with self._lock:
+            bucket = self._bucket(host)
+            bucket.blocked_until = max(bucket.blocked_until, self.clock() + delay)
+            self.stats[host]["retry_after"] += 1
+        logger.warning(f"{host} asked us to back off for {delay:.0f}s")
+        if delay > self.max_retry_after:
+            raise HostBackoffError(host, delay)
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-After is either delta-seconds or an HTTP-date"""
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def get_stats(self) -> Dict[str, dict]:
+        """Per-host request counts and time spent waiting"""
+        with self._lock:
+            return {
+                host: {**stats, "wait_seconds": round(stats["wait_seconds"], 3)}
+                for host, stats in self.stats.items()
+            }
+
+_rate_limiter: Optional[HostRateLimiter] = None
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Process-wide limiter shared by every outbound request"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = HostRateLimiter()
+    return _rate_limiter
@@ -0,0 +1,31 @@
+"""
+Small JSON files used to persist scraper state between runs
+"""
+
+import json
+import logging
+import os
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+def load_json_state(path: str, default: Any) -> Any:
+    """Load JSON state from disk, returning default when missing or unreadable"""
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable state file {path}: {e}")
+        return default
+
+def save_json_state(path: str, data: Any):
+    """Atomically write JSON state to disk"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, default=str)
+    os.replace(tmp_path, path)
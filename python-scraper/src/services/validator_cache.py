@@ -0,0 +1,114 @@
+"""
+Persistent HTTP validator cache for conditional GET requests
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Mapping
+
+from .state_store import load_json_state, save_json_state
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PendingValidators:
+    """Validators of a fresh response, stored only once its content has been used
+
+    A scraper commits them after the source's incidents are saved. If the run
+    fails, times out or cannot parse the page, the old validators stay and the
+    next run fetches and parses the page again instead of getting a 304.
+    """
+
+    cache: "ValidatorCache"
+    url: str
+    entry: dict
+    unchanged: bool = False  # same body digest as the stored entry
+
+    def commit(self):
+        """Store the validators and persist the cache"""
+        self.cache.entries[self.url] = self.entry
+        self.cache._dirty = True
+        self.cache.save()
+
+class ValidatorCache:
+    """ETag / Last-Modified / body digest per URL, kept across restarts
+
+    Servers that honour validators answer 304 and the body is never sent. For
+    servers that ignore them the body digest is compared instead, so an
+    unchanged page is still not re-parsed. New validators are returned as
+    PendingValidators rather than stored straight away.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or Config.HTTP_CACHE_PATH
+        self.entries: Dict[str, dict] = load_json_state(self.path, {})
+        self.stats = {
+            "not_modified": 0,
+            "digest_matches": 0,
+            "bytes_saved": 0,
+            "parses_saved": 0
+        }
+        self._dirty = False
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Request headers that let the server answer 304 Not Modified"""
+        entry = self.entries.get(url)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record_not_modified(self, url: str):
+        """Account for a 304 response"""
+        entry = self.entries.get(url, {})
+        self.stats["not_modified"] += 1
+        self.stats["bytes_saved"] += entry.get("length", 0)
+        self.stats["parses_saved"] += 1
+
+    def check(self, url: str, headers: Mapping[str, str], body: bytes) -> PendingValidators:
+        """Validators for a fresh response, flagged unchanged if its body digest matches"""
+        digest = hashlib.sha256(body).hexdigest()
+        unchanged = self.entries.get(url, {}).get("digest") == digest
+
+        if unchanged:
+            self.stats["digest_matches"] += 1
+            self.stats["parses_saved"] += 1
+
+        return PendingValidators(self, url, {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "digest": digest,
+            "length": len(body),
+            "checked_at": datetime.utcnow().isoformat()
+        }, unchanged)
+
+    def check_headers(self, url: str, headers: Mapping[str, str]) -> PendingValidators:
+        """Validators for a streamed response whose body is not fully read"""
+        return PendingValidators(self, url, {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "digest": None,
+            "length": int(headers.get("Content-Length") or 0),
+            "checked_at": datetime.utcnow().isoformat()
+        })
+
+    def save(self):
+        """Persist the cache if anything changed"""
+        if not self._dirty:
+            return
+        try:
+            save_json_state(self.path, self.entries)
+            self._dirty = False
+        except OSError as e:
+            logger.error(f"Failed to save HTTP validator cache: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"urls": len(self.entries), **self.stats}
@@ -0,0 +1,133 @@
+"""
+Per-source crawl watermarks so runs only process new content
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from .state_store import load_json_state, save_json_state
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class WatermarkStore:
+    """Last published date and recent hashes / URLs per source
+
+    Persisted in DATA_DIR/watermarks.json. The recent lists are bounded by
+    WATERMARK_MAX_RECENT and mirrored in sets for constant-time lookups.
+    """
+
+    def __init__(self, path: str = None, max_recent: int = None):
+        self.path = path or Config.WATERMARK_PATH
+        self.max_recent = max_recent or Config.WATERMARK_MAX_RECENT
+        self.sources: Dict[str, dict] = load_json_state(self.path, {})
+        self._hashes: Dict[str, set] = {}
+        self._urls: Dict[str, set] = {}
+        for source, mark in self.sources.items():
+            self._index(source, mark)
+        self._dirty = False
+
+    def _index(self, source: str, mark: dict):
+        self._hashes[source] = set(mark.get("recent_hashes", []))
+        self._urls[source] = set(mark.get("recent_urls", []))
+
+    def has(self, source: str) -> bool:
+        return source in self.sources
+
+    def seed(self, source: str, hashes: Iterable[str], urls: Iterable[str]):
+        """Initialise a source that has no watermark yet (e.g. from MongoDB)"""
+        if self.has(source):
+            return
+        mark = {
+            "last_published": None,
+            "recent_hashes": list(hashes)[:self.max_recent],
+            "recent_urls": list(urls)[:self.max_recent],
+            "updated_at": datetime.utcnow().isoformat(),
+            "last_run_new": 0
+        }
+        self.sources[source] = mark
+        self._index(source, mark)
+        self._dirty = True
+
+    def seed_from(self, source: str, mongo_service):
+        """Seed a missing watermark from the most recent stored incidents"""
+        if not self.has(source):
+            hashes, urls = mongo_service.get_recent_source_keys(source, limit=self.max_recent)
+            self.seed(source, hashes, urls)
+
+    def is_known(self, source: str, content_hash: Optional[str] = None, url: Optional[str] = None,
+                 listing_url: Optional[str] = None) -> bool:
+        """Whether an item was seen before, by hash or by URL
+
+        An item whose URL is the listing page's own (it had no link of its
+        own) is matched by hash only; otherwise every link-less item of the
+        source would count as known.
+        """
+        if url == listing_url:
+            url = None
+        return (content_hash in self._hashes.get(source, ())) or (url is not None and url in self._urls.get(source, ()))
+
+    def last_published(self, source: str) -> Optional[datetime]:
+        value = self.sources.get(source, {}).get("last_published")
+        return datetime.fromisoformat(value) if value else None
+
+    def advance(self, source: str, incidents: list, listing_url: Optional[str] = None):
+        """Record a run's new incidents (newest first) for a source
+
+        The listing URL, which link-less incidents carry as their URL, is not
+        added to the URL index.
+        """
+        mark = self.sources.setdefault(source, {
+            "last_published": None,
+            "recent_hashes": [],
+            "recent_urls": [],
+        })
+        new_hashes = dict.fromkeys(i.hash for i in incidents if i.hash not in self._hashes.get(source, ()))
+        new_urls = dict.fromkeys(i.url for i in incidents
+                                 if i.url and i.url != listing_url and i.url not in self._urls.get(source, ()))
+        mark["recent_hashes"] = (list(new_hashes) + mark["recent_hashes"])[:self.max_recent]
+        mark["recent_urls"] = (list(new_urls) + mark["recent_urls"])[:self.max_recent]
+
+        dates = [i.published_date for i in incidents if i.published_date]
+        previous = self.last_published(source)
+        if dates:
+            latest = max(d.replace(tzinfo=None) for d in dates)
+            if previous is None or latest > previous:
+                mark["last_published"] = latest.isoformat()
+
+        mark["updated_at"] = datetime.utcnow().isoformat()
+        mark["last_run_new"] = len(incidents)
+        self._index(source, mark)
+        self._dirty = True
+
+    def save(self):
+        """Persist watermarks if anything changed"""
+        if not self._dirty:
+            return
+        try:
+            save_json_state(self.path, self.sources)
+            self._dirty = False
+        except OSError as e:
+            logger.error(f"Failed to save crawl watermarks: {e}")
+
+    def get_summary(self) -> Dict[str, dict]:
+        """Watermark state per source, without the hash lists"""
+        return {
+            source: {
+                "last_published": mark.get("last_published"),
+                "recent_items": len(mark.get("recent_hashes", [])),
+                "updated_at": mark.get("updated_at"),
+                "last_run_new": mark.get("last_run_new", 0)
+            }
+            for source, mark in self.sources.items()
+        }
+
+_watermark_store: Optional[WatermarkStore] = None
+
+def get_watermark_store() -> WatermarkStore:
+    """Process-wide watermark store shared by all scrapers"""
+    global _watermark_store
+    if _watermark_store is None:
+        _watermark_store = WatermarkStore()
+    return _watermark_store
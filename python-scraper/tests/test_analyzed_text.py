@@ -0,0 +1,57 @@
+import unittest
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ml.analyzed_text import AnalyzedText
+from src.ml.entity_extractor import EntityExtractor
+from src.ml.gazetteer import get_gazetteer
+from src.ml.mitre_mapper import MitreMapper
+
+INCIDENT = {
+    "title": "LockBit ransomware hits Indian hospital",
+    "description": "Attackers used a phishing email and an RCE flaw in VMware ESXi to encrypt patient records."
+}
+
+class CountingNlp:
+    """Stand-in for a spaCy pipeline that counts how often it parses"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        return type("Doc", (), {"ents": []})()
+
+class TestAnalyzedText(unittest.TestCase):
+    def test_views_are_computed_once(self):
+        text = AnalyzedText.from_incident(INCIDENT)
+        self.assertIs(text.tokens, text.tokens)
+        self.assertIs(text.hits, text.hits)
+        self.assertEqual(text.tokens[:3], ["lockbit", "ransomware", "hits"])
+        self.assertIs(AnalyzedText.of(text), text)
+
+    def test_spacy_doc_is_shared(self):
+        text = AnalyzedText.from_incident(INCIDENT)
+        nlp = CountingNlp()
+        self.assertIs(text.doc(nlp), text.doc(nlp))
+        self.assertEqual(nlp.calls, 1)
+
+    def test_stages_accept_analyzed_text(self):
+        text = AnalyzedText.from_incident(INCIDENT)
+        extractor = EntityExtractor.__new__(EntityExtractor)
+        extractor.nlp = CountingNlp()
+        extractor.gazetteer = get_gazetteer()
+
+        entities = extractor.extract_entities(text)
+        self.assertEqual(entities["threat_actors"], ["LockBit"])
+        self.assertEqual(entities["technologies"], ["VMware"])
+
+        techniques = [t["id"] for t in MitreMapper().map_techniques(text)]
+        self.assertEqual(techniques, ["T1566", "T1190", "T1486"])
+        self.assertEqual(techniques, [t["id"] for t in MitreMapper().map_techniques(text.text)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import hashlib
+import sys
+import os
+from contextlib import asynccontextmanager
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ml.keyword_engine import get_keyword_engine
+from src.scrapers.cert_in_scraper import CertInScraper
+from src.scrapers.date_parser import DateParser
+from src.services.http_client import FetchResult, StreamResult
+from src.services.watermark_store import WatermarkStore
+
+BASE_URL = "https://www.cert-in.org.in"
+
+class FakeClient:
+    """Serves canned bodies and records requested URLs"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    async def fetch(self, url, headers=None, conditional=False):
+        self.requested.append(url)
+        return FetchResult(url=url, status=200, body=self.pages.get(url, b""))
+
+    @asynccontextmanager
+    async def stream(self, url, headers=None, conditional=False):
+        self.requested.append(url)
+        body = self.pages.get(url, b"")
+
+        async def chunks():
+            for i in range(0, len(body), 32):
+                yield body[i:i + 32]
+
+        yield StreamResult(url=url, status=200, headers={}, chunks=chunks())
+
+class FakeMongo:
+    def __init__(self, urls=(), hashes=()):
+        self.urls = set(urls)
+        self.hashes = set(hashes)
+
+    def get_recent_source_keys(self, source, limit=200):
+        return self.hashes, self.urls
+
+    def get_existing_urls(self, urls):
+        return self.urls.intersection(urls)
+
+def make_scraper(mongo):
+    # Bypass __init__ so no MongoDB connection or ML models are needed
+    scraper = CertInScraper.__new__(CertInScraper)
+    scraper.base_url = BASE_URL
+    scraper.rss_url = f"{BASE_URL}/rss.xml"
+    scraper.source_name = "CERT-In"
+    scraper.dates = DateParser()
+    scraper.keywords = get_keyword_engine()
+    scraper.watermarks = WatermarkStore(path=os.path.join(os.path.dirname(__file__), "missing-watermarks.json"))
+    scraper.mongo_service = mongo
+    return scraper
+
+def advisory_url(n):
+    return f"{BASE_URL}/advisory/CIAD-2026-{n:04d}"
+
+class TestCertInWebFallback(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        links = "".join(f'<a href="/advisory/CIAD-2026-{n:04d}">Advisory {n}</a>' for n in range(1, 4))
+        self.pages = {f"{BASE_URL}/advisories": f"<html><body>{links}</body></html>".encode()}
+        for n in range(1, 4):
+            self.pages[advisory_url(n)] = (
+                f"<html><body><h1>Critical vulnerability advisory {n}</h1>"
+                f"<div class='content'>Patch now</div></body></html>"
+            ).encode()
+
+    async def test_fetches_only_new_advisories(self):
+        client = FakeClient(self.pages)
+        scraper = make_scraper(FakeMongo([advisory_url(1), advisory_url(3)]))
+
+        incidents = await scraper._scrape_web_page(client)
+
+        self.assertEqual([i.url for i in incidents], [advisory_url(2)])
+        self.assertEqual(client.requested, [f"{BASE_URL}/advisories", advisory_url(2)])
+
+    async def test_all_known_costs_one_request(self):
+        client = FakeClient(self.pages)
+        scraper = make_scraper(FakeMongo([advisory_url(n) for n in range(1, 4)]))
+
+        incidents = await scraper._scrape_web_page(client)
+
+        self.assertEqual(incidents, [])
+        self.assertEqual(len(client.requested), 1)
+
+def rss_item(n):
+    return (
+        f"<item><title>Vulnerability in product {n}</title><description>Patch {n}</description>"
+        f"<link>{advisory_url(n)}</link><pubDate>Tue, 13 Oct 2026 10:00:00 GMT</pubDate></item>"
+    )
+
+def item_hash(n):
+    return hashlib.md5(f"Vulnerability in product {n}Patch {n}{advisory_url(n)}".encode()).hexdigest()
+
+class TestCertInRssFeed(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        items = "".join(rss_item(n) for n in range(5, 0, -1))
+        self.pages = {f"{BASE_URL}/rss.xml": f"<rss><channel>{items}</channel></rss>".encode()}
+
+    async def test_stops_at_first_known_item(self):
+        scraper = make_scraper(FakeMongo(hashes=[item_hash(3)]))
+
+        incidents = await scraper._scrape_rss_feed(FakeClient(self.pages))
+
+        self.assertEqual([i.url for i in incidents], [advisory_url(5), advisory_url(4)])
+        self.assertEqual(incidents[0].hash, item_hash(5))
+
+    async def test_nothing_new_returns_none(self):
+        scraper = make_scraper(FakeMongo(urls=[advisory_url(5)]))
+
+        self.assertIsNone(await scraper._scrape_rss_feed(FakeClient(self.pages)))
+
+if __name__ == '__main__':
+    unittest.main()
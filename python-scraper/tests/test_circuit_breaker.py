@@ -0,0 +1,63 @@
+import unittest
+import tempfile
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.services.circuit_breaker import CircuitBreakerRegistry
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+class TestCircuitBreakerRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "breakers.json")
+        self.clock = FakeClock()
+        self.breakers = self.make_registry()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_registry(self):
+        return CircuitBreakerRegistry(path=self.path, failure_threshold=2, reset_timeout=60, clock=self.clock)
+
+    def test_opens_after_threshold_and_probes_once(self):
+        self.breakers.record_failure("Threat Post", "timed out")
+        self.assertTrue(self.breakers.allow("Threat Post"))
+        self.breakers.record_failure("Threat Post", "timed out")
+        self.assertFalse(self.breakers.allow("Threat Post"))
+
+        self.clock.now += 61
+        self.assertTrue(self.breakers.allow("Threat Post"))
+        self.assertEqual(self.breakers.state("Threat Post"), "half_open")
+        # Only one probe at a time
+        self.assertFalse(self.breakers.allow("Threat Post"))
+
+        self.breakers.record_success("Threat Post")
+        self.assertEqual(self.breakers.state("Threat Post"), "closed")
+        self.assertTrue(self.breakers.allow("Threat Post"))
+
+    def test_failed_probe_reopens_and_state_persists(self):
+        for _ in range(2):
+            self.breakers.record_failure("Threat Post", "no articles matched")
+        self.clock.now += 61
+        self.assertTrue(self.breakers.allow("Threat Post"))
+        self.breakers.record_failure("Threat Post", "no articles matched")
+        self.breakers.save()
+
+        reloaded = self.make_registry()
+        self.assertFalse(reloaded.allow("Threat Post"))
+        summary = reloaded.get_summary()["Threat Post"]
+        self.assertEqual(summary["state"], "open")
+        self.assertEqual(summary["retry_in_seconds"], 60)
+        self.assertEqual(summary["last_error"], "no articles matched")
+
+if __name__ == '__main__':
+    unittest.main()
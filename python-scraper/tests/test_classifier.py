@@ -5,11 +5,16 @@ import os
 # Add src to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import numpy as np
+
+from src.ml.analyzed_text import AnalyzedText
 from src.ml.threat_classifier import ThreatClassifier
 
 class TestThreatClassifier(unittest.TestCase):
     def setUp(self):
         self.classifier = ThreatClassifier()
+        # The sklearn pipeline the compact arrays were exported from
+        self.reference = ThreatClassifier(use_arrays=False)
 
     def test_critical_prediction(self):
         text = "CRITICAL: Zero-day exploit detected in core infrastructure allowing full remote code execution."
@@ -28,5 +33,41 @@ class TestThreatClassifier(unittest.TestCase):
         self.assertGreaterEqual(result["confidence"], 0.0)
         self.assertLessEqual(result["confidence"], 100.0)
 
+    def test_shared_tokens_match_pipeline(self):
+        # The TF-IDF row built from AnalyzedText tokens must equal the vectorizer's own
+        if self.classifier.vectorizer is None:
+            self.skipTest("model does not use the default TF-IDF tokenization")
+        text = "Ransomware gang's zero-day hits AIIMS servers; CERT-In issues advisory (CVE-2026-1234)."
+        expected = self.reference.pipeline.steps[0][1].transform([text]).toarray()
+        actual = self.classifier._tfidf_row(AnalyzedText(text).tokens).toarray()
+        self.assertTrue(np.allclose(expected, actual))
+        self.assertEqual(self.classifier.predict(text)["severity"], self.reference.pipeline.predict([text])[0])
+
+    def test_predict_batch_matches_predict(self):
+        texts = [
+            "CRITICAL: Zero-day exploit detected in core infrastructure allowing full remote code execution.",
+            "Phishing attack targeting bank employees.",
+            "",
+            "Data breach exposes Aadhaar records of millions"
+        ]
+        results = self.classifier.predict_batch(texts)
+        self.assertEqual(results, [self.classifier.predict(text) for text in texts])
+        if self.reference.pipeline is not None:
+            self.assertEqual([r["severity"] for r in results], list(self.reference.pipeline.predict(texts)))
+        self.assertEqual(self.classifier.predict_batch([]), [])
+
+    def test_compact_model_matches_pipeline(self):
+        if self.classifier.compact is None or self.reference.pipeline is None:
+            self.skipTest("no exported compact model")
+        texts = [
+            "Ransomware attack cripples hospital systems; patients diverted",
+            "Minor defacement of a municipal website, restored within hours",
+            "CERT-In warns of actively exploited remote code execution flaw in VPN appliances"
+        ]
+        tokens = [AnalyzedText(text).tokens for text in texts]
+        self.assertTrue(np.allclose(self.classifier.estimator.predict_proba(self.classifier._tfidf_matrix(tokens)),
+                                    self.reference.pipeline.predict_proba(texts)))
+        self.assertEqual(self.classifier.predict_batch(texts), self.reference.predict_batch(texts))
+
 if __name__ == '__main__':
     unittest.main()
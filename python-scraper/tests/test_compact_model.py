@@ -0,0 +1,88 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from src.ml.analyzed_text import AnalyzedText
+from src.ml.compact_model import CompactModel, export_compact_model
+from src.ml.threat_classifier import ThreatClassifier
+
+TEXTS = [
+    "Ransomware gang encrypts hospital servers and demands payment",
+    "Phishing campaign targets bank customers with fake KYC messages",
+    "Critical remote code execution flaw exploited in VPN appliances",
+    "Data breach exposes Aadhaar numbers of pensioners",
+    "Website defacement reported on a municipal portal",
+    "DDoS attack disrupts online banking for several hours",
+    "Routine patch release fixes low severity bugs",
+    "Zero-day exploit chain used against government email servers"
+]
+LABELS = ["Critical", "Medium", "Critical", "High", "Low", "High", "Low", "Critical"]
+UNSEEN = [
+    "Hospital ransomware attack: exploit used against VPN servers",
+    "Fake KYC phishing messages target pensioners",
+    "",
+    "Nothing in this sentence is in the vocabulary"
+]
+
+class TestCompactModel(unittest.TestCase):
+    def export_and_load(self, pipeline, labels=LABELS):
+        pipeline.fit(TEXTS, labels)
+        tmp_dir = tempfile.mkdtemp()
+        model_path = os.path.join(tmp_dir, "model.joblib")
+        joblib.dump(pipeline, model_path)
+        export_compact_model(pipeline, os.path.join(tmp_dir, "model_arrays"))
+        compact = ThreatClassifier(model_path=model_path)
+        self.assertIsNotNone(compact.compact)
+        self.assertIsNone(compact.pipeline)
+        return compact
+
+    def assertMatchesPipeline(self, compact, pipeline):
+        self.assertTrue(np.allclose(compact._tfidf_matrix([AnalyzedText(text).tokens for text in UNSEEN]).toarray(),
+                                    pipeline.steps[0][1].transform(UNSEEN).toarray()))
+        results = compact.predict_batch(UNSEEN)
+        probabilities = pipeline.predict_proba(UNSEEN)
+        self.assertEqual([r["severity"] for r in results], list(pipeline.predict(UNSEEN)))
+        self.assertEqual([r["confidence"] for r in results],
+                         [round(float(p), 2) for p in probabilities.max(axis=1) * 100])
+
+    def test_multiclass_matches_pipeline(self):
+        pipeline = Pipeline([
+            ('tfidf', TfidfVectorizer(stop_words='english', ngram_range=(1, 2))),
+            ('clf', LogisticRegression(class_weight='balanced', max_iter=1000))
+        ])
+        self.assertMatchesPipeline(self.export_and_load(pipeline), pipeline)
+
+    def test_binary_sublinear_l1_matches_pipeline(self):
+        pipeline = Pipeline([
+            ('tfidf', TfidfVectorizer(sublinear_tf=True, norm='l1')),
+            ('clf', LogisticRegression(max_iter=1000))
+        ])
+        labels = ["Critical" if label == "Critical" else "Other" for label in LABELS]
+        self.assertMatchesPipeline(self.export_and_load(pipeline, labels), pipeline)
+
+    def test_arrays_are_memory_mapped(self):
+        pipeline = Pipeline([('tfidf', TfidfVectorizer()), ('clf', LogisticRegression())])
+        compact = self.export_and_load(pipeline).compact
+        for array in (compact.terms, compact.idf_, compact.coef_):
+            self.assertIsInstance(array, np.memmap)
+        self.assertEqual(compact.vocabulary_, pipeline.steps[0][1].vocabulary_)
+
+    def test_missing_or_unsupported_export(self):
+        self.assertIsNone(CompactModel.load(tempfile.mkdtemp()))
+        custom = Pipeline([('tfidf', TfidfVectorizer(token_pattern=r"\S+")), ('clf', LogisticRegression())])
+        custom.fit(TEXTS, LABELS)
+        with self.assertRaises(ValueError):
+            export_compact_model(custom, tempfile.mkdtemp())
+
+if __name__ == '__main__':
+    unittest.main()
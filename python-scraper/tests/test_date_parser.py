@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scrapers.date_parser import DateParser, ISO, RELATIVE
+
+NOW = datetime(2026, 10, 16, 12, 0, 0)
+
+class TestDateParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = DateParser(now=lambda: NOW)
+
+    def test_fast_paths_return_naive_utc(self):
+        self.assertEqual(self.parser.parse("2026-10-13T08:00:00Z", "a"), datetime(2026, 10, 13, 8))
+        self.assertEqual(self.parser.parse("2026-10-13T13:30:00+05:30", "a"), datetime(2026, 10, 13, 8))
+        self.assertEqual(self.parser.parse("Tue, 13 Oct 2026 10:00:00 GMT", "b"), datetime(2026, 10, 13, 10))
+        self.assertEqual(self.parser.parse("Tue, 13 Oct 2026 10:00:00 +0530", "b"), datetime(2026, 10, 13, 4, 30))
+
+    def test_rfc822_zone_names(self):
+        # Same instant as "+0530" and as the listing format "13 Oct 2026 10:00 IST"
+        self.assertEqual(self.parser.parse("Tue, 13 Oct 2026 10:00:00 IST", "b"), datetime(2026, 10, 13, 4, 30))
+        self.assertEqual(self.parser.parse("Tue, 13 Oct 2026 10:00:00 UTC", "b"), datetime(2026, 10, 13, 10, 0))
+        self.assertEqual(self.parser.sources["b"]["format"], "rfc822")
+
+    def test_relative_dates(self):
+        self.assertEqual(self.parser.parse("2 hours ago", "a"), NOW - timedelta(hours=2))
+        self.assertEqual(self.parser.parse("Posted an hour ago", "a"), NOW - timedelta(hours=1))
+        self.assertEqual(self.parser.parse("Yesterday", "a"), NOW - timedelta(days=1))
+        self.assertEqual(self.parser.get_summary()["a"]["format"], RELATIVE)
+
+    def test_listing_formats(self):
+        self.assertEqual(self.parser.parse("Oct 13, 2026", "a"), datetime(2026, 10, 13))
+        self.assertEqual(self.parser.parse("Published on: October 3rd, 2026", "b"), datetime(2026, 10, 3))
+        self.assertEqual(self.parser.parse("13 Oct 2026 15:30 IST", "c"), datetime(2026, 10, 13, 10, 0))
+
+    def test_learns_format_per_source(self):
+        for day in range(1, 6):
+            self.parser.parse(f"{day:02d}/10/2026", "site")
+        self.parser.parse("2026-10-13T08:00:00", "other")
+
+        summary = self.parser.get_summary()
+        self.assertEqual(summary["site"]["format"], "%d/%m/%Y")
+        self.assertEqual(summary["site"]["learned_hit_rate"], 0.8)
+        self.assertEqual(summary["other"]["format"], ISO)
+
+    def test_reports_unparseable_dates(self):
+        self.parser.parse("Oct 13, 2026", "site")
+        self.assertIsNone(self.parser.parse("by Staff Writer", "site"))
+        self.assertIsNone(self.parser.parse("", "site"))
+
+        summary = self.parser.get_summary()["site"]
+        self.assertEqual(summary["unparseable"], 2)
+        self.assertEqual(summary["unparseable_rate"], 0.667)
+        self.assertEqual(summary["format"], "%b %d, %Y")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import asyncio
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.models.incident import IncidentModel
+from src.scrapers.news_scraper import NewsScraper
+from src.services.dedup_gate import DedupGate
+
+def incident(n):
+    return IncidentModel(
+        title=f"Incident {n}", description="", url=f"https://example.com/{n}",
+        published_date=datetime(2026, 10, 1), source="Example", category="News",
+        severity="Low", hash=f"hash-{n}"
+    )
+
+class FakeStore:
+    """Stored hashes, with the bulk lookups counted"""
+
+    def __init__(self, hashes):
+        self.hashes = set(hashes)
+        self.lookups = 0
+        self.saved = []
+
+    def get_existing_hashes(self, hashes):
+        self.lookups += 1
+        return {h for h in hashes if h in self.hashes}
+
+    def save_incident(self, data):
+        self.saved.append(data["hash"])
+        return True
+
+class FakeEnrichment:
+    def __init__(self):
+        self.enriched = []
+
+    async def enrich_incidents(self, incidents):
+        self.enriched.extend(i["hash"] for i in incidents)
+        return incidents
+
+class TestDedupGate(unittest.TestCase):
+    def test_known_and_repeated_incidents_are_dropped(self):
+        store = FakeStore(["hash-1", "hash-3"])
+        gate = DedupGate(store)
+
+        new = gate.filter([incident(n) for n in (1, 2, 3, 2, 4)])
+        self.assertEqual([i.hash for i in new], ["hash-2", "hash-4"])
+        self.assertEqual(store.lookups, 1)
+
+        summary = gate.get_summary()
+        self.assertEqual((summary["known"], summary["duplicates"], summary["passed"]), (2, 1, 2))
+        self.assertEqual(summary["enrichment_skipped"], 3)
+        self.assertEqual(summary["enrichment_skipped_rate"], 0.6)
+
+    def test_empty_run_skips_the_lookup(self):
+        store = FakeStore([])
+        self.assertEqual(DedupGate(store).filter([]), [])
+        self.assertEqual(store.lookups, 0)
+
+    def test_only_new_incidents_reach_enrichment(self):
+        store = FakeStore(["hash-1"])
+        scraper = NewsScraper.__new__(NewsScraper)
+        scraper.mongo_service = store
+        scraper.enrichment_service = FakeEnrichment()
+        scraper.dedup = DedupGate(store)
+
+        saved = asyncio.run(scraper._save_incidents([incident(1), incident(2)]))
+        self.assertEqual(saved, 1)
+        self.assertEqual(scraper.enrichment_service.enriched, ["hash-2"])
+        self.assertEqual(store.saved, ["hash-2"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import sys
+import os
+
+import spacy
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ml.analyzed_text import AnalyzedText
+from src.ml.entity_extractor import EntityExtractor
+from src.ml.gazetteer import get_gazetteer
+
+TEXTS = [
+    "Microsoft warned that the Lazarus Group is targeting banks in India",
+    "CERT-In reports phishing against Infosys employees in Bengaluru",
+    "",
+    "Patch Tuesday fixes an Exchange flaw exploited by APT38"
+]
+
+def make_extractor():
+    """Extractor over a blank pipeline with rule-based NER (no model download needed)"""
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns([
+        {"label": "ORG", "pattern": "Microsoft"},
+        {"label": "ORG", "pattern": "Infosys"},
+        {"label": "GPE", "pattern": "India"},
+        {"label": "GPE", "pattern": "Bengaluru"}
+    ])
+    extractor = EntityExtractor.__new__(EntityExtractor)
+    extractor.nlp = nlp
+    extractor.gazetteer = get_gazetteer()
+    extractor.stats = {"docs": 0, "seconds": 0.0}
+    return extractor
+
+class TestEntityExtractorBatch(unittest.TestCase):
+    def test_batch_matches_single(self):
+        extractor = make_extractor()
+        single = [extractor.extract_entities(text) for text in TEXTS]
+        self.assertEqual(extractor.extract_entities_batch(TEXTS), single)
+        self.assertEqual(single[0]["organizations"], ["Microsoft"])
+        self.assertEqual(single[1]["locations"], ["Bengaluru"])
+
+    def test_batch_reuses_parsed_docs(self):
+        extractor = make_extractor()
+        parsed = AnalyzedText(TEXTS[0])
+        doc = parsed.doc(extractor.nlp)
+
+        texts = extractor.parse_batch([parsed, TEXTS[1], TEXTS[2]], batch_size=2)
+        self.assertIs(texts[0], parsed)
+        self.assertIs(texts[0].doc(extractor.nlp), doc)
+        self.assertTrue(texts[1].has_doc)
+        self.assertFalse(texts[2].has_doc)  # empty text is never parsed
+        self.assertEqual(extractor.get_throughput()["docs"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import asyncio
+import os
+import sys
+import threading
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.services.executor import WorkerPools, _ping
+
+def current_thread_name():
+    return threading.current_thread().name
+
+def fail():
+    raise RuntimeError("boom")
+
+class TestWorkerPools(unittest.TestCase):
+    def test_thread_pool_runs_off_the_event_loop(self):
+        pools = WorkerPools(processes=0, threads=2)
+
+        async def run():
+            return await pools.run_thread(current_thread_name), threading.current_thread().name
+
+        try:
+            worker, loop_thread = asyncio.run(run())
+        finally:
+            pools.shutdown()
+        self.assertTrue(worker.startswith("worker"))
+        self.assertNotEqual(worker, loop_thread)
+        self.assertEqual(pools.get_stats()["thread"]["tasks"], 1)
+
+    def test_process_work_falls_back_to_threads_without_processes(self):
+        pools = WorkerPools(processes=0, threads=1)
+        try:
+            pid = asyncio.run(pools.run_process(_ping))
+        finally:
+            pools.shutdown()
+        self.assertEqual(pid, os.getpid())
+        self.assertEqual(pools.get_stats()["process"]["tasks"], 0)
+        self.assertEqual(pools.get_stats()["thread"]["tasks"], 1)
+
+    def test_errors_are_counted_and_raised(self):
+        pools = WorkerPools(processes=0, threads=1)
+        try:
+            with self.assertRaises(RuntimeError):
+                asyncio.run(pools.run_thread(fail))
+        finally:
+            pools.shutdown()
+        self.assertEqual(pools.get_stats()["thread"]["errors"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scrapers.feed_parser import StreamingFeedParser, iter_feed_items
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>CERT-In</title>
+<item><title>Multiple vulnerabilities in Apache</title>
+<description><![CDATA[Remote <b>code</b> execution]]></description>
+<link>https://www.cert-in.org.in/a1</link>
+<pubDate>Tue, 13 Oct 2026 10:00:00 GMT</pubDate><guid>a1</guid></item>
+<item><title>Phishing campaign &amp; advisory</title>
+<description>Users targeted</description>
+<link>https://www.cert-in.org.in/a2</link></item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Example</title>
+<entry><title>Ransomware hits hospital</title>
+<link rel="self" href="https://example.com/self"/>
+<link rel="alternate" href="https://example.com/post-1"/>
+<updated>2026-10-14T08:00:00Z</updated><published>2026-10-13T08:00:00Z</published>
+<id>tag:example.com,2026:1</id><summary>Systems encrypted</summary></entry>
+</feed>"""
+
+async def chunked(data, size):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+class TestStreamingFeedParser(unittest.IsolatedAsyncioTestCase):
+    def test_rss_items_emitted_as_they_complete(self):
+        parser = StreamingFeedParser()
+        split = RSS.index(b"</item>") + len(b"</item>")
+
+        first = parser.feed(RSS[:split])
+        rest = parser.feed(RSS[split:]) + parser.close()
+
+        self.assertEqual([i.title for i in first], ["Multiple vulnerabilities in Apache"])
+        self.assertEqual(first[0].description, "Remote <b>code</b> execution")
+        self.assertEqual(first[0].published, "Tue, 13 Oct 2026 10:00:00 GMT")
+        self.assertEqual([i.title for i in rest], ["Phishing campaign & advisory"])
+        self.assertEqual(rest[0].link, "https://www.cert-in.org.in/a2")
+
+    async def test_atom_entry(self):
+        items = [item async for item in iter_feed_items(chunked(ATOM, 7))]
+
+        self.assertEqual(len(items), 1)
+        self.assertEqual(items[0].link, "https://example.com/post-1")
+        self.assertEqual(items[0].published, "2026-10-13T08:00:00Z")
+        self.assertEqual(items[0].description, "Systems encrypted")
+        self.assertEqual(items[0].guid, "tag:example.com,2026:1")
+
+    async def test_stopping_early_leaves_stream_unread(self):
+        consumed = []
+
+        async def tracked():
+            async for chunk in chunked(RSS, 64):
+                consumed.append(chunk)
+                yield chunk
+
+        async for item in iter_feed_items(tracked()):
+            break
+
+        self.assertLess(sum(len(c) for c in consumed), len(RSS))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ml.entity_extractor import EntityExtractor
+from src.ml.gazetteer import Gazetteer, get_gazetteer
+
+ACTORS = {
+    "version": "test",
+    "kind": "threat_actors",
+    "patterns": ["apt\\d+"],
+    "entries": {
+        "Lazarus Group": ["lazarus", "apt38", "apt 38", "hidden cobra"],
+        "Cozy Bear": ["apt29", "midnight blizzard"]
+    }
+}
+TECH = {
+    "version": "test",
+    "kind": "technologies",
+    "entries": {"Windows": ["windows"], "Windows Server": ["windows server"], "AWS": ["aws", "amazon web services"]}
+}
+
+class TestGazetteer(unittest.TestCase):
+    def setUp(self):
+        self.gazetteer = Gazetteer()
+        self.gazetteer.add_file(ACTORS)
+        self.gazetteer.add_file(TECH)
+
+    def test_aliases_map_to_canonical_names(self):
+        found = self.gazetteer.match("APT38, also tracked as HIDDEN COBRA, and APT-29 (Midnight Blizzard)")
+        self.assertEqual(found["threat_actors"], ["Lazarus Group", "Cozy Bear"])
+
+    def test_whole_words_only(self):
+        found = self.gazetteer.match("Lazaruses and awsome windowsill")
+        self.assertEqual(found, {"threat_actors": [], "technologies": []})
+
+    def test_longest_alias_wins(self):
+        found = self.gazetteer.match("Windows Server hosts on Amazon Web Services and Windows laptops")
+        self.assertEqual(found["technologies"], ["Windows Server", "AWS", "Windows"])
+
+    def test_patterns_catch_unlisted_names(self):
+        found = self.gazetteer.match("Apt41 and APT38 were both active")
+        self.assertEqual(found["threat_actors"], ["APT41", "Lazarus Group"])
+
+    def test_ordinary_words_need_a_qualifier(self):
+        gazetteer = get_gazetteer()
+        prose = "Monsoon floods and zinc prices add to a patchwork of barium rules"
+        self.assertEqual(gazetteer.match(prose)["threat_actors"], [])
+        found = gazetteer.match("The Patchwork APT, also called the Monsoon group, phished officials")
+        self.assertEqual(found["threat_actors"], ["Patchwork"])
+
+    def test_packaged_gazetteers_load_with_versions(self):
+        gazetteer = get_gazetteer()
+        self.assertEqual(set(gazetteer.versions), {"threat_actors", "technologies"})
+        self.assertIn("Lazarus Group", gazetteer.match("APT38 strikes again")["threat_actors"])
+
+class TestEntityExtractorGazetteer(unittest.TestCase):
+    def test_gazetteer_entities_without_spacy_model(self):
+        extractor = EntityExtractor.__new__(EntityExtractor)
+        extractor.nlp = None
+        extractor.gazetteer = get_gazetteer()
+        entities = extractor.extract_entities("Sodinokibi operators exploit FortiGate VPN flaws")
+        self.assertEqual(entities["threat_actors"], ["REvil"])
+        self.assertEqual(entities["technologies"], ["Fortinet", "VPN"])
+        self.assertEqual(entities["organizations"], [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scrapers.html_backend import BACKENDS, LexborHTMLParser, get_html_backend
+
+PAGE = """<html><head><meta charset="windows-1252"></head><body>
+<div class="post"><h2 class="title"><a href="/a?x=1&amp;y=2">Caf\xe9 breach <!-- c --><b>exposed</b></a></h2>
+<p>Attackers <script>track()</script>leaked data<style>.x{}</style></p>
+<div class="post"><a href="/nested">Nested post</a></div></div>
+</body></html>""".encode("cp1252")
+
+def extract(backend):
+    document = backend.parse(PAGE)
+    rows = []
+    for post in backend.select(document, ".post"):
+        link = backend.select_one(post, "a")
+        paragraph = backend.select_one(post, "p")
+        rows.append((
+            backend.text(link),
+            backend.attr(link, "href"),
+            backend.text(paragraph) if paragraph is not None else None,
+            len(backend.select(post, ".post")),
+            backend.select_one(post, ".post") is not None
+        ))
+    return rows
+
+class TestHtmlBackends(unittest.TestCase):
+    def test_soup_fields(self):
+        self.assertEqual(extract(get_html_backend("soup")), [
+            ("Café breach exposed", "/a?x=1&y=2", "Attackers leaked data", 1, True),
+            ("Nested post", "/nested", None, 0, False)
+        ])
+
+    @unittest.skipIf(LexborHTMLParser is None, "selectolax not installed")
+    def test_selectolax_matches_soup(self):
+        self.assertEqual(extract(get_html_backend("selectolax")), extract(get_html_backend("soup")))
+
+    def test_unknown_backend(self):
+        self.assertIn("soup", BACKENDS)
+        with self.assertRaises(ValueError):
+            get_html_backend("regex")
+
+if __name__ == '__main__':
+    unittest.main()
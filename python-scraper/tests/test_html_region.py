@@ -0,0 +1,75 @@
+import unittest
+import tempfile
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scrapers.html_backend import get_html_backend
+from src.scrapers.html_region import extract_region, strip_non_text, with_charset
+from src.scrapers.news_scraper import NewsScraper
+from src.scrapers.selector_memory import SelectorMemory
+
+PAGE = b"""<html><head><meta charset="windows-1252"><script>var s = '<div class="feed">';</script>
+<style>.feed { color: red }</style></head><body>
+<nav><div class="menu"><a href="/">Home</a></div></nav>
+<DIV class="wide feed" id="main-list"><div class="item"><div><a href="/a">Ransomware hits bank</a></div></div>
+<div class="item"><a href="/b">Phishing wave in Delhi</a></div></div>
+<div class="feed-footer">More</div>
+</body></html>"""
+
+class TestHtmlRegion(unittest.TestCase):
+    def test_strip_non_text(self):
+        stripped = strip_non_text(PAGE)
+        self.assertNotIn(b"var s", stripped)
+        self.assertNotIn(b"color: red", stripped)
+        self.assertIn(b"Ransomware", stripped)
+
+    def test_region_forms(self):
+        body = strip_non_text(PAGE)
+        for container in (".feed", "div.feed", "#main-list", "div#main-list"):
+            region = extract_region(body, container)
+            self.assertTrue(region.startswith(b'<DIV class="wide feed"'), container)
+            self.assertTrue(region.endswith(b"</div>"), container)
+            self.assertIn(b"Phishing wave", region)
+            self.assertNotIn(b"More", region)
+        self.assertIsNone(extract_region(body, ".missing"))
+        self.assertIn(b"Home", extract_region(body, "nav"))
+
+    def test_unsupported_container(self):
+        with self.assertRaises(ValueError):
+            extract_region(PAGE, ".feed .item")
+
+    def test_charset_is_carried_over(self):
+        self.assertTrue(with_charset(PAGE, b"<div></div>").startswith(b'<meta charset="windows-1252">'))
+        self.assertEqual(with_charset(b'<meta charset="utf-8"><div></div>', b"<div></div>"), b"<div></div>")
+
+class TestListingContainer(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.scraper = NewsScraper.__new__(NewsScraper)
+        self.scraper.html = get_html_backend()
+        self.scraper.selectors = SelectorMemory(os.path.join(self.tmp_dir.name, "selectors.json"))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def source(self, container):
+        return {"name": "Example", "container": container, "selectors": {"articles": ".item"}}
+
+    def test_parses_only_the_container(self):
+        articles = self.scraper._listing_articles(PAGE, self.source(".feed"))
+        self.assertEqual(len(articles), 2)
+        stats = self.scraper.selectors.get_summary()["Example"]["container"]
+        self.assertEqual(stats["hit_rate"], 1.0)
+
+    def test_falls_back_to_whole_page(self):
+        articles = self.scraper._listing_articles(PAGE, self.source("main"))
+        self.assertEqual(len(articles), 2)
+        stats = self.scraper.selectors.get_summary()["Example"]["container"]
+        self.assertEqual(stats["configured"], "main")
+        self.assertEqual(stats["misses"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+import asyncio
+import unittest
+import tempfile
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aiohttp import web
+from src.services.http_archive import HttpArchive
+from src.services.http_client import HttpClient
+from src.services.validator_cache import ValidatorCache
+from config import Config
+
+PAGE = b"<html><body><div class='post'>Ransomware hits bank</div></body></html>"
+
+class LocalServerTestCase(unittest.IsolatedAsyncioTestCase):
+    """Runs a throwaway aiohttp server on localhost"""
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp_dir.name, "http_cache.json")
+        self.hits = {"etag": 0, "plain": 0, "flaky": 0}
+
+        async def with_etag(request):
+            self.hits["etag"] += 1
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304)
+            return web.Response(body=PAGE, headers={"ETag": '"v1"'})
+
+        async def ignores_validators(request):
+            self.hits["plain"] += 1
+            return web.Response(body=PAGE)
+
+        async def flaky(request):
+            self.hits["flaky"] += 1
+            if self.hits["flaky"] < 3:
+                return web.Response(status=503)
+            return web.Response(body=PAGE)
+
+        app = web.Application()
+        app.router.add_get("/flaky", flaky)
+        app.router.add_get("/etag", with_etag)
+        app.router.add_get("/plain", ignores_validators)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+        self.tmp_dir.cleanup()
+
+    def make_client(self, **kwargs):
+        return HttpClient(validator_cache=ValidatorCache(self.cache_path), **kwargs)
+
+class TestHttpClient(LocalServerTestCase):
+    async def test_connections_are_reused(self):
+        async with self.make_client() as client:
+            for _ in range(3):
+                result = await client.fetch(f"{self.base_url}/plain")
+                self.assertEqual(result.body, PAGE)
+            stats = client.get_stats()
+
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["connections_created"], 1)
+        self.assertEqual(stats["connections_reused"], 2)
+
+    async def test_etag_gives_not_modified_across_restarts(self):
+        url = f"{self.base_url}/etag"
+        async with self.make_client() as client:
+            first = await client.fetch(url, conditional=True)
+        self.assertFalse(first.not_modified)
+        first.validators.commit()  # the scraper saved the page's incidents
+
+        # A new client reloads the cache from disk
+        async with self.make_client() as client:
+            second = await client.fetch(url, conditional=True)
+            stats = client.get_stats()["validator_cache"]
+
+        self.assertEqual(second.status, 304)
+        self.assertTrue(second.not_modified)
+        self.assertEqual(stats["bytes_saved"], len(PAGE))
+        self.assertEqual(stats["parses_saved"], 1)
+
+    async def test_body_digest_fallback(self):
+        url = f"{self.base_url}/plain"
+        async with self.make_client() as client:
+            first = await client.fetch(url, conditional=True)
+            first.validators.commit()
+            second = await client.fetch(url, conditional=True)
+            unconditional = await client.fetch(url)
+            stats = client.get_stats()["validator_cache"]
+
+        self.assertFalse(first.not_modified)
+        self.assertTrue(second.not_modified)
+        self.assertFalse(unconditional.not_modified)
+        self.assertEqual(stats["digest_matches"], 1)
+
+    async def test_uncommitted_validators_are_not_stored(self):
+        # The run failed before saving: the next run must get the page again
+        url = f"{self.base_url}/etag"
+        async with self.make_client() as client:
+            first = await client.fetch(url, conditional=True)
+        async with self.make_client() as client:
+            second = await client.fetch(url, conditional=True)
+
+        self.assertIsNotNone(first.validators)
+        self.assertEqual(second.status, 200)
+        self.assertFalse(second.not_modified)
+        self.assertEqual(self.hits["etag"], 2)
+
+class TestHttpClientRetries(LocalServerTestCase):
+    def setUp(self):
+        self._saved = (Config.HTTP_MAX_RETRIES, Config.HTTP_BACKOFF_BASE)
+        Config.HTTP_BACKOFF_BASE = 0.001
+
+    def tearDown(self):
+        Config.HTTP_MAX_RETRIES, Config.HTTP_BACKOFF_BASE = self._saved
+
+    async def test_transient_errors_are_retried(self):
+        Config.HTTP_MAX_RETRIES = 2
+        async with self.make_client() as client:
+            result = await client.fetch(f"{self.base_url}/flaky")
+            stats = client.get_stats()
+
+        self.assertEqual(result.body, PAGE)
+        self.assertEqual(self.hits["flaky"], 3)
+        self.assertEqual(stats["retries"], 2)
+
+    async def test_gives_up_after_max_retries(self):
+        Config.HTTP_MAX_RETRIES = 1
+        async with self.make_client() as client:
+            result = await client.fetch(f"{self.base_url}/flaky")
+
+        self.assertEqual(result.status, 503)
+        self.assertEqual(self.hits["flaky"], 2)
+
+class TestHttpArchive(LocalServerTestCase):
+    async def test_record_then_replay_without_network(self):
+        archive_path = os.path.join(self.tmp_dir.name, "archive.jsonl.gz")
+        url = f"{self.base_url}/etag"
+
+        recorder = HttpArchive(archive_path, mode="record", latency_ms=0)
+        async with self.make_client(archive=recorder) as client:
+            recorded = await client.fetch(url, conditional=True)
+        self.assertEqual(recorded.body, PAGE)
+
+        await self.runner.cleanup()  # no server from here on
+
+        replayer = HttpArchive(archive_path, mode="replay", latency_ms=20)
+        async with self.make_client(archive=replayer) as client:
+            started = asyncio.get_running_loop().time()
+            replayed = await client.fetch(url)
+            elapsed = asyncio.get_running_loop().time() - started
+            async with client.stream(url) as response:
+                streamed = b"".join([chunk async for chunk in response.chunks])
+            missing = await client.fetch(f"{self.base_url}/never-recorded")
+
+        self.assertEqual(replayed.status, 200)
+        self.assertEqual(replayed.body, PAGE)
+        self.assertEqual(replayed.headers["etag"], '"v1"')
+        self.assertEqual(streamed, PAGE)
+        self.assertGreaterEqual(elapsed, 0.015)
+        self.assertEqual(missing.status, 404)
+        self.assertEqual(replayer.get_stats()["replayed"], 2)
+        self.assertEqual(replayer.get_stats()["misses"], 1)
+        self.assertEqual(self.hits["etag"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
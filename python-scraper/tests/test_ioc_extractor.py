@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ml.analyzed_text import AnalyzedText
+from src.ml.cve_extractor import CveExtractor
+from src.ml.ioc_extractor import IocExtractor, refang
+
+ADVISORY = """Attackers exploited CVE-2021-44228 (and cve-2021-44228) to fetch hxxps://update-check[.]evil[.]ru/p.exe
+and http://192.168.1[.]10:8080/stage2, then beaconed to 45.33.32[.]156, 2001:db8::1 and c2(.)attacker[.]com
+at 10:30:45 UTC. Contact admin@phish.co.in. Drops payload.exe and config.js (e.g. build 1.2.3.4.5).
+MD5 D41D8CD98F00B204E9800998ECF8427E, SHA1 da39a3ee5e6b4b0d3255bfef95601890afd80709,
+SHA256 e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855."""
+
+class TestIocExtractor(unittest.TestCase):
+    def setUp(self):
+        self.iocs = IocExtractor().extract(ADVISORY)
+
+    def test_refanged_network_indicators(self):
+        self.assertEqual(self.iocs["urls"], ["https://update-check.evil.ru/p.exe", "http://192.168.1.10:8080/stage2"])
+        self.assertEqual(self.iocs["domains"], ["update-check.evil.ru", "c2.attacker.com", "phish.co.in"])
+        self.assertEqual(self.iocs["ipv4"], ["192.168.1.10", "45.33.32.156"])
+        self.assertEqual(self.iocs["ipv6"], ["2001:db8::1"])  # 10:30:45 is a time
+
+    def test_hashes_and_cves_are_normalized_and_deduplicated(self):
+        self.assertEqual(self.iocs["md5"], ["d41d8cd98f00b204e9800998ecf8427e"])
+        self.assertEqual(self.iocs["sha1"], ["da39a3ee5e6b4b0d3255bfef95601890afd80709"])
+        self.assertEqual(self.iocs["sha256"], ["e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"])
+        self.assertEqual(self.iocs["cves"], ["CVE-2021-44228"])
+
+    def test_no_false_positives_in_prose(self):
+        iocs = IocExtractor().extract("Install payload.exe, e.g. version 1.2.3.4.5, via Node.js at 10:30:45.")
+        self.assertEqual(sum(len(values) for values in iocs.values()), 0)
+
+    def test_extension_like_tlds_need_context(self):
+        iocs = IocExtractor().extract("Run install.sh and deploy.pl on ASP.NET or asp.net servers; it.is done")
+        self.assertEqual(iocs["domains"], [])
+        iocs = IocExtractor().extract("Payload from evil[.]sh and http://tool.sh/x")
+        self.assertEqual(iocs["domains"], ["evil.sh", "tool.sh"])
+
+    def test_sentences_joined_without_a_space_are_not_domains(self):
+        iocs = IocExtractor().extract("Data of 2 lakh users.In a statement, the bank said.De facto control was lost")
+        self.assertEqual(iocs["domains"], [])
+        iocs = IocExtractor().extract("Phishing from sbi-kyc.in, Example.COM and users[.]In")
+        self.assertEqual(iocs["domains"], ["sbi-kyc.in", "example.com", "users.in"])
+
+    def test_version_strings_are_not_addresses(self):
+        iocs = IocExtractor().extract("Fixed in version 10.2.3.4 and build 6.1.76.2")
+        self.assertEqual(iocs["ipv4"], [])
+        iocs = IocExtractor().extract("Fixed in version 10.2.3.4, C2 at 45.33.32[.]156 and 45.33.32.157")
+        self.assertEqual(iocs["ipv4"], ["45.33.32.156", "45.33.32.157"])
+
+    def test_ids_inside_urls(self):
+        text = ("Details: https://nvd.nist.gov/vuln/detail/CVE-2021-44228 and "
+                "hxxps://www.virustotal[.]com/gui/file/e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855")
+        iocs = IocExtractor().extract(text)
+        self.assertEqual(iocs["cves"], ["CVE-2021-44228"])
+        self.assertEqual(iocs["sha256"], ["e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"])
+        # Both CVE paths agree
+        extractor = CveExtractor.__new__(CveExtractor)
+        self.assertEqual(extractor.extract_cves(AnalyzedText(text)), extractor.extract_cves(text))
+
+    def test_refang(self):
+        self.assertEqual(refang("hxxps[:]//evil[dot]com"), "https://evil.com")
+
+    def test_cve_extractor_reuses_the_ioc_pass(self):
+        text = AnalyzedText(ADVISORY)
+        extractor = CveExtractor.__new__(CveExtractor)
+        self.assertEqual(extractor.extract_cves(text), ["CVE-2021-44228"])
+        self.assertEqual(extractor.extract_cves(ADVISORY), ["CVE-2021-44228"])
+        self.assertIs(text.iocs, text.iocs)
+
+if __name__ == '__main__':
+    unittest.main()
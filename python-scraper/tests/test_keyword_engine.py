@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ml import keyword_engine
+from src.ml.keyword_engine import KeywordEngine
+
+RULES = {
+    "_comment": "ignored",
+    "severity": {
+        "Critical": ["critical", "zero-day"],
+        "High": ["high", "ransomware"]
+    },
+    "tags": {
+        "ransomware": ["ransomware", "ransom"],
+        "breach": ["breach", "data breach"],
+        "technology": [{"term": "it", "word": True}, "cloud"]
+    }
+}
+
+class TestKeywordEngine(unittest.TestCase):
+    def engines(self):
+        yield "default", KeywordEngine(RULES)
+        with mock.patch.object(keyword_engine, "ahocorasick", None):
+            yield "pure python", KeywordEngine(RULES)
+
+    def test_overlapping_keywords_all_match(self):
+        for name, engine in self.engines():
+            with self.subTest(engine=name):
+                hits = engine.scan("Massive DATA BREACH after ransomware attack")
+                self.assertEqual(hits.labels("tags"), ["ransomware", "breach"])
+                self.assertEqual(hits.first("severity"), "High")
+
+    def test_first_label_follows_rule_order(self):
+        for name, engine in self.engines():
+            with self.subTest(engine=name):
+                hits = engine.scan("High-risk zero-day exploited")
+                self.assertEqual(hits.first("severity"), "Critical")
+                self.assertEqual(engine.scan("routine update").first("severity", "Low"), "Low")
+
+    def test_word_boundary_keywords(self):
+        for name, engine in self.engines():
+            with self.subTest(engine=name):
+                self.assertFalse(engine.scan("security bulletin").has("tags", "technology"))
+                self.assertTrue(engine.scan("Indian IT firm hit").has("tags", "technology"))
+                self.assertTrue(engine.scan("it.").has("tags", "technology"))
+
+    def test_substring_keywords_match_inside_words(self):
+        for name, engine in self.engines():
+            with self.subTest(engine=name):
+                hits = engine.scan("Ransomed files")
+                self.assertTrue(hits.has("tags"))
+                self.assertEqual(hits.labels("tags"), ["ransomware"])
+                self.assertFalse(hits.has("severity"))
+
+    def test_packaged_rules_load(self):
+        engine = keyword_engine.get_keyword_engine()
+        hits = engine.scan("Phishing campaign targets SBI customers in Mumbai")
+        self.assertTrue(hits.has("news.cyber"))
+        self.assertTrue(hits.has("news.india", "india"))
+        self.assertEqual(hits.first("news.category"), "Fraud")
+        self.assertIn("Banking & Finance", hits.labels("sectors"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import asyncio
+import os
+import sys
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ml import model_registry
+from src.ml.model_registry import ModelRegistry
+from src.services.executor import WorkerPools
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.loads = []
+
+        def load_model():
+            self.loads.append("model")
+            return object()
+
+        self.registry = ModelRegistry({"model": load_model, "other": dict})
+
+    def test_models_load_lazily_and_once(self):
+        self.assertFalse(self.registry.is_loaded("model"))
+        first = self.registry.get("model")
+        self.assertIs(self.registry.get("model"), first)
+        self.assertEqual(self.loads, ["model"])
+        self.assertFalse(self.registry.is_loaded("other"))
+
+    def test_stats_report_load_time_and_memory(self):
+        stats = self.registry.warm_up(["model"])
+        self.assertEqual(stats["pid"], os.getpid())
+        self.assertTrue(stats["models"]["model"]["loaded"])
+        self.assertIn("load_seconds", stats["models"]["model"])
+        self.assertIn("rss_mb", stats["models"]["model"])
+        self.assertEqual(stats["models"]["other"], {"loaded": False})
+
+    def test_unknown_model(self):
+        with self.assertRaises(KeyError):
+            self.registry.get("missing")
+
+    def test_warm_up_without_processes_loads_in_this_process(self):
+        pools = WorkerPools(processes=0, threads=1)
+        registry = ModelRegistry({"model": object})
+        previous, model_registry._model_registry = model_registry._model_registry, registry
+        try:
+            asyncio.run(pools.warm_up())
+        finally:
+            model_registry._model_registry = previous
+            pools.shutdown()
+        self.assertTrue(registry.is_loaded("model"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,222 @@
+import asyncio
+import unittest
+import tempfile
+import sys
+import os
+from datetime import datetime
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ml.keyword_engine import get_keyword_engine
+from src.scrapers.date_parser import DateParser
+from src.scrapers.html_backend import get_html_backend
+from src.scrapers.news_scraper import NewsScraper
+from src.scrapers.selector_memory import SelectorMemory
+from src.services.backfill_checkpoints import BackfillCheckpoints
+from src.services.circuit_breaker import CircuitBreakerRegistry
+from src.services.http_client import FetchResult
+from src.services.rate_limiter import HostBackoffError
+from config import Config
+
+def make_scraper(sources):
+    # Bypass __init__ so no MongoDB connection or ML models are needed
+    scraper = NewsScraper.__new__(NewsScraper)
+    scraper.sources = sources
+    scraper.http_client = object()  # never used by the fake _scrape_source
+    scraper.html = get_html_backend()
+    scraper.selectors = SelectorMemory(path=os.path.join(tempfile.gettempdir(), "unused-selectors.json"))
+    scraper.selectors.save = lambda: None
+    scraper.dates = DateParser()
+    scraper.keywords = get_keyword_engine()
+    scraper.breakers = CircuitBreakerRegistry(path=os.path.join(tempfile.gettempdir(), "unused-breakers.json"))
+    scraper.breakers.save = lambda: None
+    return scraper
+
+class TestNewsScraperConcurrency(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._saved = (Config.MAX_CONCURRENT_REQUESTS, Config.SOURCE_TIMEOUT, Config.SCRAPE_RUN_DEADLINE)
+
+    def tearDown(self):
+        Config.MAX_CONCURRENT_REQUESTS, Config.SOURCE_TIMEOUT, Config.SCRAPE_RUN_DEADLINE = self._saved
+
+    async def test_run_report_and_concurrency_limit(self):
+        Config.MAX_CONCURRENT_REQUESTS = 2
+        Config.SOURCE_TIMEOUT = 0.2
+        Config.SCRAPE_RUN_DEADLINE = 5
+        scraper = make_scraper([{"name": n} for n in ["ok-1", "slow", "broken", "ok-2"]])
+        running = {"now": 0, "peak": 0}
+
+        async def fake_scrape_source(client, source):
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            try:
+                if source["name"] == "slow":
+                    await asyncio.sleep(1)
+                if source["name"] == "broken":
+                    raise RuntimeError("layout changed")
+                await asyncio.sleep(0.01)
+                return [source["name"]]
+            finally:
+                running["now"] -= 1
+
+        scraper._scrape_source = fake_scrape_source
+        incidents = await scraper.scrape_incidents()
+
+        self.assertEqual(incidents, ["ok-1", "ok-2"])
+        self.assertEqual(scraper.last_run_report["finished"], ["ok-1", "ok-2"])
+        self.assertEqual(scraper.last_run_report["timed_out"], ["slow"])
+        self.assertEqual(scraper.last_run_report["failed"], ["broken"])
+        self.assertLessEqual(running["peak"], 2)
+        self.assertEqual(scraper.breakers.state("broken"), "closed")
+        self.assertEqual(scraper.breakers.breakers["broken"]["failures"], 1)
+
+    async def test_open_circuit_skips_source(self):
+        scraper = make_scraper([{"name": "dead"}, {"name": "ok"}])
+        for _ in range(scraper.breakers.failure_threshold):
+            scraper.breakers.record_failure("dead", "connection refused")
+        called = []
+
+        async def fake_scrape_source(client, source):
+            called.append(source["name"])
+            return []
+
+        scraper._scrape_source = fake_scrape_source
+        await scraper.scrape_incidents()
+
+        self.assertEqual(called, ["ok"])
+        self.assertEqual(scraper.last_run_report["skipped"], ["dead"])
+
+    async def test_long_retry_after_opens_circuit(self):
+        scraper = make_scraper([{"name": "throttled"}, {"name": "broken"}])
+
+        async def fake_scrape_source(client, source):
+            if source["name"] == "throttled":
+                raise HostBackoffError("throttled.example.com", 86400)
+            raise RuntimeError("layout changed")
+
+        scraper._scrape_source = fake_scrape_source
+        await scraper.scrape_incidents()
+
+        self.assertEqual(scraper.last_run_report["failed"], ["throttled", "broken"])
+        self.assertEqual(scraper.breakers.state("throttled"), "open")
+        self.assertEqual(scraper.breakers.state("broken"), "closed")
+
+    async def test_run_deadline_cancels_pending_sources(self):
+        Config.SOURCE_TIMEOUT = 10
+        Config.SCRAPE_RUN_DEADLINE = 0.1
+        scraper = make_scraper([{"name": "hung"}])
+
+        async def fake_scrape_source(client, source):
+            await asyncio.sleep(10)
+
+        scraper._scrape_source = fake_scrape_source
+        incidents = await scraper.scrape_incidents()
+
+        self.assertEqual(incidents, [])
+        self.assertEqual(scraper.last_run_report["timed_out"], ["hung"])
+
+SOURCE = {
+    "name": "Example Security",
+    "url": "https://example.com/",
+    "pagination": "https://example.com/page/{page}/",
+    "selectors": {
+        "articles": ".post",
+        "title": ".post-title a",
+        "description": ".post-excerpt",
+        "link": ".post-title a",
+        "date": ".post-date"
+    }
+}
+
+def listing_page(page, per_page=2):
+    posts = "".join(
+        f'<div class="post"><h2 class="post-title"><a href="/p{page}-{n}">Ransomware attack number {page}-{n}</a></h2>'
+        f'<div class="post-excerpt">Hackers hit a bank</div><span class="post-date">2026-10-{20 - page:02d}</span></div>'
+        for n in range(per_page)
+    )
+    return f"<html><body>{posts}</body></html>".encode()
+
+class FakeClient:
+    def __init__(self, pages, broken=()):
+        self.pages = pages
+        self.broken = set(broken)
+        self.requested = []
+
+    async def fetch(self, url, headers=None, conditional=False):
+        self.requested.append(url)
+        if url in self.broken:
+            raise ConnectionError(f"cannot reach {url}")
+        body = self.pages.get(url)
+        return FetchResult(url=url, status=200 if body else 404, body=body or b"")
+
+class TestNewsBackfill(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._saved = Config.MAX_CONCURRENT_REQUESTS
+        Config.MAX_CONCURRENT_REQUESTS = 2
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.saved = []
+
+        self.pages = {SOURCE["url"]: listing_page(1)}
+        for page in range(2, 6):
+            self.pages[SOURCE["pagination"].format(page=page)] = listing_page(page)
+
+    def tearDown(self):
+        Config.MAX_CONCURRENT_REQUESTS = self._saved
+        self.tmp_dir.cleanup()
+
+    def make_backfill_scraper(self, client):
+        scraper = make_scraper([SOURCE])
+        scraper.http_client = client
+        scraper.checkpoints = BackfillCheckpoints(os.path.join(self.tmp_dir.name, "backfill.json"))
+
+        async def fake_save(incidents):
+            self.saved.extend(i.url for i in incidents)
+            return len(incidents)
+
+        scraper._save_incidents = fake_save
+        return scraper
+
+    async def test_walks_pages_until_end_of_listing(self):
+        scraper = self.make_backfill_scraper(FakeClient(self.pages))
+        report = await scraper.backfill(max_pages=10)
+
+        progress = report["Example Security"]
+        self.assertTrue(progress["done"])
+        self.assertEqual(progress["stopped"], "end_of_listing")
+        self.assertEqual(progress["pages_done"], 5)
+        self.assertEqual(progress["incidents_saved"], 10)
+        self.assertIn("https://example.com/p5-1", self.saved)
+
+    async def test_resumes_from_checkpoint(self):
+        broken_url = SOURCE["pagination"].format(page=3)
+        scraper = self.make_backfill_scraper(FakeClient(self.pages, broken=[broken_url]))
+        report = await scraper.backfill(max_pages=10)
+        self.assertIn("error", report["Example Security"])
+        self.assertEqual(report["Example Security"]["next_page"], 3)
+
+        client = FakeClient(self.pages)
+        scraper = self.make_backfill_scraper(client)
+        report = await scraper.backfill(max_pages=4)
+
+        self.assertEqual(client.requested[0], broken_url)
+        self.assertEqual(report["Example Security"]["stopped"], "max_pages")
+        self.assertEqual(report["Example Security"]["pages_done"], 4)
+
+    async def test_resume_keeps_checkpoint_until(self):
+        # Pages 1-4 are dated 2026-10-19 .. 2026-10-16, page 5 2026-10-15
+        broken_url = SOURCE["pagination"].format(page=3)
+        scraper = self.make_backfill_scraper(FakeClient(self.pages, broken=[broken_url]))
+        await scraper.backfill(max_pages=10, until=datetime(2026, 10, 16))
+
+        scraper = self.make_backfill_scraper(FakeClient(self.pages))
+        report = await scraper.backfill(max_pages=10)
+
+        progress = report["Example Security"]
+        self.assertEqual(progress["stopped"], "reached_until")
+        self.assertEqual(progress["until"], "2026-10-16T00:00:00")
+        self.assertNotIn("https://example.com/p5-1", self.saved)
+        self.assertIn("https://example.com/p4-1", self.saved)
+
+if __name__ == '__main__':
+    unittest.main()
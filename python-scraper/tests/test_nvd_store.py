@@ -0,0 +1,97 @@
+import gzip
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ml.cve_extractor import CveExtractor
+from src.ml.nvd_store import NvdStore
+
+def v2_entry(cve_id, score, modified, metric="cvssMetricV31"):
+    return {"cve": {
+        "id": cve_id,
+        "published": "2021-12-10T10:15:09.143",
+        "lastModified": modified,
+        "descriptions": [{"lang": "en", "value": f"{cve_id} description"}],
+        "metrics": {metric: [
+            {"type": "Secondary", "cvssData": {"baseScore": 1.0}},
+            {"type": "Primary", "cvssData": {"baseScore": score, "baseSeverity": "CRITICAL"}}
+        ]}
+    }}
+
+def v1_item(cve_id, score):
+    return {
+        "cve": {"CVE_data_meta": {"ID": cve_id},
+                "description": {"description_data": [{"lang": "en", "value": "legacy"}]}},
+        "impact": {"baseMetricV2": {"cvssV2": {"baseScore": score}, "severity": "HIGH"}},
+        "publishedDate": "2014-04-07T22:55Z",
+        "lastModifiedDate": "2020-10-15T13:28Z"
+    }
+
+class TestNvdStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = NvdStore(path=os.path.join(self.tmp_dir.name, "nvd.sqlite3"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def write_feed(self, name, data):
+        path = os.path.join(self.tmp_dir.name, name)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(data, f)
+        return path
+
+    def test_import_and_batched_lookup(self):
+        self.write_feed("nvdcve-2.0-2021.json.gz", {"vulnerabilities": [
+            v2_entry("CVE-2021-44228", 10.0, "2023-01-01T00:00:00.000"),
+            v2_entry("CVE-2021-0001", 5.5, "2023-01-01T00:00:00.000", metric="cvssMetricV2")
+        ]})
+        self.write_feed("nvdcve-1.1-2014.json.gz", {"CVE_Items": [v1_item("CVE-2014-0160", 5.0)]})
+        self.assertEqual(self.store.import_dir(self.tmp_dir.name),
+                         {"nvdcve-1.1-2014.json.gz": 1, "nvdcve-2.0-2021.json.gz": 2})
+
+        found = self.store.lookup(["cve-2021-44228", "CVE-2014-0160", "CVE-2099-0001", "CVE-2021-0001"])
+        self.assertEqual(sorted(found), ["CVE-2014-0160", "CVE-2021-0001", "CVE-2021-44228"])
+        self.assertEqual(found["CVE-2021-44228"]["cvss_score"], 10.0)  # Primary metric, not Secondary
+        self.assertEqual(found["CVE-2021-0001"]["cvss_version"], "2.0")
+        self.assertEqual(found["CVE-2014-0160"]["severity"], "HIGH")
+
+    def test_modified_feed_updates_only_newer_records(self):
+        self.store.import_feeds([self.write_feed("nvdcve-2.0-2021.json.gz", {"vulnerabilities": [
+            v2_entry("CVE-2021-1111", 5.0, "2023-01-01T00:00:00.000"),
+            v2_entry("CVE-2021-2222", 7.0, "2024-06-01T00:00:00.000")
+        ]})])
+        modified = self.write_feed("nvdcve-2.0-modified.json.gz", {"vulnerabilities": [
+            v2_entry("CVE-2021-1111", 9.8, "2024-01-01T00:00:00.000"),  # rescored
+            v2_entry("CVE-2021-2222", 4.0, "2023-01-01T00:00:00.000")   # older than stored
+        ]})
+        self.assertEqual(self.store.import_feeds([modified]), {"nvdcve-2.0-modified.json.gz": 2})
+
+        found = self.store.lookup(["CVE-2021-1111", "CVE-2021-2222"])
+        self.assertEqual(found["CVE-2021-1111"]["cvss_score"], 9.8)
+        self.assertEqual(found["CVE-2021-2222"]["cvss_score"], 7.0)
+
+        # An unchanged file is not read again
+        self.assertEqual(self.store.import_feeds([modified]), {})
+        self.assertEqual(self.store.get_summary()["cves"], 2)
+
+    def test_cve_extractor_scores_from_the_mirror(self):
+        self.store.import_feeds([self.write_feed("nvdcve-2.0-2021.json.gz", {"vulnerabilities": [
+            v2_entry("CVE-2021-44228", 10.0, "2023-01-01T00:00:00.000"),
+            v2_entry("CVE-2021-45046", 9.0, "2023-01-01T00:00:00.000")
+        ]})])
+        extractor = CveExtractor.__new__(CveExtractor)
+        extractor.nvd = self.store
+        cves = ["CVE-2021-45046", "CVE-2021-44228", "CVE-2099-0001"]
+        self.assertEqual(extractor.max_cvss(cves), 10.0)
+        self.assertIsNone(extractor.max_cvss(["CVE-2099-0001"]))
+        self.assertEqual(extractor.fetch_cve_details("CVE-2021-45046")["cvss_score"], 9.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.services.rate_limiter import HostBackoffError, HostRateLimiter
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestHostRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = HostRateLimiter(
+            requests=2, window=10,
+            overrides={"slow.example.com": (1, 30)},
+            clock=self.clock, max_retry_after=60
+        )
+
+    def test_burst_then_refill(self):
+        url = "https://news.example.com/page"
+        self.assertEqual(self.limiter.reserve(url), 0)
+        self.assertEqual(self.limiter.reserve(url), 0)
+        # Third request waits for one token: 10s / 2 requests
+        self.assertAlmostEqual(self.limiter.reserve(url), 5.0)
+
+        self.clock.now += 20
+        self.assertEqual(self.limiter.reserve(url), 0)
+
+    def test_hosts_are_independent_and_overridable(self):
+        self.assertEqual(self.limiter.reserve("https://slow.example.com/a"), 0)
+        self.assertAlmostEqual(self.limiter.reserve("https://slow.example.com/b"), 30.0)
+        self.assertEqual(self.limiter.reserve("https://other.example.com/"), 0)
+
+    def test_retry_after_blocks_host(self):
+        url = "https://news.example.com/"
+        self.limiter.apply_retry_after(url, "7")
+        self.assertAlmostEqual(self.limiter.reserve(url), 7.0)
+        self.limiter.apply_retry_after(url, "not a date")
+
+        stats = self.limiter.get_stats()["news.example.com"]
+        self.assertEqual(stats["retry_after"], 1)
+        self.assertEqual(stats["throttled"], 1)
+        self.assertAlmostEqual(stats["wait_seconds"], 7.0)
+
+    def test_retry_after_longer_than_window_is_honoured(self):
+        url = "https://news.example.com/"
+        self.limiter.apply_retry_after(url, "45")
+        self.assertAlmostEqual(self.limiter.reserve(url), 45.0)
+
+    def test_retry_after_over_maximum_fails_fast(self):
+        url = "https://news.example.com/"
+        with self.assertRaises(HostBackoffError) as raised:
+            self.limiter.apply_retry_after(url, "3600")
+        self.assertEqual(raised.exception.host, "news.example.com")
+        with self.assertRaises(HostBackoffError):
+            self.limiter.reserve(url)
+        self.assertEqual(self.limiter.reserve("https://other.example.com/"), 0)
+
+        # Once the pause is short enough it is waited out again
+        self.clock.now += 3600 - 30
+        self.assertAlmostEqual(self.limiter.reserve(url), 30.0)
+
+if __name__ == '__main__':
+    unittest.main()
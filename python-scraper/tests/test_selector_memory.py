@@ -0,0 +1,123 @@
+import unittest
+import tempfile
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scrapers.html_backend import get_html_backend
+from src.scrapers.news_scraper import NewsScraper
+from src.scrapers.selector_memory import SelectorMemory
+
+# Configured title and description selectors no longer match the site's markup
+SOURCE = {
+    "name": "Redesigned Site",
+    "url": "https://example.com/",
+    "selectors": {
+        "articles": ".old-post",
+        "title": ".old-title a",
+        "description": ".old-excerpt",
+        "link": ".old-title a",
+        "date": ".date"
+    }
+}
+
+PAGE = "".join(
+    f'<article><h2><a href="/p{n}">Ransomware attack number {n}</a></h2><div class="summary">Bank hit</div></article>'
+    for n in range(3)
+).encode()
+
+# Configured selectors still match, but the first article has no excerpt
+POSTS_SOURCE = {
+    "name": "Blog",
+    "url": "https://blog.example.com/",
+    "selectors": {
+        "articles": ".post",
+        "title": ".post-title",
+        "description": ".post-excerpt",
+        "link": ".post-title a",
+        "date": ".date"
+    }
+}
+
+POSTS_PAGE = "".join(
+    f'<div class="post"><h3 class="post-title"><a href="/p{n}">Phishing campaign number {n}</a></h3>'
+    f'<p class="byline">By staff writer</p>'
+    + ("" if n == 0 else f'<p class="post-excerpt">Excerpt {n}</p>')
+    + '</div>'
+    for n in range(4)
+).encode()
+
+class TestSelectorMemory(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "selectors.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_scraper(self):
+        # Bypass __init__ so no MongoDB connection or ML models are needed
+        scraper = NewsScraper.__new__(NewsScraper)
+        scraper.html = get_html_backend()
+        scraper.selectors = SelectorMemory(self.path)
+        return scraper
+
+    def extract_all(self, scraper, page=PAGE, source=SOURCE):
+        document = scraper.html.parse(page)
+        with scraper.selectors.page(source["name"]):
+            return [scraper._extract_fields(article, source)
+                    for article in scraper._select_articles(document, source)]
+
+    def test_learns_consistent_specific_selector(self):
+        scraper = self.make_scraper()
+        fields = self.extract_all(scraper)
+
+        self.assertEqual([f["title"] for f in fields], [f"Ransomware attack number {n}" for n in range(3)])
+        self.assertEqual(fields[0]["link"], "https://example.com/p0")
+        summary = scraper.selectors.get_summary()[SOURCE["name"]]
+        # Generic element selectors (article, h2) are used but never learned
+        self.assertIsNone(summary["articles"]["learned"])
+        self.assertIsNone(summary["title"]["learned"])
+        self.assertEqual(summary["title"]["fallbacks"], 3)
+        self.assertEqual(summary["title"]["configured_hit_rate"], 0.0)
+        # .summary matched every article of the page
+        self.assertEqual(summary["description"]["learned"], ".summary")
+        self.assertEqual(summary["date"]["misses"], 3)
+
+        # Next page: the configured selector is still tried before the learned one
+        self.extract_all(scraper)
+        chain = scraper._selector_chain(SOURCE, "description")
+        self.assertEqual(chain[:3], [".old-excerpt", ".summary", "p"])
+
+    def test_article_missing_configured_field_does_not_change_selector(self):
+        scraper = self.make_scraper()
+        for _ in range(2):
+            fields = self.extract_all(scraper, POSTS_PAGE, POSTS_SOURCE)
+            # Only the article without an excerpt falls back to its byline
+            self.assertEqual([f["description"] for f in fields],
+                             ["By staff writer", "Excerpt 1", "Excerpt 2", "Excerpt 3"])
+        summary = scraper.selectors.get_summary()[POSTS_SOURCE["name"]]
+        self.assertIsNone(summary["description"]["learned"])
+        self.assertEqual(summary["description"]["hit_rate"], 0.75)
+
+    def test_learned_selectors_persist(self):
+        scraper = self.make_scraper()
+        self.extract_all(scraper)
+        scraper.selectors.save()
+
+        reloaded = SelectorMemory(self.path)
+        chain = reloaded.chain(SOURCE["name"], "description", SOURCE["selectors"]["description"], ["p", ".summary"])
+        self.assertEqual(chain, [".old-excerpt", ".summary", "p"])
+
+    def test_generic_learned_selector_ignored(self):
+        # A generic selector learned before they were excluded is not tried early
+        memory = SelectorMemory(self.path)
+        memory.sources = {"Blog": {"description": {"configured": ".post-excerpt", "selector": "p", "hits": 0,
+                                                   "fallbacks": 0, "misses": 0, "matched": {}}}}
+        chain = memory.chain("Blog", "description", ".post-excerpt", ["p", ".excerpt"])
+        self.assertEqual(chain, [".post-excerpt", "p", ".excerpt"])
+
+if __name__ == '__main__':
+    unittest.main()
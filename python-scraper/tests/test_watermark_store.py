@@ -0,0 +1,69 @@
+import unittest
+import tempfile
+import sys
+import os
+from datetime import datetime
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.models.incident import IncidentModel
+from src.services.watermark_store import WatermarkStore
+
+def incident(n, day):
+    return IncidentModel(
+        title=f"Incident {n}", description="", url=f"https://example.com/{n}",
+        published_date=datetime(2026, 10, day), source="Example", category="News",
+        severity="Low", hash=f"hash-{n}"
+    )
+
+class TestWatermarkStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "watermarks.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_advance_persists_across_instances(self):
+        store = WatermarkStore(path=self.path, max_recent=3)
+        store.advance("Example", [incident(2, 12), incident(1, 10)])
+        store.advance("Example", [incident(4, 11), incident(3, 11)])
+        store.save()
+
+        reloaded = WatermarkStore(path=self.path, max_recent=3)
+        self.assertTrue(reloaded.is_known("Example", content_hash="hash-4"))
+        self.assertTrue(reloaded.is_known("Example", url="https://example.com/2"))
+        # Oldest entry fell out of the bounded window
+        self.assertFalse(reloaded.is_known("Example", content_hash="hash-1"))
+        self.assertFalse(reloaded.is_known("Other", content_hash="hash-4"))
+
+        summary = reloaded.get_summary()["Example"]
+        self.assertEqual(summary["last_published"], "2026-10-12T00:00:00")
+        self.assertEqual(summary["recent_items"], 3)
+        self.assertEqual(summary["last_run_new"], 2)
+
+    def test_seed_only_applies_to_new_sources(self):
+        store = WatermarkStore(path=self.path)
+        store.seed("Example", ["hash-1"], [])
+        store.seed("Example", ["hash-2"], [])
+
+        self.assertTrue(store.is_known("Example", content_hash="hash-1"))
+        self.assertFalse(store.is_known("Example", content_hash="hash-2"))
+
+    def test_listing_url_is_not_a_known_url(self):
+        # Articles without a link are stored with the listing page's URL
+        listing = "https://example.com/news"
+        store = WatermarkStore(path=self.path)
+        linkless = incident(1, 10)
+        linkless.url = listing
+        store.advance("Example", [linkless], listing_url=listing)
+
+        self.assertTrue(store.is_known("Example", "hash-1", listing, listing_url=listing))
+        self.assertFalse(store.is_known("Example", "hash-2", listing, listing_url=listing))
+        # Even when an older seed put the listing URL in the index
+        store.seed("Seeded", ["hash-1"], [listing])
+        self.assertFalse(store.is_known("Seeded", "hash-2", listing, listing_url=listing))
+
+if __name__ == '__main__':
+    unittest.main()